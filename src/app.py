@@ -1,10 +1,15 @@
 import streamlit as st
-import pandas as pd
-import json
-from typing import List
 from scripts.search_by_stats import handle_legends_by_stats
 from scripts.search_by_tags import handle_legends_by_tags
 from scripts.search_by_weapons import handle_legends_by_weapons
+from scripts.search_by_query import handle_legends_by_query
+from scripts.similar_legends import handle_similar_legends
+from scripts.team_builder import handle_team_builder
+from scripts.name_search import handle_name_search
+from scripts.analytics_view import handle_analytics
+from scripts.metrics_panel import metrics_panel_requested, render_metrics_panel
+from serve_api import start_from_env
+from utils import hot_reload
 
 st.set_page_config(
     page_title="Meet The Legends",
@@ -13,10 +18,20 @@ st.set_page_config(
 )
 st.title('Brawlhalla: Meet the Legends')
 
+# JSON API on a background thread of this process when $MEET_LEGENDS_API_PORT is set
+start_from_env()
+# pick up edits to data/ and resources/ without a restart
+hot_reload.start_from_env()
+
 options = [
     "Find legends by weapons",
     "Find legends by tags",
-    "Find legends by stats"
+    "Find legends by stats",
+    "Search with a query",
+    "Find similar legends",
+    "Build a team",
+    "Search by name",
+    "Stats by weapon and tag"
 ]
 
 selection = st.selectbox("What would you like to do?", options=options, index=None, placeholder="Select an option...")
@@ -26,4 +41,17 @@ if selection == options[0]:
 elif selection == options[1]:
     handle_legends_by_tags()
 elif selection == options[2]:
-    handle_legends_by_stats()
\ No newline at end of file
+    handle_legends_by_stats()
+elif selection == options[3]:
+    handle_legends_by_query()
+elif selection == options[4]:
+    handle_similar_legends()
+elif selection == options[5]:
+    handle_team_builder()
+elif selection == options[6]:
+    handle_name_search()
+elif selection == options[7]:
+    handle_analytics()
+
+if metrics_panel_requested():
+    render_metrics_panel()
\ No newline at end of file
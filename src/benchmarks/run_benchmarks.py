@@ -0,0 +1,168 @@
+"""
+Benchmarks for the search, resolve, encode and table-building paths on
+synthetic rosters of 1k, 10k and 100k entries, run outside Streamlit.
+
+    python src/benchmarks/run_benchmarks.py [--sizes 1000,10000,100000]
+        [--save-baseline] [--compare] [--threshold 1.5]
+
+Results are printed and written as JSON (default build/benchmarks/latest.json).
+--save-baseline also stores them as the baseline; --compare checks them
+against the saved baseline and exits 1 if any benchmark got slower than
+threshold x its baseline time.
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_SRC_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_SRC_DIR))
+
+from benchmarks.synthetic import WEAPONS, write_roster  # noqa: E402
+from utils import data_access  # noqa: E402
+from utils.legend_store import LegendStore  # noqa: E402
+from utils.resource_index import build_resource_index  # noqa: E402
+from utils.stat_index import StatCondition  # noqa: E402
+from utils import queries  # noqa: E402
+from scripts import legend_viewer, similar_legends, name_search  # noqa: E402
+from utils.analytics import GROUPINGS, summarize  # noqa: E402
+from utils.similarity import SimilarityIndex, SimilarityWeights  # noqa: E402
+
+_BASE_DIR = _SRC_DIR.parent
+DEFAULT_OUT = _BASE_DIR / 'build' / 'benchmarks' / 'latest.json'
+DEFAULT_BASELINE = _BASE_DIR / 'build' / 'benchmarks' / 'baseline.json'
+
+
+def bench(fn, min_time: float = 0.2, max_runs: int = 2000) -> dict:
+    """Call fn repeatedly for about min_time seconds; report the median call time."""
+    times = []
+    deadline = time.perf_counter() + min_time
+    while len(times) < max_runs and (len(times) < 3 or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {'median_us': statistics.median(times) * 1e6, 'runs': len(times)}
+
+
+def once(fn) -> dict:
+    start = time.perf_counter()
+    fn()
+    return {'median_us': (time.perf_counter() - start) * 1e6, 'runs': 1}
+
+
+def run_size(n: int, workdir: Path) -> dict:
+    paths = write_roster(workdir, n)
+    with open(paths['tags_data_path']) as f:
+        tags = json.load(f)
+    results = {}
+
+    results['load.from_csv'] = once(lambda: LegendStore.from_csv(paths['base_data_path'], tags))
+    store = LegendStore.from_csv(paths['base_data_path'], tags, weapon_order=WEAPONS)
+    results['load.resource_index'] = once(lambda: build_resource_index(paths['resources_path'], {}))
+    resource_index = build_resource_index(paths['resources_path'], {})
+    results['load.indexes'] = once(lambda: data_access.install(store, resource_index))
+    legend_viewer.clear_render_caches()
+    legend_viewer.clear_asset_cache()
+
+    for comp in ('=', '<=', '>='):
+        results[f'stats.comparison{comp}'] = bench(lambda: queries.get_legends_by_stat_comparison('Speed', 5, comp))
+    results['stats.between'] = bench(lambda: queries.get_legends_with_stat_between('Speed', 4, 6))
+    results['stats.compound'] = bench(lambda: queries.get_legends_by_stats(
+        [StatCondition('Strength', '>=', 6), StatCondition('Speed', 'between', 4, 6)]))
+
+    results['tags.single'] = bench(lambda: queries.get_legends_by_tag(tags[0]))
+    results['tags.all_of'] = bench(lambda: queries.get_legends_by_tags(tags[:3], tags[3:4]))
+    results['tags.query'] = bench(lambda: queries.get_legends_by_tag_query(f'{tags[0]} AND NOT {tags[1]} OR {tags[2]}'))
+
+    results['weapons.single'] = bench(lambda: queries.get_legends_by_weapon('Sword'))
+    results['weapons.pair'] = bench(lambda: queries.get_legends_by_weapons('Sword', 'Bow'))
+    results['weapons.any_of'] = bench(lambda: queries.get_legends_by_weapon_set(['Sword', 'Bow', 'Axe'], match_all=False))
+
+    results['query.expression'] = bench(lambda: queries.get_legends_by_query(
+        f'weapon:Sword & str>=6 & tag:"{tags[0]}" & !tag:"{tags[1]}"'))
+
+    results['similar.build'] = once(lambda: SimilarityIndex(store))
+    results['similar.top10'] = bench(lambda: similar_legends.get_similar_legends(store.names[n // 2], 10))
+    results['similar.top10_reweighted'] = bench(lambda: similar_legends.get_similar_legends(
+        store.names[n // 2], 10, SimilarityWeights(0.2, 0.2, 0.6)))
+
+    for by in GROUPINGS:
+        results[f'analytics.{by}'] = bench(lambda: summarize(store, by), max_runs=50)
+
+    results['names.build'] = once(name_search.fuzzy_index)
+    typo = store.names[n // 3][:-1] + 'x'
+    results['names.fuzzy_cold'] = bench(lambda: name_search.fuzzy_index()._search(typo, None, 10))
+
+    sample = random.Random(1).sample(store.names, min(1000, n))
+    results['resolve.1000_names'] = bench(lambda: [legend_viewer._resolve_resource_path('legends', s) for s in sample])
+
+    portraits = [legend_viewer._resolve_resource_path('legends', s) for s in sample[:100]]
+
+    def encode_cold():
+        legend_viewer.clear_asset_cache()
+        for p in portraits:
+            legend_viewer._img_src_for_html(p)
+    results['encode.100_cold'] = bench(encode_cold, max_runs=20)
+    results['encode.100_warm'] = bench(lambda: [legend_viewer._img_src_for_html(p) for p in portraits])
+
+    page = legend_viewer.page_slice(legend_viewer.sort_legends(store.names), 1, legend_viewer.DEFAULT_PAGE_SIZE)
+
+    def table_cold(names):
+        # empty the row/table/data-URI caches but keep the loaded asset index
+        legend_viewer._ROW_CACHE.clear()
+        legend_viewer._TABLE_CACHE.clear()
+        legend_viewer.clear_asset_cache()
+        legend_viewer.build_table_html(names, presorted=True)
+    results['table.page_cold'] = bench(lambda: table_cold(page), max_runs=50)
+    results['table.page_warm'] = bench(lambda: legend_viewer.build_table_html(page, presorted=True))
+    results['table.1000_rows_cold'] = bench(lambda: table_cold(sample), max_runs=5)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float):
+    regressions = []
+    for key, value in results.items():
+        base = baseline.get(key)
+        if base and value['median_us'] > threshold * base['median_us']:
+            regressions.append((key, base['median_us'], value['median_us']))
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default='1000,10000,100000')
+    parser.add_argument('--out', default=str(DEFAULT_OUT))
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE))
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--compare', action='store_true')
+    parser.add_argument('--threshold', type=float, default=1.5)
+    args = parser.parse_args()
+
+    all_results = {}
+    for n in (int(s) for s in args.sizes.split(',')):
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, r in run_size(n, Path(tmp)).items():
+                key = f'{n}/{name}'
+                all_results[key] = r
+                print(f"{key:<32} {r['median_us']:>14.1f} us  ({r['runs']} runs)")
+
+    for path in [args.out] + ([args.baseline] if args.save_baseline else []):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(all_results, f, indent=2, sort_keys=True)
+        print(f"wrote {path}")
+
+    if args.compare:
+        try:
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        except OSError:
+            sys.exit(f"no baseline at {args.baseline}; run with --save-baseline first")
+        regressions = compare(all_results, baseline, args.threshold)
+        for key, before, after in regressions:
+            print(f"REGRESSION {key}: {before:.1f} us -> {after:.1f} us")
+        sys.exit(1 if regressions else 0)
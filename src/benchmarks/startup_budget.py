@@ -0,0 +1,99 @@
+"""
+Startup budget check: import the app's modules, load the roster and build
+the first page of the legend table in a fresh interpreter (run with
+``-X importtime``), then fail if that took longer than the budget or if
+pandas was imported on the way.
+
+    python src/benchmarks/startup_budget.py [--budget-ms 1500] [--runs 5]
+
+Run from the repository root (data paths are relative to it). The first,
+unmeasured run makes sure the roster snapshot is up to date.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+_SRC_DIR = Path(__file__).resolve().parents[1]
+
+DEFAULT_BUDGET_MS = 1500.0
+
+# executed in the child interpreter; prints one JSON line of phase timings
+_CHILD = r'''
+import json, sys, time
+t0 = time.perf_counter()
+from scripts import legend_viewer, search_by_stats, search_by_tags, search_by_weapons, search_by_query
+t1 = time.perf_counter()
+from utils import data_access
+store = data_access.STORE
+t2 = time.perf_counter()
+legend_viewer.build_table_html(legend_viewer.page_slice(legend_viewer.sort_legends(store.names), 1, legend_viewer.DEFAULT_PAGE_SIZE), presorted=True)
+t3 = time.perf_counter()
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "load_ms": (t2 - t1) * 1000,
+    "first_render_ms": (t3 - t2) * 1000,
+    "total_ms": (t3 - t0) * 1000,
+    "pandas_imported": "pandas" in sys.modules,
+}))
+'''
+
+
+def _parse_importtime(stderr: str, top: int = 10):
+    """Top cumulative import times (us) of top-level imports from -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        # nested imports are indented two extra spaces per level
+        if name.startswith('   '):
+            continue
+        rows.append((int(cumulative_us), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def run_once():
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _CHILD],
+        cwd=Path.cwd(),
+        env={**os.environ, 'PYTHONPATH': str(_SRC_DIR)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = json.loads(proc.stdout.strip().splitlines()[-1])
+    return timings, proc.stderr
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    run_once()  # warm-up: (re)build the snapshot, fill the OS file cache
+    results = []
+    stderr = ''
+    for _ in range(args.runs):
+        timings, stderr = run_once()
+        results.append(timings)
+
+    median = {key: statistics.median(r[key] for r in results) for key in ('import_ms', 'load_ms', 'first_render_ms', 'total_ms')}
+    for key, value in median.items():
+        print(f"{key:>16}: {value:8.1f}")
+    print("slowest top-level imports (cumulative):")
+    for cumulative_us, name in _parse_importtime(stderr):
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    failures = []
+    if median['total_ms'] > args.budget_ms:
+        failures.append(f"import-to-first-render {median['total_ms']:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+    if any(r['pandas_imported'] for r in results):
+        failures.append("pandas was imported on the startup path")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
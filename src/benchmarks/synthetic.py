@@ -0,0 +1,94 @@
+"""
+Synthetic rosters shaped like data/data.csv, data/tags.json and
+data/weapons.json, scaled to any number of entries (think skins and
+variants of the real legends), plus a matching resources/ tree.
+"""
+import csv
+import json
+import os
+import random
+import shutil
+from pathlib import Path
+from typing import Dict, List
+
+from utils.legend_store import STAT_COLUMNS, WEAPON_COLUMNS
+
+_BASE_DIR = Path(__file__).resolve().parents[2]
+
+WEAPONS = [
+    'Blasters', 'Spear', 'Rocket Lance', 'Katars', 'Bow', 'Axe', 'Hammer', 'Gauntlets',
+    'Sword', 'Scythe', 'Cannon', 'Chakram', 'Battle Boots', 'Greatsword', 'Orb',
+]
+STAT_TOTAL = 22
+
+
+def _stats(rng: random.Random) -> List[int]:
+    """Four stats in 3..9 summing to STAT_TOTAL, like the real roster."""
+    while True:
+        stats = [rng.randint(3, 9) for _ in range(3)]
+        last = STAT_TOTAL - sum(stats)
+        if 3 <= last <= 9:
+            return stats + [last]
+
+
+def _link_or_copy(src: Path, dest: Path) -> None:
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copyfile(src, dest)
+
+
+def write_roster(out_dir: Path, n_legends: int, n_tags: int = 22, seed: int = 0) -> Dict[str, Path]:
+    """
+    Write data.csv / tags.json / weapons.json / name_to_filename.json and a
+    resources/ tree (hard links to real images) for n_legends entries.
+    Returns the written paths keyed like config.data_paths.
+    """
+    rng = random.Random(seed)
+    out_dir = Path(out_dir)
+    (out_dir / 'data').mkdir(parents=True, exist_ok=True)
+    tags = [f'Tag {i:02d}' for i in range(n_tags)]
+    header = ['Legend'] + WEAPON_COLUMNS + STAT_COLUMNS + tags
+    weapons: Dict[str, List[str]] = {w: [] for w in WEAPONS}
+    names = []
+
+    with open(out_dir / 'data' / 'data.csv', 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for i in range(n_legends):
+            # keep the blank separator rows the real file has
+            writer.writerow([''] * len(header))
+            name = f'Legend {i:06d}'
+            names.append(name)
+            w1, w2 = rng.sample(WEAPONS, 2)
+            weapons[w1].append(name)
+            weapons[w2].append(name)
+            tag_flags = ['1.0' if rng.random() < 0.15 else '0.0' for _ in tags]
+            writer.writerow([name, w1, w2] + [f'{s}.0' for s in _stats(rng)] + tag_flags)
+
+    with open(out_dir / 'data' / 'tags.json', 'w', encoding='utf-8') as f:
+        json.dump(tags, f, indent=4)
+    with open(out_dir / 'data' / 'weapons.json', 'w', encoding='utf-8') as f:
+        json.dump(weapons, f, indent=4)
+    with open(out_dir / 'data' / 'name_to_filename.json', 'w', encoding='utf-8') as f:
+        json.dump({}, f)
+
+    # resources: one portrait per legend plus the real weapon and stat icons
+    real = _BASE_DIR / 'resources'
+    portraits = sorted((real / 'legends').iterdir())
+    for kind in ('legends', 'weapons', 'stats'):
+        (out_dir / 'resources' / kind).mkdir(parents=True, exist_ok=True)
+    for i, name in enumerate(names):
+        src = portraits[i % len(portraits)]
+        _link_or_copy(src, out_dir / 'resources' / 'legends' / f"{name.lower().replace(' ', '_')}{src.suffix}")
+    for kind in ('weapons', 'stats'):
+        for src in (real / kind).iterdir():
+            _link_or_copy(src, out_dir / 'resources' / kind / src.name)
+
+    return {
+        'base_data_path': out_dir / 'data' / 'data.csv',
+        'tags_data_path': out_dir / 'data' / 'tags.json',
+        'weapons_data_path': out_dir / 'data' / 'weapons.json',
+        'name_map_path': out_dir / 'data' / 'name_to_filename.json',
+        'resources_path': out_dir / 'resources',
+    }
@@ -0,0 +1,18 @@
+import sys
+import time
+from config.data_paths import answers_path
+from utils import data_access
+from utils.answer_table import build_answer_table, verify_answer_table, write_answer_table
+
+# run from the repository root: python src/build_answers.py
+if __name__ == '__main__':
+    start = time.perf_counter()
+    state = data_access.current()
+    store = state.store
+    table = build_answer_table(store)
+    bad = verify_answer_table(table, store, state.tag_index, state.weapon_index)
+    if bad:
+        sys.exit(f"{len(bad)} answers disagree with live queries, e.g. {', '.join(bad[:5])}")
+    write_answer_table(answers_path, table)
+    print(f"wrote {answers_path}: {len(table)} answers for {len(store)} legends "
+          f"({table.bits.nbytes} bytes of bitsets) in {(time.perf_counter() - start) * 1000:.1f} ms")
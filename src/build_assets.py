@@ -0,0 +1,19 @@
+import argparse
+from pathlib import Path
+from utils.asset_pipeline import build_assets
+
+_BASE_DIR = Path(__file__).resolve().parents[1]
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Pre-scale images and build sprite atlases for the legend table.")
+    parser.add_argument('--resources', default=str(_BASE_DIR / 'resources'))
+    parser.add_argument('--out', default=str(_BASE_DIR / 'build' / 'assets'))
+    parser.add_argument('--force', action='store_true', help="rebuild every image, not just changed ones")
+    args = parser.parse_args()
+
+    report = build_assets(Path(args.resources), Path(args.out), force=args.force)
+    before = report['payload_bytes_before']
+    after = report['payload_bytes_after']
+    rebuilt = ', '.join(f"{kind}={n}" for kind, n in report['rebuilt'].items())
+    print(f"{report['images']} images ({rebuilt} rebuilt)")
+    print(f"inline payload: {before / 1024:.0f} KiB -> {after / 1024:.0f} KiB ({100 * (1 - after / max(before, 1)):.0f}% smaller)")
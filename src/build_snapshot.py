@@ -0,0 +1,10 @@
+import time
+from config.data_paths import snapshot_path
+from utils.data_access import compile_snapshot
+
+# run from the repository root: python src/build_snapshot.py
+if __name__ == '__main__':
+    start = time.perf_counter()
+    store, resource_index = compile_snapshot()
+    print(f"wrote {snapshot_path}: {len(store)} legends, {len(resource_index)} resources "
+          f"in {(time.perf_counter() - start) * 1000:.1f} ms")
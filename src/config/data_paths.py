@@ -1,3 +1,8 @@
 base_data_path = 'data/data.csv'
 tags_data_path = 'data/tags.json'
-weapons_data_path = 'data/weapons.json'
\ No newline at end of file
+weapons_data_path = 'data/weapons.json'
+name_map_path = 'src/config/name_to_filename.json'
+resources_path = 'resources'
+snapshot_path = 'build/roster_snapshot.npz'
+answers_path = 'build/answer_table.npz'
+segment_path = 'build/shared/roster.seg'
\ No newline at end of file
@@ -0,0 +1,43 @@
+import argparse
+import os
+import threading
+import time
+from pathlib import Path
+from config.data_paths import resources_path, segment_path
+from utils import data_access
+from utils.asset_pipeline import load_asset_build
+from utils.hot_reload import DEFAULT_INTERVAL, FileWatcher, HotReloader
+from utils.shared_segment import write_segment
+
+_BASE_DIR = Path(__file__).resolve().parents[1]
+# same location legend_viewer reads thumbnails and atlases from
+_BUILD_DIR = _BASE_DIR / 'build' / 'assets'
+
+
+def publish(out: str) -> None:
+    start = time.perf_counter()
+    state = data_access.current()
+    sizes = write_segment(out, state.store, state.resource_index, state.answers, load_asset_build(_BUILD_DIR))
+    print(f"wrote {out}: {sizes['total'] / 1024:.0f} KiB ({sizes['images'] / 1024:.0f} KiB images) "
+          f"in {(time.perf_counter() - start) * 1000:.1f} ms", flush=True)
+
+
+# run from the repository root: python src/publish_shared.py [--out build/shared/roster.seg] [--watch]
+# then start each worker with MEET_LEGENDS_SHARED_SEGMENT=<out>
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Publish the roster, indexes and encoded images as a shared read-only segment.")
+    parser.add_argument('--out', default=segment_path, help="segment file (e.g. under /dev/shm)")
+    parser.add_argument('--watch', action='store_true', help="keep running and republish when data or resources change")
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL)
+    args = parser.parse_args()
+
+    # the loader itself always reads the sources
+    os.environ.pop(data_access.SHARED_SEGMENT_ENV, None)
+    publish(args.out)
+    if args.watch:
+        data_access.add_reload_listener(lambda event: publish(args.out))
+        HotReloader(args.interval, FileWatcher(data_access.SOURCE_FILES, resources_path)).start()
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
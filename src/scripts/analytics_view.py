@@ -0,0 +1,61 @@
+from utils import data_access
+from typing import Tuple
+from utils.analytics import GROUPINGS, GroupSummary, summarize
+from utils.legend_store import STAT_COLUMNS
+from utils.lru import LruCache
+from utils.metrics import span
+import streamlit as st
+
+# summaries keyed by (data version, grouping): the store fingerprint, so a
+# reload that leaves the roster unchanged keeps them. Shared by every
+# session's script thread; LruCache locks each get/put, and two sessions
+# missing the same key at once only summarize it twice.
+_SUMMARIES = LruCache(max_entries=4 * len(GROUPINGS))
+
+GROUP_LABELS = {'weapon': "Weapon", 'weapon_pair': "Weapon pair", 'tag': "Tag"}
+
+def data_version(state=None) -> str:
+    return (state or data_access.current()).version
+
+def stat_summary(by: str, state=None) -> GroupSummary:
+    """
+    Mean/min/max/sum and value histograms of the four stats per weapon,
+    weapon pair or tag, e.g. stat_summary('weapon').get('Katars', 'Dexterity').
+    """
+    state = state or data_access.current()
+    key: Tuple[str, str] = (data_version(state), by)
+    summary = _SUMMARIES.get(key)
+    if summary is None:
+        with span("analytics.summarize"):
+            summary = _SUMMARIES.put(key, summarize(state.store, by))
+    return summary
+
+def handle_analytics():
+    state = data_access.current()
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        by = st.radio("Group by", options=list(GROUPINGS), format_func=GROUP_LABELS.get, horizontal=True)
+    with col2:
+        stat = st.selectbox("Stat", options=STAT_COLUMNS)
+    with col3:
+        aggregate = st.selectbox("Rank by", options=['mean', 'max', 'min', 'sum'])
+    summary = stat_summary(by, state)
+
+    ranked = summary.ranked(stat, aggregate)
+    if not ranked:
+        st.write("No groups to show")
+        return
+    st.caption(f"{aggregate.capitalize()} {stat} per {GROUP_LABELS[by].lower()}: "
+               f"highest is {ranked[0][0]} ({ranked[0][1]:.2f})")
+    column = f"{stat} {aggregate}"
+    st.bar_chart(
+        {"Group": [label for label, _ in ranked], column: [value for _, value in ranked]},
+        x="Group", y=column, sort=f"-{column}", horizontal=True, height=max(300, 22 * len(ranked)),
+    )
+    st.dataframe(summary.rows(), hide_index=True, height=min(600, 38 + 35 * len(summary)))
+
+    group = st.selectbox(f"Stat distribution for one {GROUP_LABELS[by].lower()}", options=summary.labels)
+    hist = summary.histogram(group)
+    if hist is not None:
+        st.caption(f"{int(summary.counts[summary.labels.index(group)])} legends; number with each stat value")
+        st.bar_chart(hist, stack=False)
@@ -1,139 +1,86 @@
 import streamlit as st
-from typing import List, Dict, Any
+from typing import Any, List, Dict, Iterator, Optional
 from pathlib import Path
-import json
-import csv
-import base64
+import os
+import threading
 import streamlit.components.v1 as components
+from utils import data_access
+from utils.data_access import STAT_NAMES
+from utils.legend_store import MISSING_STAT
+from utils.asset_pipeline import encode_data_uri, load_asset_build
+from utils.lru import LruCache
+from utils.resource_index import normalize_name
+from utils.shared_segment import IMAGE_URL_ENV
+from utils import metrics
 from pathlib import Path as _Path_for_encode  # avoid shadowing existing Path usage
 
-# enable wide layout so table can fill more page width (safe-guard if called multiple times)
-try:
-	st.set_page_config(layout="wide")
-except Exception:
-	# already set or called too late; ignore
-	pass
-
 def _placeholder_img(text: str, size: int = 64) -> str:
 	# simple placeholder image with text; safe and copyright-free
 	return f"https://via.placeholder.com/{size}?text={text.replace(' ', '+')}"
 
 # project base (two levels up from this script: meet_legends)
 _BASE_DIR = Path(__file__).resolve().parents[2]
-_RESOURCES_DIR = _BASE_DIR / "resources"
-_CONFIG_MAP_PATH = _BASE_DIR / "src" / "config" / "name_to_filename.json"
-_DATA_CSV_PATH = _BASE_DIR / "data" / "data.csv"
-
-# Added debug prints so you can see what paths are being used
-print(f"[legend_viewer] BASE_DIR: {_BASE_DIR}")
-print(f"[legend_viewer] RESOURCES_DIR: {_RESOURCES_DIR}")
-print(f"[legend_viewer] CONFIG_MAP_PATH: {_CONFIG_MAP_PATH} (exists={_CONFIG_MAP_PATH.exists()})")
-print(f"[legend_viewer] DATA_CSV_PATH: {_DATA_CSV_PATH} (exists={_DATA_CSV_PATH.exists()})")
-
-def _load_name_map() -> Dict[str, str]:
-	"""Load name -> filename mapping from config JSON."""
-	print(f"[legend_viewer] Attempting to load name map from {_CONFIG_MAP_PATH}")
-	if not _CONFIG_MAP_PATH.exists():
-		print("[legend_viewer] name map file not found.")
-		return {}
-	try:
-		with open(_CONFIG_MAP_PATH, "r", encoding="utf-8") as fh:
-			data = json.load(fh)
-			print(f"[legend_viewer] Loaded name map entries: {len(data)}")
-			return data
-	except Exception as e:
-		print(f"[legend_viewer] Failed to load name map: {e}")
-		return {}
-
-def _load_data_csv() -> Dict[str, Dict[str, Any]]:
-	"""Load data.csv into a mapping: legend_name -> {weapons: [...], stats: {...}}."""
-	print(f"[legend_viewer] Attempting to load data CSV from {_DATA_CSV_PATH}")
-	result: Dict[str, Dict[str, Any]] = {}
-	if not _DATA_CSV_PATH.exists():
-		print("[legend_viewer] data.csv not found.")
-		return result
-	try:
-		with open(_DATA_CSV_PATH, newline="", encoding="utf-8") as csvfile:
-			reader = csv.DictReader(csvfile)
-			print(f"[legend_viewer] CSV fieldnames: {reader.fieldnames}")
-			for row in reader:
-				legend = (row.get("Legend") or "").strip()
-				if not legend:
-					continue
-				weapons = []
-				w1 = (row.get("Weapon 1") or "").strip()
-				w2 = (row.get("Weapon 2") or "").strip()
-				if w1:
-					weapons.append(w1)
-				if w2:
-					weapons.append(w2)
-				# stats columns as provided
-				stats = {
-					"Strength": (row.get("Strength") or "").strip(),
-					"Dexterity": (row.get("Dexterity") or "").strip(),
-					"Defense": (row.get("Defense") or "").strip(),
-					"Speed": (row.get("Speed") or "").strip(),
-				}
-				result[legend] = {"weapons": weapons, "stats": stats}
-	except Exception as e:
-		print(f"[legend_viewer] Failed to read data.csv: {e}")
-		return {}
-	print(f"[legend_viewer] Loaded data for {len(result)} legends from CSV")
-	return result
+# output of src/build_assets.py (pre-scaled thumbnails + sprite atlases), optional
+_BUILD_DIR = _BASE_DIR / "build" / "assets"
+
+log = metrics.get_logger("legend_viewer")
+
+def _report_missing_assets(index, store) -> Dict[str, List[str]]:
+	"""Return (and log) legend and weapon names from the roster that have no local image."""
+	report = {
+		"legends": index.missing("legends", store.names),
+		"weapons": index.missing("weapons", store.weapon_names),
+	}
+	for kind, names in report.items():
+		if names:
+			log.warning("No %s asset for: %s", kind, ", ".join(names))
+	return report
 
-_name_map = _load_name_map()
-_data_bank = _load_data_csv()
+# Nothing is loaded at import time. On first use we take the resource index
+# (one scan of resources/ merged with the name map, loaded with the roster
+# snapshot) and, when build/assets exists, the pre-scaled thumbnails and
+# sprite atlases, whose CSS is inlined once per table instead of once per row.
+# The result belongs to one data_access.DataState and is rebuilt for a new one.
+_assets_state: Dict[str, Any] = {}
+_assets_lock = threading.Lock()
 
-def _resolve_resource_path(kind: str, name: str) -> str:
+def _assets(state=None) -> Dict[str, Any]:
+	# replaced as a whole (never mutated) so a reload can't expose a partial dict
+	global _assets_state
+	state = state or data_access.current()
+	assets = _assets_state
+	if assets.get("state") is not state:
+		with _assets_lock:
+			if _assets_state.get("state") is not state:
+				segment = state.segment
+				build = segment.asset_build() if segment is not None else load_asset_build(_BUILD_DIR)
+				assets = {
+					"state": state,
+					"store": state.store,
+					"index": state.resource_index,
+					"segment": segment,
+					"image_url": (os.environ.get(IMAGE_URL_ENV, "").rstrip("/") or None) if segment is not None else None,
+					"build": build,
+					"sprite_css": "",
+					"missing": _report_missing_assets(state.resource_index, state.store),
+					"row_files": {},
+				}
+				if build:
+					image_src = (lambda p: _segment_src(p, assets) or "") if segment is not None else None
+					assets["sprite_css"] = build.sprite_css(image_src)
+				_assets_state = assets
+			assets = _assets_state
+	return assets
+
+def _resolve_resource_path(kind: str, name: str, assets=None) -> str:
 	"""
 	Resolve the resource filepath for a given kind ("legends" or "weapons")
-	using the _name_map. If file missing or no mapping, try constructed filenames
-	(lowercase, spaces -> underscores) with .png/.jpg and finally scan folder by stem.
+	from the prebuilt resource index, falling back to a placeholder URL.
 	"""
-	print(f"[legend_viewer] Resolving {kind} resource for '{name}'")
-	res_dir = _RESOURCES_DIR / kind
-
-	candidates = []
-	# first, try mapping from config if present
-	mapped = _name_map.get(name)
-	if mapped:
-		candidates.append(mapped)
-		# if mapping missing extension, also try common extensions
-		if not Path(mapped).suffix:
-			candidates.append(f"{mapped}.png")
-			candidates.append(f"{mapped}.jpg")
-
-	# next, construct canonical filenames from the name
-	stem = name.strip().lower().replace(" ", "_")
-	candidates.append(f"{stem}.png")
-	candidates.append(f"{stem}.jpg")
-	candidates.append(stem)  # in case mapping uses no extension or custom handling
-
-	# try each candidate
-	for cand in candidates:
-		full_path = res_dir / cand
-		print(f"[legend_viewer] Trying candidate filename: {cand} -> {full_path} (exists={full_path.exists()})")
-		if full_path.exists():
-			print(f"[legend_viewer] Found local file: {full_path}")
-			return str(full_path)
-
-	# last resort: case-insensitive stem match by scanning the directory
-	try:
-		if res_dir.exists():
-			for p in res_dir.iterdir():
-				if not p.is_file():
-					continue
-				p_stem = p.stem.lower()
-				if p_stem == stem:
-					print(f"[legend_viewer] Found by stem scan: {p}")
-					return str(p)
-	except Exception as e:
-		print(f"[legend_viewer] Error scanning resource dir {res_dir}: {e}")
-
-	# fallback to placeholder if nothing matches
-	url = _placeholder_img(name, 96 if kind == "legends" else 48)
-	print(f"[legend_viewer] No local file found for '{name}'; using placeholder {url}")
-	return url
+	path = (assets or _assets())["index"].get(kind, name)
+	if path:
+		return path
+	return _placeholder_img(name, 96 if kind == "legends" else 48)
 
 def _stat_abbrev(stat_name: str) -> str:
 	abbr = {
@@ -144,54 +91,40 @@ def _stat_abbrev(stat_name: str) -> str:
 	}
 	return abbr.get(stat_name, stat_name[:3].upper())
 
-def _resolve_stat_image(stat_name: str) -> str:
+def _resolve_stat_image(stat_name: str, assets=None) -> str:
 	"""
-	Resolve the image path for a stat from resources/stats.
-	Uses lowercase, underscores, .png/.jpg.
+	Resolve the image path for a stat from resources/stats via the resource index.
 	"""
-	res_dir = _RESOURCES_DIR / "stats"
-	stem = stat_name.strip().lower().replace(" ", "_")
-	candidates = [f"{stem}.png", f"{stem}.jpg", stem]
-	for cand in candidates:
-		full_path = res_dir / cand
-		if full_path.exists():
-			return str(full_path)
+	path = (assets or _assets())["index"].get("stats", stat_name)
+	if path:
+		return path
 	# fallback to placeholder if not found
 	return _placeholder_img(stat_name, 32)
 
-def _get_legend_data(name: str) -> Dict:
-	# try data from CSV first
+@metrics.timed("resolve")
+def _get_legend_data(name: str, assets=None) -> Dict:
+	assets = assets or _assets()
 	key = name.strip()
-	entry = _data_bank.get(key)
+	record = assets["store"].get(key)
 	# base output
 	out = {"image": None, "weapons": [], "stats": []}
 	# resolve legend portrait from resources/legends via name map
-	out["image"] = _resolve_resource_path("legends", key)
-	# weapons: from CSV if available, otherwise fallback to name_map or placeholders
-	if entry:
-		for wname in entry.get("weapons", []):
-			img = _resolve_resource_path("weapons", wname)
+	out["image"] = _resolve_resource_path("legends", key, assets)
+	# weapons and stats from the legend store, images from resources/
+	if record:
+		for wname in record.weapons:
+			img = _resolve_resource_path("weapons", wname, assets)
 			out["weapons"].append({"name": wname, "image": img})
-		# stats: use values from CSV, images from resources/stats
-		for stat_name in ["Strength", "Dexterity", "Defense", "Speed"]:
-			val = entry.get("stats", {}).get(stat_name, "")
-			# Ensure stat is displayed as integer if possible
-			if val != "":
-				try:
-					val_int = int(float(val))
-					label = str(val_int)
-				except Exception:
-					label = str(val)
-			else:
-				label = "—"
+		for stat_name, val in zip(STAT_NAMES, record.stats):
+			label = str(val) if val != MISSING_STAT else "—"
 			out["stats"].append({
 				"stat": stat_name,
 				"name": label,
-				"image": _resolve_stat_image(stat_name)
+				"image": _resolve_stat_image(stat_name, assets)
 			})
 	else:
 		# fallback: try to find two weapons by attempting common keys in name_map
-		# (this keeps behavior resilient if CSV missing)
+		# (this keeps behavior resilient if the legend is not in the roster)
 		# assemble any weapon names from name_map that look related (not reliable)
 		# simply provide two placeholder weapons
 		out["weapons"] = [
@@ -200,50 +133,109 @@ def _get_legend_data(name: str) -> Dict:
 		]
 		# fallback stats: only placeholder values (no labels)
 		out["stats"] = [
-			{"stat": "Strength", "name": "—", "image": _resolve_stat_image("Strength")},
-			{"stat": "Dexterity", "name": "—", "image": _resolve_stat_image("Dexterity")},
-			{"stat": "Defense", "name": "—", "image": _resolve_stat_image("Defense")},
-			{"stat": "Speed", "name": "—", "image": _resolve_stat_image("Speed")},
+			{"stat": "Strength", "name": "—", "image": _resolve_stat_image("Strength", assets)},
+			{"stat": "Dexterity", "name": "—", "image": _resolve_stat_image("Dexterity", assets)},
+			{"stat": "Defense", "name": "—", "image": _resolve_stat_image("Defense", assets)},
+			{"stat": "Speed", "name": "—", "image": _resolve_stat_image("Speed", assets)},
 		]
 	return out
 
-def _img_src_for_html(path: str) -> str:
+# bounded cache of encoded data URIs keyed by (path, mtime) so each image is
+# read and base64-encoded once per process instead of on every render
+_ASSET_CACHE_MAX_ENTRIES = 256
+_IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".gif", ".webp"}
+_asset_cache = LruCache(_ASSET_CACHE_MAX_ENTRIES)
+
+def _segment_src(path: str, assets) -> Optional[str]:
+	"""
+	Shared mode: the image's URL when $MEET_LEGENDS_IMAGE_URL says where the
+	segment's images are served (so no worker holds a copy), else a data URI
+	encoded from the mapping. None outside shared mode or if the segment
+	doesn't have the image.
+	"""
+	segment = assets["segment"]
+	if segment is None:
+		return None
+	if assets["image_url"]:
+		name = segment.image_name(path)
+		return f"{assets['image_url']}/{name}" if name else None
+	return segment.data_uri(path)
+
+def _cached_data_uri(path: str) -> str:
+	"""
+	Return the data URI for a local file, encoding it only on a cache miss.
+	Raises OSError if the file does not exist.
+	"""
+	key = (path, os.stat(path).st_mtime_ns)
+	uri = _asset_cache.get(key)
+	if uri is None:
+		with metrics.span("encode"):
+			uri = _asset_cache.put(key, encode_data_uri(_Path_for_encode(path)))
+	return uri
+
+def asset_cache_info() -> Dict[str, int]:
+	"""Return hit/miss/eviction counters and the current size of the asset cache."""
+	return _asset_cache.info()
+
+def clear_asset_cache() -> None:
+	_asset_cache.clear()
+
+def warm_asset_cache() -> int:
+	"""Pre-encode every indexed image under resources/. Returns the number of files encoded."""
+	assets = _assets()
+	count = 0
+	for p in assets["index"].paths():
+		if Path(p).suffix.lower() in _IMAGE_SUFFIXES:
+			try:
+				_cached_data_uri(p)
+				count += 1
+			except Exception as e:
+				log.warning("warm_asset_cache failed for %s: %s", p, e)
+	return count
+
+def _display_src(path: str, assets=None) -> str:
+	"""Source for a portrait: its pre-scaled thumbnail if built, else the original."""
+	assets = assets or _assets()
+	build = assets["build"]
+	if build and path and not path.startswith(("http://", "https://")):
+		return _img_src_for_html(build.thumbnail(path) or path, assets)
+	return _img_src_for_html(path, assets)
+
+def _icon_html(path: str, alt: str, assets=None) -> str:
+	"""A weapon/stat icon: an atlas sprite if built, else an inline <img>."""
+	assets = assets or _assets()
+	build = assets["build"]
+	if build and path and not path.startswith(("http://", "https://")):
+		cls = build.sprite_class(path)
+		if cls:
+			return f"<div class='{cls}' role='img' aria-label='{alt}'></div>"
+	return f"<img src='{_img_src_for_html(path, assets)}' alt='{alt}' />"
+
+def _img_src_for_html(path: str, assets=None) -> str:
 	"""
 	Return a source suitable for an <img src="..."> tag:
 	- if path is a URL, return it
-	- if path is local, encode as data URI (png/jpg)
+	- in shared mode, the image's URL or data URI from the segment
+	- if path is local, return its (cached) data URI (png/jpg)
 	- otherwise return placeholder URL
 	"""
 	if not path:
 		return _placeholder_img("missing", 64)
 	if isinstance(path, str) and (path.startswith("http://") or path.startswith("https://")):
 		return path
+	src = _segment_src(str(path), assets or _assets())
+	if src is not None:
+		return src
 	try:
-		p = _Path_for_encode(path)
-		if p.exists() and p.is_file():
-			ext = p.suffix.lower().lstrip(".")
-			mime = "image/png" if ext == "png" or ext == "" else f"image/{ext}"
-			data = p.read_bytes()
-			b64 = base64.b64encode(data).decode("ascii")
-			return f"data:{mime};base64,{b64}"
+		return _cached_data_uri(str(path))
+	except FileNotFoundError:
+		pass
 	# fall back to placeholder and catch errors
 	except Exception as e:
-		print(f"[legend_viewer] _img_src_for_html error for {path}: {e}")
+		log.warning("_img_src_for_html error for %s: %s", path, e)
 	return _placeholder_img("missing", 64)
 
-def display_legends(legends: List[str]):
-	"""
-	Render legends as a single HTML table (gridlines + styled headers + larger name).
-	"""
-	if not legends:
-		st.write("No legends found.")
-		return
-
-	# Sort legend names alphabetically (case-insensitive)
-	legends = sorted(legends, key=str.lower)
-
-	# Build HTML table
-	css = """
+_TABLE_CSS = """
  	<style>
  	:root{
  		--th-bg: #ffffff;              /* keep headers bright in light mode */
@@ -313,72 +305,257 @@ def display_legends(legends: List[str]):
  	</style>
  	"""
 
-	# header row
-	html_rows = []
-	html_rows.append("<table class='lv-table'>")
-	html_rows.append("<thead><tr>")
-	html_rows.append("<th style='width:140px;'></th>")  # portrait column - unlabeled
+_TABLE_HEAD = (
+	"<table class='lv-table'>"
+	"<thead><tr>"
+	"<th style='width:140px;'></th>"  # portrait column - unlabeled
 	# narrower weapons column, larger name column; stats gets remaining width
-	html_rows.append("<th style='width:25%;'>Name</th>")
-	html_rows.append("<th style='width:30%;'>Weapons</th>")
-	html_rows.append("<th style='width:45%;'>Stats</th>")
-	html_rows.append("</tr></thead>")
-	html_rows.append("<tbody>")
+	"<th style='width:25%;'>Name</th>"
+	"<th style='width:30%;'>Weapons</th>"
+	"<th style='width:45%;'>Stats</th>"
+	"</tr></thead>"
+	"<tbody>"
+)
+_TABLE_TAIL = "</tbody></table>"
 
-	for name in legends:
-		data = _get_legend_data(name)
-		# portrait image source suitable for HTML
-		portrait_src = _img_src_for_html(data.get("image"))
-		# weapons HTML
-		weapons_html = ""
-		for w in data.get("weapons", []):
-			w_src = _img_src_for_html(w.get("image"))
-			w_name = w.get("name") or ""
-			weapons_html += (
-				f"<div class='lv-weapon'><img src='{w_src}' alt='{w_name}' /><div class='lv-caption'>{w_name}</div></div>"
-			)
-		if not weapons_html:
-			weapons_html = "<div class='lv-caption'>—</div>"
-
-		# stats HTML
-		# build mapping from stat key -> entry for robust placement
-		stats_map = { (s.get("stat") or "").strip(): s for s in data.get("stats", []) }
-		# ensure each stat exists, fallback to placeholder
-		def stat_entry(key):
-			if key in stats_map:
-				return stats_map[key]
-			# fallback placeholder
-			return {"stat": key, "name": "—", "image": _placeholder_img(_stat_abbrev(key), 32)}
-
-		s_str = stat_entry("Strength")
-		s_def = stat_entry("Defense")
-		s_dex = stat_entry("Dexterity")
-		s_spd = stat_entry("Speed")
-
-		stats_html = (
-			"<div class='lv-stats-grid'>"
-			f"<div class='lv-stat str'><img src='{_img_src_for_html(s_str.get('image'))}' alt='Strength' /><div class='lv-caption'>{s_str.get('name')}</div></div>"
-			f"<div class='lv-stat def'><img src='{_img_src_for_html(s_def.get('image'))}' alt='Defense' /><div class='lv-caption'>{s_def.get('name')}</div></div>"
-			f"<div class='lv-stat dex'><img src='{_img_src_for_html(s_dex.get('image'))}' alt='Dexterity' /><div class='lv-caption'>{s_dex.get('name')}</div></div>"
-			f"<div class='lv-stat spd'><img src='{_img_src_for_html(s_spd.get('image'))}' alt='Speed' /><div class='lv-caption'>{s_spd.get('name')}</div></div>"
-			"</div>"
+def _build_row_html(name: str, assets=None) -> str:
+	"""Build the <tr> for one legend (images inlined as data URIs)."""
+	assets = assets or _assets()
+	data = _get_legend_data(name, assets)
+	# portrait image source suitable for HTML
+	portrait_src = _display_src(data.get("image"), assets)
+	# weapons HTML
+	weapons_html = ""
+	for w in data.get("weapons", []):
+		w_name = w.get("name") or ""
+		weapons_html += (
+			f"<div class='lv-weapon'>{_icon_html(w.get('image'), w_name, assets)}<div class='lv-caption'>{w_name}</div></div>"
 		)
+	if not weapons_html:
+		weapons_html = "<div class='lv-caption'>—</div>"
 
-		# assemble row
-		row = (
-			"<tr>"
-			f"<td class='lv-portrait'><img src='{portrait_src}' alt='{name}'/></td>"
-			f"<td><div class='lv-name'>{name}</div></td>"
-			f"<td><div class='lv-weapons'>{weapons_html}</div></td>"
-			f"<td>{stats_html}</td>"
-			"</tr>"
-		)
-		html_rows.append(row)
+	# stats HTML
+	# build mapping from stat key -> entry for robust placement
+	stats_map = { (s.get("stat") or "").strip(): s for s in data.get("stats", []) }
+	# ensure each stat exists, fallback to placeholder
+	def stat_entry(key):
+		if key in stats_map:
+			return stats_map[key]
+		# fallback placeholder
+		return {"stat": key, "name": "—", "image": _placeholder_img(_stat_abbrev(key), 32)}
+
+	s_str = stat_entry("Strength")
+	s_def = stat_entry("Defense")
+	s_dex = stat_entry("Dexterity")
+	s_spd = stat_entry("Speed")
+
+	stats_html = (
+		"<div class='lv-stats-grid'>"
+		f"<div class='lv-stat str'>{_icon_html(s_str.get('image'), 'Strength', assets)}<div class='lv-caption'>{s_str.get('name')}</div></div>"
+		f"<div class='lv-stat def'>{_icon_html(s_def.get('image'), 'Defense', assets)}<div class='lv-caption'>{s_def.get('name')}</div></div>"
+		f"<div class='lv-stat dex'>{_icon_html(s_dex.get('image'), 'Dexterity', assets)}<div class='lv-caption'>{s_dex.get('name')}</div></div>"
+		f"<div class='lv-stat spd'>{_icon_html(s_spd.get('image'), 'Speed', assets)}<div class='lv-caption'>{s_spd.get('name')}</div></div>"
+		"</div>"
+	)
+
+	# assemble row
+	return (
+		"<tr>"
+		f"<td class='lv-portrait'><img src='{portrait_src}' alt='{name}'/></td>"
+		f"<td><div class='lv-name'>{name}</div></td>"
+		f"<td><div class='lv-weapons'>{weapons_html}</div></td>"
+		f"<td>{stats_html}</td>"
+		"</tr>"
+	)
+
+# Row HTML only depends on the legend's record and the asset files it
+# inlines, so rows are memoized on (name, weapons, stats, file stamps) and
+# whole tables on the tuple of their row keys. The stamps are the mtimes of
+# the images that row uses (a few stat() calls per visible row, so an image
+# overwritten in place is picked up on the next render without scanning
+# every asset), or their digests when they come from a shared segment.
+# Both caches are LRU and bounded by total characters: rows with inline
+# images are ~10 KB, rows linking to served images ~2 KB. The hot reloader
+# also drops the rows that inline a changed asset right away (_on_reload).
+_ROW_CACHE = LruCache(512, max_weight=16 * 1024 * 1024, weigh=len)
+_TABLE_CACHE = LruCache(32, max_weight=32 * 1024 * 1024, weigh=len)
+
+def _row_files(name: str, weapons, assets) -> tuple:
+	"""Local images a row's HTML is built from (thumbnails included when an asset build is used)."""
+	files = assets["row_files"].get((name, weapons))
+	if files is None:
+		index, build = assets["index"], assets["build"]
+		paths = [index.get("legends", name)]
+		if build and paths[0]:
+			paths.append(build.thumbnail(paths[0]))
+		paths.extend(index.get("weapons", w) for w in weapons)
+		paths.extend(index.get("stats", stat) for stat in STAT_NAMES)
+		files = assets["row_files"][(name, weapons)] = tuple(p for p in paths if p)
+	return files
+
+def _file_stamps(paths, seen: Dict[str, Any], segment=None) -> tuple:
+	"""mtimes (or segment digests) of paths; seen memoizes them for one table (rows share stat and weapon icons)."""
+	stamps = []
+	for p in paths:
+		stamp = seen.get(p, seen)
+		if stamp is seen:
+			stamp = segment.image_name(p) if segment is not None else None
+			if stamp is None:
+				try:
+					stamp = os.stat(p).st_mtime_ns
+				except OSError:
+					stamp = None
+			seen[p] = stamp
+		stamps.append(stamp)
+	return tuple(stamps)
+
+def _row_key(name: str, seen: Dict[str, Any], assets) -> tuple:
+	record = assets["store"].get(name.strip())
+	weapons = record.weapons if record is not None else ()
+	files = _row_files(name.strip(), weapons, assets)
+	if record is None:
+		return (name, None, None, files, _file_stamps(files, seen, assets["segment"]))
+	return (name, record.weapons, record.stats, files, _file_stamps(files, seen, assets["segment"]))
+
+def _cached_row_html(key: tuple, assets) -> str:
+	row = _ROW_CACHE.get(key)
+	if row is None:
+		row = _ROW_CACHE.put(key, _build_row_html(key[0], assets))
+	return row
+
+def iter_rows_html(legends: List[str], state=None) -> Iterator[str]:
+	"""Yield row HTML for the legends in the given order, resolving and encoding lazily."""
+	assets = _assets(state)
+	seen: Dict[str, Any] = {}
+	for name in legends:
+		yield _cached_row_html(_row_key(name, seen, assets), assets)
+
+@metrics.timed("html_build")
+def build_table_html(legends: List[str], presorted: bool = False, state=None) -> str:
+	"""
+	Full table HTML (CSS included) for the legends, sorted case-insensitively
+	unless presorted is set (e.g. for an already sorted page slice).
+	"""
+	if not presorted:
+		legends = sorted(legends, key=str.lower)
+	assets = _assets(state)
+	seen: Dict[str, Any] = {}
+	row_keys = tuple(_row_key(name, seen, assets) for name in legends)
+	html = _TABLE_CACHE.get(row_keys)
+	if html is None:
+		rows = (_cached_row_html(key, assets) for key in row_keys)
+		html = _TABLE_CACHE.put(row_keys, _TABLE_CSS + assets["sprite_css"] + _TABLE_HEAD + "".join(rows) + _TABLE_TAIL)
+	return html
+
+def render_cache_info() -> Dict[str, Dict[str, int]]:
+	return {"assets": _asset_cache.info(), "rows": _ROW_CACHE.info(), "tables": _TABLE_CACHE.info()}
+
+def clear_render_caches() -> None:
+	"""Drop cached rows/tables and re-read the resource index and asset build on next use."""
+	global _assets_state
+	_ROW_CACHE.clear()
+	_TABLE_CACHE.clear()
+	_assets_state = {}
+
+def _on_reload(event) -> Dict[str, int]:
+	"""
+	data_access reload listener: drop the rows (and tables containing them)
+	for legends whose record changed or whose portrait or weapon icons
+	changed; stat icons and asset builds appear in every row, so those clear
+	everything. (A new resource index comes with a new DataState, which
+	_assets() picks up by itself.)
+	"""
+	if event.asset_build or event.assets.get("stats"):
+		dropped = {"rows": len(_ROW_CACHE), "tables": len(_TABLE_CACHE)}
+		clear_render_caches()
+		return dropped
+	portraits = event.assets.get("legends", frozenset())
+	icons = event.assets.get("weapons", frozenset())
+
+	def stale(key: tuple) -> bool:
+		name, weapons = key[0], key[1] or ()
+		return (name in event.legends or normalize_name(name) in portraits
+				or any(normalize_name(w) in icons for w in weapons))
+
+	rows = {key for key in _ROW_CACHE.keys() if stale(key)}
+	for key in rows:
+		_ROW_CACHE.discard(key)
+	tables = [key for key in _TABLE_CACHE.keys() if any(k in rows or stale(k) for k in key)]
+	for key in tables:
+		_TABLE_CACHE.discard(key)
+	return {"rows": len(rows), "tables": len(tables)}
+
+data_access.add_reload_listener(_on_reload)
+
+# paging: only the visible slice of a result set is resolved, encoded and
+# sent to the browser; page, page size and sort order live in session state
+PAGE_SIZES = [10, 25, 50, 100]
+DEFAULT_PAGE_SIZE = 10
+SORT_ORDERS = ["Name (A-Z)", "Name (Z-A)"] + [f"{stat} (high-low)" for stat in STAT_NAMES]
+# extra first option for ranked result sets (e.g. similar legends): keep the given order
+RANKED_ORDER = "Rank"
+
+def sort_legends(legends: List[str], order: str = SORT_ORDERS[0], state=None) -> List[str]:
+	"""Sort legend names by one of SORT_ORDERS (ties broken by name), or keep them for RANKED_ORDER."""
+	if order == RANKED_ORDER:
+		return list(legends)
+	by_name = sorted(legends, key=str.lower)
+	if order == "Name (Z-A)":
+		return by_name[::-1]
+	stat = order.split(" (")[0]
+	if stat in STAT_NAMES:
+		store = (state or data_access.current()).store
+		def stat_of(name):
+			record = store.get(name.strip())
+			return record.stat(stat) if record else MISSING_STAT
+		return sorted(by_name, key=stat_of, reverse=True)
+	return by_name
+
+def page_slice(legends: List[str], page: int, page_size: int) -> List[str]:
+	start = (page - 1) * page_size
+	return legends[start:start + page_size]
+
+def display_legends(legends: List[str], ranked: bool = False, key: str = "lv", state=None):
+	"""
+	Render legends as a paged HTML table (gridlines + styled headers + larger name).
+	With ranked=True the given order is offered (and selected) as the first sort order.
+	key prefixes the paging widgets' keys and session state, so each result
+	list keeps its own page and sort order and a page can show several.
+	state is the data_access.DataState the legends came from (read once per run).
+	"""
+	if not legends:
+		st.write("No legends found.")
+		return
+
+	session = st.session_state
+	# new result set -> back to the first page
+	result_key = hash(tuple(legends))
+	if session.get(f"{key}_result_key") != result_key:
+		session[f"{key}_result_key"] = result_key
+		session[f"{key}_page"] = 1
 
-	html_rows.append("</tbody></table>")
+	col1, col2, col3 = st.columns([2, 1, 1])
+	with col1:
+		if ranked:
+			order = st.selectbox("Sort by", options=[RANKED_ORDER] + SORT_ORDERS, key=f"{key}_sort_ranked")
+		else:
+			order = st.selectbox("Sort by", options=SORT_ORDERS, key=f"{key}_sort")
+	with col2:
+		page_size = st.selectbox("Per page", options=PAGE_SIZES, index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE), key=f"{key}_page_size")
+	n_pages = max(1, -(-len(legends) // page_size))
+	if session.get(f"{key}_page", 1) > n_pages:
+		session[f"{key}_page"] = n_pages
+	with col3:
+		page = st.number_input("Page", min_value=1, max_value=n_pages, step=1, key=f"{key}_page")
 
-	html = css + "".join(html_rows)
+	state = state or data_access.current()
+	visible = page_slice(sort_legends(legends, order, state), page, page_size)
+	start = (page - 1) * page_size
+	st.caption(f"Showing {start + 1}-{start + len(visible)} of {len(legends)} legends")
+	html = build_table_html(visible, presorted=True, state=state)
 
 	# compute a reasonable height for the component
-	height = max(400, 160 * len(legends))
-	components.html(html, height=height, scrolling=True)
+	height = max(400, 160 * len(visible))
+	metrics.incr("rows_rendered", len(visible))
+	with metrics.span("render"):
+		components.html(html, height=height, scrolling=True)
@@ -0,0 +1,36 @@
+import streamlit as st
+from utils import metrics
+from scripts.legend_viewer import render_cache_info
+
+def metrics_panel_requested() -> bool:
+    """Shown when $MEET_LEGENDS_DEBUG is set or the page is opened with ?debug=1."""
+    return metrics.debug_enabled() or st.query_params.get("debug") == "1"
+
+def render_metrics_panel():
+    """Sidebar panel with this process's timing spans, counters and render cache stats."""
+    snap = metrics.snapshot()
+    with st.sidebar:
+        st.subheader("Metrics")
+        st.caption(f"process {snap['pid']}")
+        rows = [
+            {
+                "span": name,
+                "count": s["count"],
+                "mean ms": s["mean_ms"],
+                "p50 ms": s["p50_ms"],
+                "p95 ms": s["p95_ms"],
+                "max ms": s["max_ms"],
+            }
+            for name, s in snap["spans"].items()
+        ]
+        if rows:
+            st.table(rows)
+        else:
+            st.write("No spans recorded yet.")
+        if snap["counters"]:
+            st.json(snap["counters"])
+        st.markdown("**Render caches**")
+        st.table([{"cache": name, **info} for name, info in render_cache_info().items()])
+        st.download_button("Export metrics (JSON)", data=metrics.export_json(), file_name="metrics.json", mime="application/json")
+        if st.button("Reset metrics"):
+            metrics.reset()
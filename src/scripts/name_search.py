@@ -0,0 +1,78 @@
+import json
+from utils import data_access
+from typing import Dict, List, Optional, Sequence, Tuple
+from config.data_paths import name_map_path
+from utils.fuzzy_index import FuzzyIndex, Match, build_fuzzy_index
+from utils.metrics import get_logger, span, timed
+import streamlit as st
+from scripts.legend_viewer import display_legends
+from utils.queries import get_legends_by_tag, get_legends_by_weapon
+
+log = get_logger('name_search')
+
+# (store, resource index, fuzzy index), built on first use and rebound in
+# one assignment whenever the roster or the resources (name map) are
+# swapped; the reload listener only frees the stale one early
+_INDEX: Optional[Tuple[object, object, FuzzyIndex]] = None
+
+def _name_map() -> Dict[str, str]:
+    try:
+        with open(name_map_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        log.warning("Failed to load name map, searching without aliases: %s", e)
+        return {}
+
+def fuzzy_index(state=None) -> FuzzyIndex:
+    global _INDEX
+    state = state or data_access.current()
+    cached = _INDEX
+    if cached is None or cached[0] is not state.store or cached[1] is not state.resource_index:
+        with span("name_search.build"):
+            index = build_fuzzy_index(state.store, _name_map())
+        cached = _INDEX = (state.store, state.resource_index, index)
+    return cached[2]
+
+def _on_reload(event) -> Dict[str, int]:
+    global _INDEX
+    if not (event.data or event.resources) or _INDEX is None:
+        return {}
+    _INDEX = None
+    return {"name_index": 1}
+
+data_access.add_reload_listener(_on_reload)
+
+@timed("query.names")
+def search_names(query: str, kinds: Optional[Sequence[str]] = None, limit: int = 10, state=None) -> List[Match]:
+    """Ranked legend/weapon/tag matches for partial or misspelled input, e.g. 'lin fie' -> Lin Fei."""
+    if not query or not query.strip():
+        return []
+    return fuzzy_index(state).search(query, kinds, limit)
+
+def legends_for_match(match: Match, state=None) -> List[str]:
+    if match.kind == 'weapon':
+        return get_legends_by_weapon(match.name, state)
+    if match.kind == 'tag':
+        return get_legends_by_tag(match.name, state)
+    return [match.name]
+
+def handle_name_search():
+    state = data_access.current()
+    query = st.text_input("Search legends, weapons and tags", placeholder="e.g. lin fie, katar, magic")
+    if not query.strip():
+        return
+    matches = search_names(query, state=state)
+    if not matches:
+        st.write("Nothing matches that name")
+        return
+    match = st.radio(
+        "Did you mean",
+        options=matches,
+        format_func=lambda m: f"{m.name} ({m.kind})",
+        horizontal=True,
+    )
+    legends = legends_for_match(match, state)
+    if legends:
+        display_legends(legends, key="names", state=state)
+    else:
+        st.write(f"No legends with {match.name}")
@@ -0,0 +1,27 @@
+from utils import data_access
+from utils.queries import get_legends_by_query
+import streamlit as st
+from scripts.legend_viewer import display_legends
+
+def handle_legends_by_query():
+    state = data_access.current()
+    query = st.text_input(
+        "Query",
+        placeholder='e.g. weapon:Sword & str>=6 & tag:"Magic User" & !tag:Thera'
+    )
+    st.caption(
+        'Combine `weapon:`, `tag:` and `legend:` terms with stat comparisons '
+        '(`str`, `dex`, `def`, `spd` with `= != < <= > >=`, or `spd=4..6`) '
+        'using `&`, `|`, `!` and parentheses. Quote names with spaces.'
+    )
+    if not query.strip():
+        return
+    try:
+        legends = get_legends_by_query(query, state)
+    except ValueError as e:
+        st.error(str(e))
+        return
+    if legends:
+        display_legends(legends, key="query", state=state)
+    else:
+        st.write('No legends match that query')
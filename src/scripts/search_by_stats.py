@@ -1,56 +1,71 @@
+from utils import data_access
 from utils.data_access import (
-    BASE_DATA,
     STAT_NAMES,
     COMPARATORS
 )
-from typing import List
+from utils.stat_index import StatCondition
+from utils.queries import get_legends_by_stat_comparison, get_legends_with_stat_between, get_legends_by_stats
 import streamlit as st
 from scripts.legend_viewer import display_legends  # add import
 
-def get_legends_by_stat(stat_name, stat_val) -> List[str]:
-    return list(BASE_DATA[BASE_DATA[stat_name] == stat_val]['Legend'])
+def _stat_bounds_inputs(key_prefix=""):
+    lower = st.number_input(
+        "Lower Bound",
+        min_value=0,
+        max_value=10,
+        value=0,
+        step=1,
+        key=f"{key_prefix}lower"
+    )
+    upper = st.number_input(
+        "Upper Bound:",
+        min_value=0,
+        max_value=10,
+        value=0,
+        step=1,
+        key=f"{key_prefix}upper"
+    )
+    return lower, upper
 
-def get_legends_by_stat_comparison(stat_name, stat_val, comparator='='):
-    if comparator == '=':
-        return get_legends_by_stat(stat_name, stat_val)
-    elif comparator == '<=':
-        vals = [i for i in range(stat_val+1)]
-        legends = []
-        for val in vals:
-            legends.extend(get_legends_by_stat(stat_name, val))
-        return legends
-    elif comparator == '<':
-        vals = [i for i in range(stat_val)]
-        legends = []
-        for val in vals:
-            legends.extend(get_legends_by_stat(stat_name, val))
-        return legends
-    elif comparator == '>=':
-        vals = [i for i in range(stat_val, 11)]
-        legends = []
-        for val in vals:
-            legends.extend(get_legends_by_stat(stat_name, val))
-        return legends
-    elif comparator == '>':
-        vals = [i for i in range(stat_val+1, 11)]
-        legends = []
-        for val in vals:
-            legends.extend(get_legends_by_stat(stat_name, val))
-        return legends
-    else:
-        return []
-    
-def get_legends_with_stat_between(stat_name, stat_lower, stat_upper):
-    if stat_upper < stat_lower:
-        return []
-
-    legends_ge_lower = get_legends_by_stat_comparison(stat_name, stat_lower, '>=')
-    legends_gt_upper = get_legends_by_stat_comparison(stat_name, stat_upper, '>')
-    return [legend for legend in legends_ge_lower if legend not in legends_gt_upper]
+def _stat_value_input(key_prefix=""):
+    return st.number_input(
+        "Enter an integer:",
+        min_value=0,
+        max_value=10,
+        value=0,
+        step=1,
+        key=f"{key_prefix}value"
+    )
 
+def handle_legends_by_compound_stats(state):
+    conditions = []
+    for stat in STAT_NAMES:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.markdown(f"**{stat}**")
+        with col2:
+            comp = st.selectbox("", options=COMPARATORS, index=None, placeholder="Any", key=f"compound_{stat}_comp")
+        with col3:
+            if comp == 'between':
+                lower, upper = _stat_bounds_inputs(f"compound_{stat}_")
+                conditions.append(StatCondition(stat, comp, lower, upper))
+            elif comp:
+                conditions.append(StatCondition(stat, comp, _stat_value_input(f"compound_{stat}_")))
 
+    if conditions:
+        legends = get_legends_by_stats(conditions, state)
+        if legends:
+            display_legends(legends, key="stats_compound", state=state)
+        else:
+            st.write("No legends match all of those stats")
 
 def handle_legends_by_stats():
+    state = data_access.current()
+    if st.checkbox("Combine several stats"):
+        handle_legends_by_compound_stats(state)
+        return
+
+    legends = []
     col1, col2, col3 = st.columns(3)
     with col1:
         selected_stat = st.selectbox("Which stat do you want to filter on?", options=STAT_NAMES, index=None, placeholder="Select a stat")
@@ -58,30 +73,13 @@ def handle_legends_by_stats():
         selected_comp = st.selectbox("", options=COMPARATORS, index=None, placeholder="Select a comparator...")
     with col3:
         if selected_comp == 'between':
-            lower = st.number_input(
-                "Lower Bound",
-                min_value=0,
-                max_value=10,
-                value=0,
-                step=1 
-            )
-            upper = st.number_input(
-                "Upper Bound:",
-                min_value=0,
-                max_value=10,
-                value=0,
-                step=1 
-            )
-            legends = get_legends_with_stat_between(selected_stat, lower, upper)
+            lower, upper = _stat_bounds_inputs()
+            if selected_stat:
+                legends = get_legends_with_stat_between(selected_stat, lower, upper, state)
         else:
-            selected_val = st.number_input(
-                "Enter an integer:",
-                min_value=0,
-                max_value=10,
-                value=0,
-                step=1 
-            )
-            legends = get_legends_by_stat_comparison(selected_stat, selected_val, selected_comp)
+            selected_val = _stat_value_input()
+            if selected_stat and selected_comp:
+                legends = get_legends_by_stat_comparison(selected_stat, selected_val, selected_comp, state)
 
     if legends:
-        display_legends(legends)
+        display_legends(legends, key="stats", state=state)
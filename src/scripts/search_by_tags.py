@@ -1,19 +1,34 @@
-from utils.data_access import (
-    BASE_DATA,
-    TAGS
-)
-from typing import List
+from utils import data_access
+from utils.queries import get_legends_by_tag, get_legends_by_tags, get_legends_by_tag_query
 import streamlit as st
 from scripts.legend_viewer import display_legends  # add import
 
-def get_legends_by_tag(tag) -> List[str]:
-    return list(BASE_DATA[BASE_DATA[tag] == 1]['Legend'])
-
 def handle_legends_by_tags():
-    selected_tag = st.selectbox("Select the tag you're looking for", options=TAGS, index=None, placeholder='Select a tag...')
-    if selected_tag:
-        legends = get_legends_by_tag(selected_tag)
-        if legends:
-            display_legends(legends)
-        else:
-            st.write('No legends with selected tag')
\ No newline at end of file
+    state = data_access.current()
+    col1, col2, col3 = st.columns([3, 1, 3])
+    with col1:
+        selected_tags = st.multiselect("Select the tags you're looking for", options=state.tags, placeholder='Select tags...')
+    with col2:
+        match = st.radio("Match", options=['all', 'any'], horizontal=True)
+    with col3:
+        excluded_tags = st.multiselect("Exclude tags", options=state.tags, placeholder='Select tags...')
+    query = st.text_input(
+        "Or write a tag query",
+        placeholder='e.g. Magic User AND NOT Semi-Human OR Thera'
+    )
+
+    if query.strip():
+        try:
+            legends = get_legends_by_tag_query(query, state)
+        except ValueError as e:
+            st.error(str(e))
+            return
+    elif selected_tags or excluded_tags:
+        legends = get_legends_by_tags(selected_tags, excluded_tags, match_all=(match == 'all'), state=state)
+    else:
+        return
+
+    if legends:
+        display_legends(legends, key="tags", state=state)
+    else:
+        st.write('No legends with selected tags')
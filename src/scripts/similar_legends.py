@@ -0,0 +1,65 @@
+from utils import data_access
+from typing import Dict, List, Optional, Tuple
+from utils.metrics import timed, span
+from utils.similarity import SimilarityIndex, SimilarityWeights
+import streamlit as st
+from scripts.legend_viewer import display_legends
+
+# (store, index) for the current roster, rebound in one assignment when the
+# store is swapped; the index is weight-independent (weights are applied per
+# query), and the reload listener only frees a stale one early
+_INDEX: Optional[Tuple[object, SimilarityIndex]] = None
+
+def similarity_index(state=None) -> SimilarityIndex:
+    global _INDEX
+    store = (state or data_access.current()).store
+    cached = _INDEX
+    if cached is None or cached[0] is not store:
+        with span("similarity.build"):
+            index = SimilarityIndex(store)
+        cached = _INDEX = (store, index)
+    return cached[1]
+
+def _on_reload(event) -> Dict[str, int]:
+    global _INDEX
+    if not event.data or _INDEX is None:
+        return {}
+    _INDEX = None
+    return {"similarity": 1}
+
+data_access.add_reload_listener(_on_reload)
+
+@timed("query.similar")
+def get_similar_legends(legend, k=10, weights: SimilarityWeights = SimilarityWeights(), state=None) -> List[Tuple[str, float]]:
+    if legend is None:
+        return []
+    return similarity_index(state).most_similar(legend, k, weights)
+
+def handle_similar_legends():
+    state = data_access.current()
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        legend = st.selectbox("Legend", options=state.store.names, index=None, placeholder="Select a legend...")
+    with col2:
+        k = st.number_input("How many", min_value=1, max_value=50, value=10, step=1)
+    defaults = SimilarityWeights()
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        w_stats = st.slider("Stats weight", 0.0, 1.0, defaults.stats, step=0.05)
+    with col2:
+        w_weapons = st.slider("Weapons weight", 0.0, 1.0, defaults.weapons, step=0.05)
+    with col3:
+        w_tags = st.slider("Tags weight", 0.0, 1.0, defaults.tags, step=0.05)
+
+    if legend is None:
+        return
+    try:
+        similar = get_similar_legends(legend, int(k), SimilarityWeights(w_stats, w_weapons, w_tags), state)
+    except ValueError as e:
+        st.error(str(e))
+        return
+    if similar:
+        st.caption(" · ".join(f"{name} {score:.0%}" for name, score in similar))
+        display_legends([name for name, _ in similar], ranked=True, key="similar", state=state)
+    else:
+        st.write("No other legends to compare with")
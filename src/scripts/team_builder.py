@@ -0,0 +1,97 @@
+from utils import data_access
+from typing import Dict, Iterator, List
+from utils.legend_store import STAT_COLUMNS
+from utils.metrics import span
+from utils.stat_index import StatCondition
+from utils.team_search import SCORERS, Team, TeamConstraints, TeamSearchProgress, TEAM_SIZES, search_teams
+import streamlit as st
+from scripts.legend_viewer import display_legends
+
+def find_teams(constraints: TeamConstraints, objective: Dict[str, float], top: int = 5, state=None) -> Iterator[TeamSearchProgress]:
+    store = (state or data_access.current()).store
+    with span("query.teams"):
+        yield from search_teams(store, constraints, objective, top)
+
+def _team_rows(teams: List[Team], store) -> List[Dict[str, object]]:
+    rows = []
+    for team in teams:
+        # a kept result can name a legend the current roster no longer has
+        records = [r for r in (store.get(name) for name in team.members) if r is not None]
+        weapons = sorted({w for r in records for w in r.weapons})
+        tags = sorted({t for r in records for t in store.tags_of(r.name)})
+        rows.append({
+            "Team": " + ".join(team.members),
+            "Score": round(team.score, 2),
+            "Weapons": f"{len(weapons)}: {', '.join(weapons)}",
+            "Tags": len(tags),
+        })
+    return rows
+
+def handle_team_builder():
+    state = data_access.current()
+    names = state.store.names
+    col1, col2, col3 = st.columns([1, 3, 3])
+    with col1:
+        size = st.radio("Team size", options=list(TEAM_SIZES), horizontal=True)
+    with col2:
+        include = st.multiselect("Must include", options=names, max_selections=size, placeholder="Select legends...")
+    with col3:
+        exclude = st.multiselect("Never pick", options=names, placeholder="Select legends...")
+
+    st.caption("At least one member with (0 = no requirement)")
+    minimums = {}
+    for col, stat in zip(st.columns(len(STAT_COLUMNS)), STAT_COLUMNS):
+        with col:
+            minimums[stat] = st.number_input(f"{stat} ≥", min_value=0, max_value=10, value=0, step=1)
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        any_tags = st.multiselect("At least one member with one of these tags", options=state.tags, placeholder="Select tags...")
+    with col2:
+        no_shared = st.checkbox("No shared weapons")
+
+    labels = {scorer.label: name for name, scorer in SCORERS.items()}
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        goals = st.multiselect("Optimize for", options=list(labels), default=[SCORERS['weapons'].label])
+    with col2:
+        top = st.number_input("Teams to show", min_value=1, max_value=20, value=5, step=1)
+
+    constraints = TeamConstraints(
+        size=size,
+        include=tuple(include),
+        exclude=tuple(exclude),
+        stat_conditions=tuple(StatCondition(stat, '>=', int(v)) for stat, v in minimums.items() if v > 0),
+        any_tags=tuple(any_tags),
+        no_shared_weapons=no_shared,
+    )
+    # the first goal decides; the others (weight 0.1) mostly break ties
+    objective = {labels[goal]: 1.0 if i == 0 else 0.1 for i, goal in enumerate(goals)}
+    # keyed on the data version too: a reload can change or remove the legends kept here
+    request = (state.version, constraints, tuple(objective.items()), int(top))
+
+    session = st.session_state
+    placeholder = st.empty()
+    if st.button("Find teams", type="primary"):
+        try:
+            for progress in find_teams(constraints, objective, int(top), state):
+                with placeholder.container():
+                    if not progress.done:
+                        st.progress(progress.chunks_done / progress.chunks, text="Searching... best so far:")
+                    if progress.best:
+                        st.dataframe(_team_rows(progress.best, state.store), hide_index=True)
+        except ValueError as e:
+            st.error(str(e))
+            return
+        session["tb_result"] = (request, progress.best)
+    elif session.get("tb_result", (None,))[0] == request:
+        with placeholder.container():
+            st.dataframe(_team_rows(session["tb_result"][1], state.store), hide_index=True)
+    else:
+        return
+
+    best = session["tb_result"][1]
+    if best:
+        st.subheader("Best team")
+        display_legends(list(best[0].members), ranked=True, key="team", state=state)
+    else:
+        st.write("No team meets those constraints")
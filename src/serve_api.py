@@ -0,0 +1,176 @@
+import argparse
+import asyncio
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from utils import data_access, hot_reload
+from utils.data_access import STAT_NAMES, COMPARATORS
+from utils.metrics import get_logger
+from utils.query_service import Blob, QueryError, QueryService
+from utils.stat_index import StatCondition
+from utils.queries import (
+    get_legends_by_query,
+    get_legends_by_stat_comparison,
+    get_legends_with_stat_between,
+    get_legends_by_stats,
+    get_legends_by_tag,
+    get_legends_by_tags,
+    get_legends_by_tag_query,
+    get_legends_by_weapon,
+    get_legends_by_weapons,
+    get_legends_by_weapon_set,
+)
+
+API_PORT_ENV = 'MEET_LEGENDS_API_PORT'
+API_HOST_ENV = 'MEET_LEGENDS_API_HOST'
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8502
+
+log = get_logger('serve_api')
+
+
+def _field(query: dict, key: str, kind=str, default=None):
+    if key not in query and default is not None:
+        return default
+    value = query.get(key)
+    if value is None:
+        raise QueryError(f"missing {key!r}")
+    if kind is int and (isinstance(value, bool) or not isinstance(value, int)):
+        raise QueryError(f"{key!r} must be an integer")
+    if kind is list and not (isinstance(value, list) and all(isinstance(v, str) for v in value)):
+        raise QueryError(f"{key!r} must be a list of strings")
+    if kind is str and not isinstance(value, str):
+        raise QueryError(f"{key!r} must be a string")
+    if kind is bool and not isinstance(value, bool):
+        raise QueryError(f"{key!r} must be true or false")
+    return value
+
+
+def _condition(query: dict) -> StatCondition:
+    stat = _field(query, 'stat')
+    if stat not in STAT_NAMES:
+        raise QueryError(f"unknown stat {stat!r}; expected one of {STAT_NAMES}")
+    comparator = _field(query, 'comparator', default='=')
+    if comparator not in COMPARATORS:
+        raise QueryError(f"unknown comparator {comparator!r}; expected one of {COMPARATORS}")
+    upper = _field(query, 'upper', int) if comparator == 'between' else None
+    return StatCondition(stat, comparator, _field(query, 'value', int), upper)
+
+
+def _stat(query: dict) -> List[str]:
+    cond = _condition(query)
+    if cond.comparator == 'between':
+        return get_legends_with_stat_between(cond.stat, cond.value, cond.upper)
+    return get_legends_by_stat_comparison(cond.stat, cond.value, cond.comparator)
+
+
+def _stats(query: dict) -> List[str]:
+    conditions = query.get('conditions')
+    if not isinstance(conditions, list):
+        raise QueryError("'conditions' must be a list of stat conditions")
+    return get_legends_by_stats([_condition(c) for c in conditions])
+
+
+def _weapon_pair(query: dict) -> List[str]:
+    weapons = _field(query, 'weapons', list)
+    if len(weapons) != 2:
+        raise QueryError("'weapons' must name exactly two weapons")
+    return get_legends_by_weapons(*weapons)
+
+
+# query "type" -> handler; each reuses the lookup the matching Streamlit page calls (utils.queries)
+OPERATIONS = {
+    'stat': _stat,
+    'stats': _stats,
+    'tag': lambda q: get_legends_by_tag(_field(q, 'tag')),
+    'tags': lambda q: get_legends_by_tags(
+        _field(q, 'include', list, ()), _field(q, 'exclude', list, ()), _field(q, 'match_all', bool, True)),
+    'tag_query': lambda q: get_legends_by_tag_query(_field(q, 'query')),
+    'weapon': lambda q: get_legends_by_weapon(_field(q, 'weapon')),
+    'weapon_pair': _weapon_pair,
+    'weapons': lambda q: get_legends_by_weapon_set(_field(q, 'weapons', list), _field(q, 'match_all', bool, True)),
+    'query': lambda q: get_legends_by_query(_field(q, 'query')),
+}
+
+
+def _segment_image(name: str) -> Optional[Blob]:
+    # shared mode: images straight from the segment mapping, linked from the
+    # pages by $MEET_LEGENDS_IMAGE_URL
+    segment = data_access.current().segment
+    found = segment.named_image(name) if segment is not None else None
+    return Blob(*found) if found is not None else None
+
+
+_background: Dict[str, object] = {}
+_background_lock = threading.Lock()
+
+
+def _serve(service: QueryService, host: str, port: int) -> None:
+    try:
+        asyncio.run(service.serve_forever(host, port))
+    except OSError as e:
+        # e.g. the port is taken: the app keeps running, without the API
+        log.error("JSON API could not listen on %s:%d: %s", host, port, e)
+
+
+def start_in_background(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> QueryService:
+    """
+    Run the service on a daemon thread of the current process (once per
+    process), so it answers from the same loaded roster as the Streamlit app.
+    """
+    with _background_lock:
+        if 'service' not in _background:
+            service = QueryService(OPERATIONS, files=_segment_image)
+            thread = threading.Thread(target=_serve, args=(service, host, port), name='query-service', daemon=True)
+            thread.start()
+            _background.update(service=service, thread=thread)
+    return _background['service']
+
+
+def _address_from_env() -> Optional[Tuple[str, int]]:
+    value = os.environ.get(API_PORT_ENV, '').strip()
+    if not value:
+        return None
+    try:
+        port = int(value)
+    except ValueError:
+        port = 0
+    if not 0 < port < 65536:
+        log.error("$%s must be a port number between 1 and 65535, got %r; not starting the JSON API", API_PORT_ENV, value)
+        return None
+    return os.environ.get(API_HOST_ENV, DEFAULT_HOST), port
+
+
+def start_from_env():
+    """
+    Start the background service if $MEET_LEGENDS_API_PORT is set. The
+    environment is read once per process (the app calls this on every rerun),
+    so an invalid port is logged one time and then ignored.
+    """
+    with _background_lock:
+        if 'address' not in _background:
+            _background['address'] = _address_from_env()
+    address = _background['address']
+    if address is None:
+        return None
+    return start_in_background(*address)
+
+
+# run from the repository root: python src/serve_api.py [--host 127.0.0.1] [--port 8502]
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve the legend lookups as a JSON HTTP API.")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    store = data_access.STORE  # load before accepting connections
+    hot_reload.start_from_env()
+    print(f"loaded {len(store)} legends in {(time.perf_counter() - start) * 1000:.1f} ms; "
+          f"serving on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(QueryService(OPERATIONS, files=_segment_image).serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,135 @@
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from utils.legend_store import LegendStore, MISSING_STAT, STAT_COLUMNS
+
+GROUPINGS = ('weapon', 'weapon_pair', 'tag')
+AGGREGATES = ('mean', 'min', 'max', 'sum')
+# stat values the histograms count (the CSV uses 0..10)
+HIST_BINS = 11
+
+
+class GroupSummary:
+    """
+    Per-group stat aggregates; every array is indexed [group, stat] in
+    STAT_COLUMNS order (hist adds a value axis, 0..HIST_BINS-1). counts is
+    the number of legends in each group; legends with a missing stat are
+    left out of that stat's aggregates (stat_counts), so a group with no
+    values has NaN mean/min/max.
+    """
+
+    def __init__(self, by: str, labels: Sequence[str], counts: np.ndarray, stat_counts: np.ndarray,
+                 sums: np.ndarray, mins: np.ndarray, maxs: np.ndarray, hist: np.ndarray):
+        self.by = by
+        self.labels = list(labels)
+        self.counts = counts
+        self.stat_counts = stat_counts
+        self.sums = sums
+        self.mins = mins
+        self.maxs = maxs
+        self.hist = hist
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.means = sums / stat_counts
+        self._row = {label: i for i, label in enumerate(self.labels)}
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def aggregate(self, name: str) -> np.ndarray:
+        if name not in AGGREGATES:
+            raise ValueError(f"unknown aggregate {name!r}; expected one of {AGGREGATES}")
+        return {'mean': self.means, 'min': self.mins, 'max': self.maxs, 'sum': self.sums}[name]
+
+    def get(self, label: str, stat: str, aggregate: str = 'mean') -> Optional[float]:
+        """e.g. get('Katars', 'Dexterity') -> average Dexterity of Katars users; None for an unknown group."""
+        row = self._row.get(label)
+        if row is None:
+            return None
+        return float(self.aggregate(aggregate)[row, STAT_COLUMNS.index(stat)])
+
+    def histogram(self, label: str) -> Optional[Dict[str, List[int]]]:
+        """stat -> number of the group's legends with each value 0..HIST_BINS-1."""
+        row = self._row.get(label)
+        if row is None:
+            return None
+        return {stat: self.hist[row, j].tolist() for j, stat in enumerate(STAT_COLUMNS)}
+
+    def ranked(self, stat: str, aggregate: str = 'mean', top: Optional[int] = None) -> List[tuple]:
+        """(label, value) pairs, highest first; groups without a value are left out."""
+        values = self.aggregate(aggregate)[:, STAT_COLUMNS.index(stat)]
+        order = [i for i in np.argsort(-values, kind='stable').tolist() if not np.isnan(values[i])]
+        return [(self.labels[i], float(values[i])) for i in order[:top]]
+
+    def rows(self) -> List[Dict[str, object]]:
+        """One dict per group: legends, then mean/min/max per stat (NaN -> None)."""
+        out = []
+        for i, label in enumerate(self.labels):
+            row: Dict[str, object] = {'Group': label, 'Legends': int(self.counts[i])}
+            for j, stat in enumerate(STAT_COLUMNS):
+                for name, arr in (('mean', self.means), ('min', self.mins), ('max', self.maxs)):
+                    value = arr[i, j]
+                    row[f'{stat} {name}'] = None if np.isnan(value) else round(float(value), 2)
+            out.append(row)
+        return out
+
+    def to_dataframe(self):
+        """The rows() table as a pandas DataFrame (needs pandas)."""
+        try:
+            import pandas as pd
+        except ImportError as e:
+            raise ImportError("GroupSummary.to_dataframe needs pandas; use rows() instead") from e
+        return pd.DataFrame(self.rows()).set_index('Group')
+
+
+def _memberships(store: LegendStore, by: str):
+    """(labels, group index, legend index): one entry per legend in each group it belongs to."""
+    if by == 'weapon':
+        legend_idx, slot = np.nonzero(store.weapon_ids >= 0)
+        group_idx = store.weapon_ids[legend_idx, slot].astype(np.int64)
+        # a legend listing the same weapon twice counts once
+        keep = np.unique(group_idx * len(store) + legend_idx, return_index=True)[1]
+        return store.weapon_names, group_idx[keep], legend_idx[keep]
+    if by == 'weapon_pair':
+        ids = np.sort(store.weapon_ids.astype(np.int64), axis=1)
+        legend_idx = np.flatnonzero((ids >= 0).all(axis=1) & (ids[:, 0] != ids[:, 1]))
+        codes = ids[legend_idx, 0] * len(store.weapon_names) + ids[legend_idx, 1]
+        pair_codes, group_idx = np.unique(codes, return_inverse=True)
+        names = store.weapon_names
+        labels = [f"{names[c // len(names)]} + {names[c % len(names)]}" for c in pair_codes.tolist()]
+        return labels, group_idx, legend_idx
+    if by == 'tag':
+        bits = np.arange(len(store.tag_names), dtype=np.uint32)
+        has = (store.tag_masks[None, :] >> bits[:, None]) & np.uint32(1)
+        group_idx, legend_idx = np.nonzero(has)
+        return store.tag_names, group_idx, legend_idx
+    raise ValueError(f"unknown grouping {by!r}; expected one of {GROUPINGS}")
+
+
+def summarize(store: LegendStore, by: str) -> GroupSummary:
+    """
+    Aggregate the four stats per weapon, weapon pair or tag. Group
+    membership is expanded to (group, legend) index pairs once, then a
+    single bincount builds a value histogram per (group, stat); stats are
+    small ints, so counts, sums, minima and maxima all come from it.
+    """
+    labels, group_idx, legend_idx = _memberships(store, by)
+    g, n_stats = len(labels), len(STAT_COLUMNS)
+    counts = np.bincount(group_idx, minlength=g)
+
+    values = store.stats[legend_idx].astype(np.int64)
+    valid = values != MISSING_STAT
+    # flattened (group, stat) slot for every membership x stat
+    slot = (group_idx[:, None] * n_stats + np.arange(n_stats))[valid]
+    vals = values[valid]
+    low = min(int(vals.min()), 0) if len(vals) else 0
+    width = max(int(vals.max()) - low + 1, HIST_BINS - low) if len(vals) else HIST_BINS
+    full = np.bincount(slot * width + (vals - low), minlength=g * n_stats * width).reshape(g, n_stats, width)
+
+    bins = np.arange(low, low + width)
+    stat_counts = full.sum(axis=2).astype(np.float64)
+    sums = (full * bins).sum(axis=2).astype(np.float64)
+    seen = full > 0
+    present = stat_counts > 0
+    mins = np.where(present, bins[seen.argmax(axis=2)], np.nan)
+    maxs = np.where(present, bins[width - 1 - seen[:, :, ::-1].argmax(axis=2)], np.nan)
+    hist = full[:, :, -low:HIST_BINS - low]
+    return GroupSummary(by, labels, counts, stat_counts, sums, mins, maxs, hist)
@@ -0,0 +1,198 @@
+import hashlib
+import json
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from utils.legend_store import LegendStore, STAT_COLUMNS, MISSING_STAT
+from utils.snapshot import UNREADABLE_NPZ, save_npz_atomic
+from utils.stat_index import stat_mask
+from utils.tag_index import bit_positions
+
+ANSWER_TABLE_VERSION = 1
+# everything the stats page can ask: number inputs are 0..10
+STAT_VALUES = tuple(range(0, 11))
+SCALAR_COMPARATORS = ('=', '<=', '>=', '<', '>')
+
+
+def stat_key(stat: str, comparator: str, value: int, upper: Optional[int] = None) -> str:
+    return f"stat|{stat}|{comparator}|{value}|{'' if upper is None else upper}"
+
+
+def tag_key(tag: str) -> str:
+    return f"tag|{tag}"
+
+
+def weapon_key(w1: str, w2: Optional[str] = None) -> str:
+    if w2 is None or w1 == w2:
+        return f"weapon|{w1}"
+    return "pair|" + "|".join(sorted((w1, w2)))
+
+
+def store_fingerprint(store: LegendStore) -> str:
+    """sha1 over everything the answers depend on (names, stats, weapons, tags)."""
+    h = hashlib.sha1()
+    for part in (store.names, store.weapon_names, store.tag_names):
+        h.update(json.dumps(part).encode('utf-8'))
+    for arr in (store.stats, store.weapon_ids, store.tag_masks):
+        h.update(np.ascontiguousarray(arr).tobytes())
+    return h.hexdigest()
+
+
+def bitset_to_mask(bits: int, n: int) -> np.ndarray:
+    mask = np.zeros(n, dtype=bool)
+    mask[bit_positions(bits)] = True
+    return mask
+
+
+class AnswerTable:
+    """
+    Precomputed legend lists for every stat, single-tag and weapon / weapon
+    pair query the search pages can issue. Answers are stored as packed
+    bitsets over the roster (one row per query key) and decoded to a tuple
+    of names on first use, so repeated lookups are a dict hit.
+    """
+
+    def __init__(self, names: Sequence[str], keys: Sequence[str], bits: np.ndarray, fingerprint: str):
+        self.names = list(names)
+        self.fingerprint = fingerprint
+        self.bits = bits
+        self._row = {key: i for i, key in enumerate(keys)}
+        self._decoded: Dict[str, Tuple[str, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._row)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._row
+
+    @property
+    def keys(self) -> List[str]:
+        return list(self._row)
+
+    def checksum(self) -> str:
+        return hashlib.sha1(np.ascontiguousarray(self.bits).tobytes()).hexdigest()
+
+    def mask(self, key: str) -> Optional[np.ndarray]:
+        row = self._row.get(key)
+        if row is None:
+            return None
+        return np.unpackbits(self.bits[row], count=len(self.names), bitorder='little').astype(bool)
+
+    def get(self, key: str) -> Optional[Tuple[str, ...]]:
+        """Legend names (roster order) for a query key, or None if it was not precomputed."""
+        found = self._decoded.get(key)
+        if found is None:
+            mask = self.mask(key)
+            if mask is None:
+                return None
+            names = self.names
+            found = self._decoded[key] = tuple(names[i] for i in np.flatnonzero(mask).tolist())
+        return found
+
+    def stat(self, stat: str, comparator: str, value: int, upper: Optional[int] = None) -> Optional[Tuple[str, ...]]:
+        return self.get(stat_key(stat, comparator, value, upper))
+
+    def tag(self, tag: str) -> Optional[Tuple[str, ...]]:
+        return self.get(tag_key(tag))
+
+    def weapons(self, w1: str, w2: Optional[str] = None) -> Optional[Tuple[str, ...]]:
+        return self.get(weapon_key(w1, w2))
+
+
+def build_answer_table(store: LegendStore) -> AnswerTable:
+    """Compute every answer with broadcast comparisons over the whole roster at once."""
+    values = np.array(STAT_VALUES, dtype=np.int16)
+    keys: List[str] = []
+    masks: List[np.ndarray] = []
+
+    for col, stat in enumerate(STAT_COLUMNS):
+        column = store.stats[:, col].astype(np.int16)[:, None]
+        present = column != MISSING_STAT
+        scalar = {
+            '=': column == values, '<=': column <= values, '>=': column >= values,
+            '<': column < values, '>': column > values,
+        }
+        for comparator in SCALAR_COMPARATORS:
+            result = present & scalar[comparator]
+            for j, value in enumerate(STAT_VALUES):
+                keys.append(stat_key(stat, comparator, value))
+                masks.append(result[:, j])
+        # between lower..upper = (>= lower) & (<= upper); empty when upper < lower
+        ge = present & scalar['>=']
+        le = scalar['<=']
+        for i, lower in enumerate(STAT_VALUES):
+            for j, upper in enumerate(STAT_VALUES):
+                keys.append(stat_key(stat, 'between', lower, upper))
+                masks.append(ge[:, i] & le[:, j] if upper >= lower else np.zeros(len(store), dtype=bool))
+
+    for bit, tag in enumerate(store.tag_names):
+        keys.append(tag_key(tag))
+        masks.append((store.tag_masks >> np.uint32(bit)) & np.uint32(1) == 1)
+
+    has = {w: (store.weapon_ids == i).any(axis=1) for i, w in enumerate(store.weapon_names)}
+    for w in store.weapon_names:
+        keys.append(weapon_key(w))
+        masks.append(has[w])
+    for w1, w2 in combinations(store.weapon_names, 2):
+        keys.append(weapon_key(w1, w2))
+        masks.append(has[w1] & has[w2])
+
+    matrix = np.array(masks, dtype=bool).reshape(len(keys), len(store))
+    bits = np.packbits(matrix, axis=1, bitorder='little')
+    return AnswerTable(store.names, keys, bits, store_fingerprint(store))
+
+
+def verify_answer_table(table: AnswerTable, store: LegendStore, tag_index, weapon_index) -> List[str]:
+    """Recompute every answer through the live query paths; return the keys that disagree."""
+    bad = []
+
+    def check(key: str, live: np.ndarray) -> None:
+        mask = table.mask(key)
+        if mask is None or not np.array_equal(mask, live):
+            bad.append(key)
+
+    for stat in STAT_COLUMNS:
+        column = store.stat_column(stat)
+        for comparator in SCALAR_COMPARATORS:
+            for value in STAT_VALUES:
+                check(stat_key(stat, comparator, value), stat_mask(column, comparator, value))
+        for lower in STAT_VALUES:
+            for upper in STAT_VALUES:
+                check(stat_key(stat, 'between', lower, upper), stat_mask(column, 'between', lower, upper))
+    n = len(store)
+    for tag in store.tag_names:
+        check(tag_key(tag), bitset_to_mask(tag_index.bits(tag), n))
+    for w in store.weapon_names:
+        check(weapon_key(w), bitset_to_mask(weapon_index.bits(w), n))
+    for w1, w2 in combinations(store.weapon_names, 2):
+        live = np.zeros(n, dtype=bool)
+        live[[store.get(name).index for name in weapon_index.legends_with_pair(w1, w2)]] = True
+        check(weapon_key(w1, w2), live)
+    return bad
+
+
+def write_answer_table(path: str, table: AnswerTable) -> None:
+    meta = {'version': ANSWER_TABLE_VERSION, 'fingerprint': table.fingerprint, 'checksum': table.checksum()}
+    save_npz_atomic(
+        Path(path),
+        meta=np.array(json.dumps(meta)),
+        names=np.array(table.names, dtype=str),
+        keys=np.array(table.keys, dtype=str),
+        bits=table.bits,
+    )
+
+
+def load_answer_table(path: str, fingerprint: str) -> Optional[AnswerTable]:
+    """Return the stored table if it was built from data with this fingerprint and is intact, else None."""
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            if meta.get('version') != ANSWER_TABLE_VERSION or meta.get('fingerprint') != fingerprint:
+                return None
+            table = AnswerTable(data['names'].tolist(), data['keys'].tolist(), data['bits'], fingerprint)
+    except UNREADABLE_NPZ:
+        return None
+    if table.checksum() != meta.get('checksum'):
+        return None
+    return table
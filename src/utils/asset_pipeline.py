@@ -0,0 +1,242 @@
+import base64
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# width (px) each kind is displayed at in the legend table
+DISPLAY_WIDTHS = {'legends': 120, 'weapons': 56, 'stats': 40}
+# kinds packed into a single sprite atlas instead of individual thumbnails
+ATLAS_KINDS = ('weapons', 'stats')
+IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg', '.webp')
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+
+
+def _b64_size(n_bytes: int) -> int:
+    return 4 * ((n_bytes + 2) // 3)
+
+
+def image_mime(path) -> str:
+    ext = Path(path).suffix.lower().lstrip('.')
+    return 'image/png' if ext == 'png' or ext == '' else f'image/{ext}'
+
+
+def data_uri(mime: str, data) -> str:
+    """Inline image bytes as a data: URI (base64)."""
+    return f"data:{mime};base64,{base64.b64encode(data).decode('ascii')}"
+
+
+def encode_data_uri(path: Path) -> str:
+    """Inline an image file as a data: URI (base64)."""
+    path = Path(path)
+    return data_uri(image_mime(path), path.read_bytes())
+
+
+def _sha1(path: Path) -> str:
+    return hashlib.sha1(path.read_bytes()).hexdigest()
+
+
+def _load_manifest(out_dir: Path) -> dict:
+    path = out_dir / MANIFEST_NAME
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') == MANIFEST_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {'version': MANIFEST_VERSION, 'files': {}, 'atlases': {}}
+
+
+def _thumb_suffix(kind: str) -> str:
+    # portraits are photographic and inlined one by one, so use WebP when
+    # Pillow supports it; atlas icons are packed into a PNG anyway
+    if kind not in ATLAS_KINDS:
+        from PIL import features
+
+        if features.check('webp'):
+            return '.webp'
+    return '.png'
+
+
+def _thumbnail(src: Path, dest: Path, width: int):
+    from PIL import Image
+
+    with Image.open(src) as img:
+        height = max(1, round(img.height * width / img.width))
+        thumb = img.resize((width, height), Image.LANCZOS)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if dest.suffix == '.webp':
+            thumb.save(dest, quality=85, method=6)
+        else:
+            thumb.save(dest, optimize=True)
+    return width, height
+
+
+def _pack_atlas(kind: str, entries: Dict[str, dict], out_dir: Path) -> dict:
+    """Stack the kind's thumbnails vertically into one PNG and record offsets."""
+    from PIL import Image
+
+    width = DISPLAY_WIDTHS[kind]
+    height = sum(e['height'] for e in entries.values())
+    atlas = Image.new('RGBA', (width, max(1, height)))
+    sprites = {}
+    y = 0
+    for rel, entry in sorted(entries.items()):
+        with Image.open(out_dir / entry['thumb']) as thumb:
+            atlas.paste(thumb.convert('RGBA'), (0, y))
+        sprites[rel] = [0, y, entry['width'], entry['height']]
+        y += entry['height']
+    atlas_file = f'{kind}_atlas.png'
+    atlas.save(out_dir / atlas_file, optimize=True)
+    return {'file': atlas_file, 'width': width, 'height': height, 'sprites': sprites}
+
+
+def build_assets(resources_dir: Path, out_dir: Path, force: bool = False) -> dict:
+    """
+    Pre-scale every image under resources/{legends,weapons,stats} to its
+    display width and pack weapon and stat icons into sprite atlases.
+    Only sources whose content changed since the last build are re-processed.
+    Requires Pillow. Returns a report with rebuilt counts and the inline
+    (base64) payload size of the originals versus the built artifacts.
+    """
+    resources_dir = Path(resources_dir)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    previous = _load_manifest(out_dir) if not force else {'files': {}, 'atlases': {}}
+    old = previous['files']
+    old_atlases = previous['atlases']
+    files: Dict[str, dict] = {}
+    rebuilt = {kind: 0 for kind in DISPLAY_WIDTHS}
+    before = 0
+
+    for kind, width in DISPLAY_WIDTHS.items():
+        kind_dir = resources_dir / kind
+        if not kind_dir.is_dir():
+            continue
+        suffix = _thumb_suffix(kind)
+        for src in sorted(kind_dir.iterdir()):
+            if not src.is_file() or src.suffix.lower() not in IMAGE_SUFFIXES:
+                continue
+            rel = f'{kind}/{src.name}'
+            stat = src.stat()
+            before += _b64_size(stat.st_size)
+            prev = old.get(rel)
+            thumb_rel = f'{kind}/{src.stem}{suffix}'
+            if prev and prev.get('size') == stat.st_size and prev.get('mtime_ns') == stat.st_mtime_ns:
+                digest = prev['sha1']
+            else:
+                digest = _sha1(src)
+            if (prev and prev.get('sha1') == digest and prev.get('width') == width
+                    and prev.get('thumb') == thumb_rel and (out_dir / thumb_rel).exists()):
+                files[rel] = {**prev, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+                continue
+            w, h = _thumbnail(src, out_dir / thumb_rel, width)
+            files[rel] = {
+                'kind': kind,
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'sha1': digest,
+                'thumb': thumb_rel,
+                'width': w,
+                'height': h,
+            }
+            rebuilt[kind] += 1
+
+    atlases = {}
+    for kind in ATLAS_KINDS:
+        entries = {rel: e for rel, e in files.items() if e['kind'] == kind}
+        prev = old_atlases.get(kind)
+        unchanged = (
+            prev and not rebuilt[kind]
+            and set(prev.get('sprites', {})) == set(entries)
+            and (out_dir / prev['file']).exists()
+        )
+        atlases[kind] = prev if unchanged else _pack_atlas(kind, entries, out_dir)
+
+    manifest = {'version': MANIFEST_VERSION, 'widths': DISPLAY_WIDTHS, 'files': files, 'atlases': atlases}
+    with open(out_dir / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    after = sum(
+        _b64_size((out_dir / e['thumb']).stat().st_size)
+        for e in files.values() if e['kind'] not in ATLAS_KINDS
+    ) + sum(_b64_size((out_dir / a['file']).stat().st_size) for a in atlases.values())
+    return {
+        'images': len(files),
+        'rebuilt': rebuilt,
+        'payload_bytes_before': before,
+        'payload_bytes_after': after,
+    }
+
+
+class AssetBuild:
+    """Read-only view of a built asset directory (no Pillow needed)."""
+
+    def __init__(self, out_dir: Path, manifest: dict):
+        self.out_dir = Path(out_dir)
+        self.manifest = manifest
+        self._sprite_class: Dict[str, str] = {}
+        for kind, atlas in manifest['atlases'].items():
+            for i, rel in enumerate(sorted(atlas['sprites'])):
+                self._sprite_class[rel] = f'lv-sprite-{kind} lv-sprite-{kind}-{i}'
+
+    @staticmethod
+    def _rel(source_path: str) -> str:
+        p = Path(source_path)
+        return f'{p.parent.name}/{p.name}'
+
+    def thumbnail(self, source_path: str) -> Optional[str]:
+        """Path of the pre-scaled copy of a source image, if it was built."""
+        entry = self.manifest['files'].get(self._rel(source_path))
+        if entry is None or entry['kind'] in ATLAS_KINDS:
+            return None
+        return str(self.out_dir / entry['thumb'])
+
+    def sprite_class(self, source_path: str) -> Optional[str]:
+        """CSS classes that draw the image from its atlas, if it is in one."""
+        return self._sprite_class.get(self._rel(source_path))
+
+    def atlas_paths(self) -> List[str]:
+        return [str(self.out_dir / atlas['file']) for atlas in self.manifest['atlases'].values()]
+
+    def sprite_css(self, image_src: Optional[Callable[[str], str]] = None) -> str:
+        """
+        Atlas background rules plus per-sprite offsets. image_src maps an
+        atlas path to its URL; by default the atlas is inlined once as a
+        data URI.
+        """
+        image_src = image_src or (lambda path: encode_data_uri(Path(path)))
+        rules = []
+        for kind, atlas in self.manifest['atlases'].items():
+            src = image_src(str(self.out_dir / atlas['file']))
+            rules.append(
+                f".lv-sprite-{kind} {{ background-image: url({src}); "
+                f"background-repeat: no-repeat; display: block; margin: 0 auto 6px; border-radius: 4px; }}"
+            )
+            for i, rel in enumerate(sorted(atlas['sprites'])):
+                x, y, w, h = atlas['sprites'][rel]
+                rules.append(
+                    f".lv-sprite-{kind}-{i} {{ background-position: -{x}px -{y}px; width: {w}px; height: {h}px; }}"
+                )
+        return "<style>" + "\n".join(rules) + "</style>"
+
+
+def load_asset_build(out_dir: Path) -> Optional[AssetBuild]:
+    """Return the built assets if a current manifest exists, else None."""
+    out_dir = Path(out_dir)
+    if not (out_dir / MANIFEST_NAME).exists():
+        return None
+    manifest = _load_manifest(out_dir)
+    if not manifest['files']:
+        return None
+    return AssetBuild(out_dir, manifest)
+
+
+def manifest_mtime(out_dir: Path) -> Optional[int]:
+    try:
+        return os.stat(Path(out_dir) / MANIFEST_NAME).st_mtime_ns
+    except OSError:
+        return None
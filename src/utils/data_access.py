@@ -1,19 +1,386 @@
-import pandas as pd
 import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
 from config.data_paths import (
     base_data_path, 
     tags_data_path, 
-    weapons_data_path
+    weapons_data_path,
+    name_map_path,
+    resources_path,
+    snapshot_path,
+    answers_path
 )
+from utils.answer_table import (
+    AnswerTable,
+    build_answer_table,
+    load_answer_table,
+    store_fingerprint,
+    verify_answer_table,
+    write_answer_table
+)
+from utils.legend_store import LegendStore, STAT_COLUMNS
+from utils.metrics import get_logger, span
+from utils.resource_index import build_resource_index, RESOURCE_KINDS, ResourceIndex
+from utils.shared_segment import SharedSegment, attach as attach_segment
+from utils.snapshot import load_snapshot, source_hashes, write_snapshot
+from utils.tag_index import TagIndex
+from utils.weapon_index import WeaponIndex
+
+log = get_logger('data_access')
+
+SOURCE_FILES = {
+    'data.csv': base_data_path,
+    'tags.json': tags_data_path,
+    'weapons.json': weapons_data_path,
+    'name_to_filename.json': name_map_path,
+}
+
+
+def _read_store():
+    with open(tags_data_path, 'r') as f:
+        tags = json.load(f)
+    with open(weapons_data_path, 'r') as f:
+        weapons_json = json.load(f)
+    # weapon -> legends is derived from data.csv; weapons.json only provides
+    # the display order and is checked against the roster so the two can't drift
+    store = LegendStore.from_csv(base_data_path, tags, weapon_order=list(weapons_json))
+    weapon_index = WeaponIndex.from_store(store)
+    for weapon, legends in weapons_json.items():
+        if sorted(legends) != sorted(weapon_index.legends_with(weapon)):
+            log.warning("weapons.json disagrees with data.csv for %r", weapon)
+    return store
+
+
+def _read_resource_index():
+    try:
+        with open(name_map_path, 'r', encoding='utf-8') as f:
+            name_map = json.load(f)
+    except (OSError, ValueError) as e:
+        log.warning("Failed to load name map: %s", e)
+        name_map = {}
+    return build_resource_index(Path(resources_path).resolve(), name_map)
 
-with open(base_data_path, 'r') as f:
-    BASE_DATA = pd.read_csv(f)
 
-with open(tags_data_path, 'r') as f:
-    TAGS = json.load(f)
+def build_from_sources():
+    """Parse the CSV/JSON sources and scan resources/ (the slow path)."""
+    return _read_store(), _read_resource_index()
 
-with open(weapons_data_path, 'r') as f:
-    WEAPONS_DICT = json.load(f)
 
-STAT_NAMES = ['Strength', 'Dexterity', 'Defense', 'Speed']
+def compile_snapshot():
+    """Rebuild the roster snapshot from sources and write it to snapshot_path."""
+    hashes = source_hashes(SOURCE_FILES, resources_path)
+    store, resource_index = build_from_sources()
+    write_snapshot(snapshot_path, store, resource_index, resources_path, hashes)
+    return store, resource_index
+
+
+def load():
+    """
+    Load the roster from the compiled snapshot, rebuilding it first when any
+    source file (or the resources/ listing) no longer matches its recorded hash.
+    """
+    start = time.perf_counter()
+    with span('load'):
+        hashes = source_hashes(SOURCE_FILES, resources_path)
+        loaded = load_snapshot(snapshot_path, resources_path, hashes)
+        if loaded is not None:
+            log.info("Loaded snapshot %s in %.1f ms", snapshot_path, (time.perf_counter() - start) * 1000)
+            return loaded
+        store, resource_index = build_from_sources()
+        try:
+            write_snapshot(snapshot_path, store, resource_index, resources_path, hashes)
+        except OSError as e:
+            log.warning("Could not write snapshot %s: %s", snapshot_path, e)
+        log.info("Rebuilt snapshot from sources in %.1f ms", (time.perf_counter() - start) * 1000)
+        return store, resource_index
+
+
+STAT_NAMES = list(STAT_COLUMNS)
 COMPARATORS = ['=', '<=', '>=', '<', '>', 'between']
+
+
+class DataState(NamedTuple):
+    """
+    One consistent generation of the loaded data: the roster, everything
+    derived from it and the resource index. A reload builds a new one and
+    swaps it in with a single assignment, never mutating the old one, so
+    read it once per request (current()) and pass it down instead of
+    reading the module attributes one at a time.
+    """
+    store: LegendStore
+    resource_index: ResourceIndex
+    tag_index: TagIndex
+    weapon_index: WeaponIndex
+    weapons_dict: Dict[str, List[str]]
+    answers: Optional[AnswerTable]
+    segment: Optional[SharedSegment]
+    # store_fingerprint(store): identifies the roster across reloads and
+    # processes, for results kept past one request (e.g. in session state)
+    version: str
+
+    @property
+    def tags(self) -> List[str]:
+        return self.store.tag_names
+
+
+# module attribute -> DataState field, for code that reads e.g. data_access.STORE
+_LAZY_NAMES = {
+    'STORE': 'store',
+    'RESOURCE_INDEX': 'resource_index',
+    'TAGS': 'tags',
+    'TAG_INDEX': 'tag_index',
+    'WEAPON_INDEX': 'weapon_index',
+    'WEAPONS_DICT': 'weapons_dict',
+    'ANSWERS': 'answers',
+    'SEGMENT': 'segment',
+}
+_load_lock = threading.Lock()
+_STATE: Optional[DataState] = None
+# (store, DataFrame) for BASE_DATA, rebuilt when the store is replaced
+_BASE_DATA: Optional[Tuple[LegendStore, object]] = None
+
+
+def current() -> DataState:
+    """The current data generation, loading it on first use."""
+    state = _STATE
+    if state is None:
+        _load_state()
+        state = _STATE
+    return state
+
+
+# Shared mode: with $MEET_LEGENDS_SHARED_SEGMENT pointing at a segment
+# written by src/publish_shared.py, the roster arrays, answer bitsets and
+# encoded images are mapped from it read-only instead of loaded per process.
+SHARED_SEGMENT_ENV = 'MEET_LEGENDS_SHARED_SEGMENT'
+
+
+def shared_segment_path():
+    return os.environ.get(SHARED_SEGMENT_ENV) or None
+
+
+def _segment_answers(segment, fingerprint):
+    return segment.answer_table(fingerprint) if segment is not None else None
+
+
+def _load_state():
+    with _load_lock:
+        if _STATE is None:
+            path = shared_segment_path()
+            segment = attach_segment(path) if path else None
+            if segment is not None:
+                log.info("Attached shared segment %s", path)
+                _publish(segment.store(), segment.resource_index(), segment=segment)
+            else:
+                _publish(*load())
+
+
+def load_answers(store, tag_index, weapon_index, path=answers_path):
+    """
+    The materialized answer table for this roster: read from path when it was
+    built from the same data, otherwise rebuilt, checked against the live
+    indexes and written back (path=None keeps it in memory only). Returns
+    None if the check fails, so callers fall back to computing answers.
+    """
+    if path:
+        table = load_answer_table(path, store_fingerprint(store))
+        if table is not None:
+            return table
+    with span('answers.build'):
+        table = build_answer_table(store)
+        bad = verify_answer_table(table, store, tag_index, weapon_index)
+    if bad:
+        log.error("Answer table disagrees with live queries for %d keys (e.g. %s); not using it", len(bad), bad[:5])
+        return None
+    if path:
+        try:
+            write_answer_table(path, table)
+        except OSError as e:
+            log.warning("Could not write answer table %s: %s", path, e)
+    log.info("Rebuilt answer table (%d answers)", len(table))
+    return table
+
+
+def _make_state(store, resource_index, answers=answers_path, segment=None) -> DataState:
+    """Derive the indexes (and find or build the answer table) for a loaded store."""
+    tag_index = TagIndex.from_store(store)
+    weapon_index = WeaponIndex.from_store(store)
+    version = store_fingerprint(store)
+    return DataState(
+        store=store,
+        resource_index=resource_index,
+        tag_index=tag_index,
+        weapon_index=weapon_index,
+        weapons_dict=weapon_index.as_dict(),
+        answers=_segment_answers(segment, version) or load_answers(store, tag_index, weapon_index, answers),
+        segment=segment,
+        version=version,
+    )
+
+
+def _publish(store, resource_index, answers=answers_path, segment=None):
+    global _STATE
+    _STATE = _make_state(store, resource_index, answers, segment)
+
+
+def install(store, resource_index):
+    """
+    Swap in an already loaded roster and resource index (e.g. a synthetic
+    one for benchmarks) instead of loading from config.data_paths.
+    """
+    with _load_lock:
+        _publish(store, resource_index, answers=None)
+
+
+class ReloadEvent(NamedTuple):
+    """What a reload replaced, passed to every reload listener."""
+    data: bool                          # roster re-parsed and indexes rebuilt
+    resources: bool                     # resource index rebuilt
+    legends: FrozenSet[str]             # legend names added, removed or changed
+    assets: Dict[str, FrozenSet[str]]   # kind -> normalized resource names whose file changed
+    asset_build: bool                   # build/assets (thumbnails, atlases) changed
+
+
+_reload_listeners: List[Callable[[ReloadEvent], Dict[str, int]]] = []
+
+
+def add_reload_listener(listener: Callable[[ReloadEvent], Dict[str, int]]) -> None:
+    """Call listener(event) after each reload; it returns counts of what it invalidated (for the log)."""
+    if listener not in _reload_listeners:
+        _reload_listeners.append(listener)
+
+
+def _changed_legends(old, new) -> FrozenSet[str]:
+    changed = set(old.names).symmetric_difference(new.names)
+    for record in new.records:
+        before = old.get(record.name)
+        if before is not None and (before.weapons, before.stats, before.tag_mask) != (record.weapons, record.stats, record.tag_mask):
+            changed.add(record.name)
+    return frozenset(changed)
+
+
+def _changed_assets(old, new, modified_paths: Iterable[str]) -> Dict[str, FrozenSet[str]]:
+    modified = {str(Path(p).resolve()) for p in modified_paths}
+    old_files, new_files = old.to_dict(), new.to_dict()
+    changed = {}
+    for kind in RESOURCE_KINDS:
+        before, after = old_files.get(kind, {}), new_files.get(kind, {})
+        keys = {k for k in before.keys() | after.keys() if before.get(k) != after.get(k)}
+        keys.update(k for k, p in after.items() if p in modified)
+        changed[kind] = frozenset(keys)
+    return changed
+
+
+def _summarize(names: Iterable[str], limit: int = 10) -> str:
+    names = sorted(names)
+    if not names:
+        return '-'
+    more = f" (+{len(names) - limit} more)" if len(names) > limit else ''
+    return ', '.join(names[:limit]) + more
+
+
+def reload(data_changed: bool = False, resources_changed: bool = False,
+           modified_paths: Iterable[str] = (), asset_build_changed: bool = False) -> ReloadEvent:
+    """
+    Re-read only what changed: data files -> roster and every index derived
+    from it; name map or resources/ listing -> resource index. The new
+    DataState is fully built before it replaces the old one in a single
+    assignment, so a request holding either sees a consistent set. Listeners
+    (e.g. the legend viewer's render caches) then drop the entries that
+    depend on what changed.
+    """
+    start = time.perf_counter()
+    with span('reload'):
+        old = current()
+        old_store, old_index = old.store, old.resource_index
+        store = _read_store() if data_changed else old_store
+        if data_changed and len(store) == 0 and len(old_store):
+            raise ValueError(f"{base_data_path} has no legends (half-written?)")
+        resource_index = _read_resource_index() if resources_changed else old_index
+        _swap(store, resource_index, data_changed)
+        if data_changed or resources_changed:
+            try:
+                write_snapshot(snapshot_path, store, resource_index, resources_path,
+                               source_hashes(SOURCE_FILES, resources_path))
+            except OSError as e:
+                log.warning("Could not write snapshot %s: %s", snapshot_path, e)
+        event = _notify(old_store, store, old_index, resource_index, data_changed, resources_changed,
+                        modified_paths, asset_build_changed, start)
+    return event
+
+
+def reload_segment() -> ReloadEvent:
+    """Re-attach to the shared segment after the loader republished it (shared mode)."""
+    start = time.perf_counter()
+    with span('reload'):
+        old = current()
+        old_segment, old_store, old_index = old.segment, old.store, old.resource_index
+        segment = attach_segment(shared_segment_path())
+        if segment is None:
+            raise ValueError(f"cannot attach {shared_segment_path()}")
+        store, resource_index = segment.store(), segment.resource_index()
+        data_changed = store_fingerprint(store) != old.version
+        resources_changed = resource_index.to_dict() != old_index.to_dict()
+        if old_segment is not None:
+            modified_paths, asset_build_changed = segment.changed_since(old_segment)
+        else:
+            modified_paths, asset_build_changed = [], True
+        _swap(store if data_changed else old_store, resource_index, data_changed, segment)
+        event = _notify(old_store, store, old_index, resource_index, data_changed, resources_changed,
+                        modified_paths, asset_build_changed, start)
+    return event
+
+
+def _swap(store, resource_index, data_changed: bool, segment=None) -> None:
+    global _STATE
+    if data_changed:
+        state = _make_state(store, resource_index, segment=segment)
+    else:
+        old = current()
+        state = old._replace(resource_index=resource_index, segment=segment if segment is not None else old.segment)
+    with _load_lock:
+        _STATE = state
+
+
+def _notify(old_store, store, old_index, resource_index, data_changed, resources_changed,
+            modified_paths, asset_build_changed, start) -> ReloadEvent:
+    event = ReloadEvent(
+        data=data_changed,
+        resources=resources_changed,
+        legends=_changed_legends(old_store, store) if data_changed else frozenset(),
+        assets=_changed_assets(old_index, resource_index, modified_paths),
+        asset_build=asset_build_changed,
+    )
+    invalidated: Dict[str, int] = {}
+    for listener in list(_reload_listeners):
+        for key, n in (listener(event) or {}).items():
+            invalidated[key] = invalidated.get(key, 0) + n
+    log.info(
+        "Reloaded in %.1f ms (data=%s, resources=%s, asset build=%s); changed legends: %s; changed assets: %s; invalidated: %s",
+        (time.perf_counter() - start) * 1000, data_changed, resources_changed, asset_build_changed,
+        _summarize(event.legends),
+        {kind: _summarize(keys) for kind, keys in event.assets.items() if keys} or '-',
+        invalidated or '-',
+    )
+    return event
+
+
+def __getattr__(name):
+    # Nothing is read at import time: the roster and its indexes are loaded
+    # on first use. The module attributes are views of the current
+    # DataState; BASE_DATA (a pandas DataFrame) is built from its store only
+    # if somebody asks for it, so pandas stays an optional dependency.
+    global _BASE_DATA
+    field = _LAZY_NAMES.get(name)
+    if field is not None:
+        return getattr(current(), field)
+    if name == 'BASE_DATA':
+        store = current().store
+        cached = _BASE_DATA
+        if cached is None or cached[0] is not store:
+            cached = _BASE_DATA = (store, store.to_dataframe())
+        return cached[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,192 @@
+import heapq
+import os
+import re
+import unicodedata
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
+from utils.lru import LruCache
+
+SEARCH_KINDS = ('legend', 'weapon', 'tag')
+# a weak match (e.g. one shared trigram out of ten) is noise, not a suggestion
+MIN_SCORE = 0.2
+# added when the query starts the entry (half of it when it starts a later word)
+PREFIX_BONUS = 0.5
+_QUERY_CACHE_SIZE = 1024
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+_CAMEL = re.compile(r'(?<=[a-z])(?=[A-Z])')
+# filename tokens that say nothing about the name: 'a_Roster_Pose_CatM.png', 'Katar_Icon_2.png'
+_FILENAME_NOISE = {'a', 'roster', 'pose', 'icon', 'rostericon'}
+
+
+def normalize_text(text: str) -> str:
+    """'Bödvar ' -> 'bodvar', 'Lin-Fei' -> 'lin fei': accents folded, punctuation to single spaces."""
+    folded = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    return _NON_ALNUM.sub(' ', folded.lower()).strip()
+
+
+def trigrams(text: str, prefix: bool = False) -> List[str]:
+    """
+    Trigrams of every word padded with two leading spaces and one trailing
+    one ('fei' -> '  f', ' fe', 'fei', 'ei '). With prefix=True the last
+    word is treated as unfinished and gets no trailing pad, so 'lin f'
+    matches 'lin fei' as well as it can.
+    """
+    words = normalize_text(text).split()
+    grams: List[str] = []
+    for i, word in enumerate(words):
+        padded = '  ' + word + ('' if prefix and i == len(words) - 1 else ' ')
+        grams.extend(padded[j:j + 3] for j in range(len(padded) - 2))
+    return list(dict.fromkeys(grams))
+
+
+def filename_alias(filename: str) -> str:
+    """
+    Readable alias from an asset filename: 'a_Roster_Pose_WuxiaM.png' ->
+    'wuxia', 'Guantlets_Icon_1.png' -> 'guantlets', 'boots-1-e16738.png' -> 'boots'.
+    """
+    stem = os.path.splitext(filename)[0]
+    stem = re.sub(r'^a_Roster_Pose_', '', stem)
+    # roster poses end in a variant letter: CatM, InuitM-1, ViviL
+    stem = re.sub(r'(?<=[a-z])[A-Z](-\d+)?$', '', stem)
+    # 'Greatsword2' -> 'greatsword'; what is left of ids like 'e1673854748156' is dropped
+    words = [w.rstrip('0123456789') for w in normalize_text(_CAMEL.sub(' ', stem)).split()]
+    return ' '.join(w for w in words if len(w) > 1 and w not in _FILENAME_NOISE and not any(ch.isdigit() for ch in w))
+
+
+def _descending(values: np.ndarray, head: int) -> Iterator[int]:
+    """
+    Indices of values from largest to smallest. Only the `head` largest are
+    sorted up front; the rest are sorted if the caller reads that far.
+    """
+    if len(values) <= head:
+        yield from np.argsort(-values, kind='stable').tolist()
+        return
+    top = np.argpartition(-values, head - 1)[:head]
+    yield from top[np.argsort(-values[top], kind='stable')].tolist()
+    rest = np.ones(len(values), dtype=bool)
+    rest[top] = False
+    rest = np.flatnonzero(rest)
+    yield from rest[np.argsort(-values[rest], kind='stable')].tolist()
+
+
+class Match(NamedTuple):
+    name: str
+    kind: str
+    score: float
+    matched: str
+
+
+class FuzzyIndex:
+    """
+    Character-trigram inverted index over names and aliases. A query looks
+    up the postings of its own trigrams only, so its cost follows the
+    number of entries sharing a trigram with it, not the size of the
+    index. Entries are ranked by trigram Jaccard similarity, with a bonus
+    when the query is a prefix of the entry or of one of its words.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, str, str]]):
+        """entries: (text, kind, name) triples; text is what is matched, name what it resolves to."""
+        self.texts: List[str] = []
+        self.kinds: List[str] = []
+        self.names: List[str] = []
+        seen = set()
+        postings: Dict[str, List[int]] = {}
+        sizes = []
+        for text, kind, name in entries:
+            norm = normalize_text(text)
+            if not norm or (norm, kind, name) in seen:
+                continue
+            seen.add((norm, kind, name))
+            entry = len(self.texts)
+            self.texts.append(norm)
+            self.kinds.append(kind)
+            self.names.append(name)
+            grams = trigrams(norm)
+            sizes.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(entry)
+        self._postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        self._sizes = np.array(sizes, dtype=np.float32)
+        self._kind_ids = {kind: i for i, kind in enumerate(dict.fromkeys(self.kinds))}
+        self._entry_kinds = np.array([self._kind_ids[k] for k in self.kinds], dtype=np.int8)
+        self._cache = LruCache(_QUERY_CACHE_SIZE)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def search(self, query: str, kinds: Optional[Sequence[str]] = None, limit: int = 10) -> List[Match]:
+        """Best matches first, one per (kind, name), however many of its aliases matched."""
+        key = (normalize_text(query), tuple(kinds) if kinds else None, limit)
+        found = self._cache.get(key)
+        if found is None:
+            found = self._cache.put(key, self._search(key[0], key[1], limit))
+        return list(found)
+
+    def _search(self, norm: str, kinds: Optional[Tuple[str, ...]], limit: int) -> Tuple[Match, ...]:
+        grams = trigrams(norm, prefix=True)
+        lists = [self._postings[g] for g in grams if g in self._postings]
+        if not lists:
+            return ()
+        hits = np.concatenate(lists)
+        if len(hits) > len(self.texts):
+            # common trigrams (a word most names share): counting into one
+            # slot per entry beats sorting the postings
+            counts = np.bincount(hits, minlength=len(self.texts))
+            entries = np.flatnonzero(counts)
+            shared = counts[entries]
+        else:
+            entries, shared = np.unique(hits, return_counts=True)
+        if kinds:
+            wanted = [self._kind_ids[k] for k in kinds if k in self._kind_ids]
+            keep = np.isin(self._entry_kinds[entries], wanted)
+            entries, shared = entries[keep], shared[keep]
+        scores = shared / (len(grams) + self._sizes[entries] - shared)
+        # only an entry holding every query trigram can start with the query,
+        # so this bounds the prefix bonus without looking at any strings
+        upper = np.minimum(scores + PREFIX_BONUS * (shared == len(grams)), 1.0)
+        order = _descending(upper, 4 * limit)
+
+        matches: Dict[Tuple[str, str], Match] = {}
+        # scores of the best `limit` matches so far (a replaced alias may
+        # leave a stale lower score behind, which only makes the cut-off safer)
+        kept: List[float] = []
+        for i in order:
+            if upper[i] < max(kept[0] if len(kept) == limit else 0.0, MIN_SCORE):
+                break
+            entry, score = int(entries[i]), float(scores[i])
+            text = self.texts[entry]
+            if text.startswith(norm):
+                score = min(1.0, score + PREFIX_BONUS)
+            elif (' ' + norm) in (' ' + text):
+                score = min(1.0, score + PREFIX_BONUS / 2)
+            if score < MIN_SCORE:
+                continue
+            key = (self.kinds[entry], self.names[entry])
+            if key not in matches or score > matches[key].score:
+                matches[key] = Match(self.names[entry], self.kinds[entry], score, text)
+                if len(kept) < limit:
+                    heapq.heappush(kept, score)
+                elif score > kept[0]:
+                    heapq.heapreplace(kept, score)
+        ranked = sorted(matches.values(), key=lambda m: (-m.score, len(m.matched), m.name))
+        return tuple(ranked[:limit])
+
+
+def build_fuzzy_index(store, name_map: Optional[Dict[str, str]] = None) -> FuzzyIndex:
+    """
+    Index every legend, weapon and tag name, plus aliases derived from the
+    name -> filename map (entries whose key is not a known name are skipped).
+    """
+    kind_of = {}
+    entries: List[Tuple[str, str, str]] = []
+    for kind, names in (('legend', store.names), ('weapon', store.weapon_names), ('tag', store.tag_names)):
+        for name in names:
+            kind_of.setdefault(normalize_text(name), (kind, name))
+            entries.append((name, kind, name))
+    for key, filename in (name_map or {}).items():
+        known = kind_of.get(normalize_text(key))
+        alias = filename_alias(filename)
+        if known and alias:
+            entries.append((alias, known[0], known[1]))
+    return FuzzyIndex(entries)
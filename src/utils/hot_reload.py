@@ -0,0 +1,214 @@
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from config.data_paths import resources_path
+from utils import data_access, metrics
+from utils.asset_pipeline import MANIFEST_NAME
+from utils.resource_index import RESOURCE_KINDS
+from utils.shared_segment import file_stamp
+
+log = metrics.get_logger('hot_reload')
+
+RELOAD_INTERVAL_ENV = 'MEET_LEGENDS_RELOAD_INTERVAL'
+DEFAULT_INTERVAL = 2.0
+_BASE_DIR = Path(__file__).resolve().parents[2]
+_MANIFEST_PATH = _BASE_DIR / 'build' / 'assets' / MANIFEST_NAME
+# source files whose change means re-parsing the roster; the rest of
+# data_access.SOURCE_FILES (the name map) only affects the resource index
+_ROSTER_FILES = ('data.csv', 'tags.json', 'weapons.json')
+
+Stamp = Optional[Tuple[int, int]]
+
+
+class Changes(NamedTuple):
+    data: bool
+    resources: bool
+    modified_paths: Tuple[str, ...]
+    asset_build: bool
+
+    def __bool__(self) -> bool:
+        return self.data or self.resources or bool(self.modified_paths) or self.asset_build
+
+
+def _stamp(path) -> Stamp:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _sha256(path) -> str:
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return ''
+
+
+class FileWatcher:
+    """
+    Polls (mtime, size) of the data files, every image under resources/ and
+    the asset build manifest. A data file whose stamp moved is re-hashed, so
+    touching a file without changing it does not trigger a reload.
+    """
+
+    def __init__(self, data_files: Dict[str, str], resources_dir: str, manifest_path: Path = _MANIFEST_PATH):
+        self.data_files = dict(data_files)
+        self.resources_dir = Path(resources_dir)
+        self.manifest_path = manifest_path
+        self._data = {key: (_stamp(p), _sha256(p)) for key, p in self.data_files.items()}
+        self._resources = self._scan_resources()
+        self._manifest = _stamp(manifest_path)
+
+    def _scan_resources(self) -> Dict[str, Stamp]:
+        stamps = {}
+        for kind in RESOURCE_KINDS:
+            try:
+                with os.scandir(self.resources_dir / kind) as it:
+                    for entry in it:
+                        if entry.is_file():
+                            st = entry.stat()
+                            stamps[entry.path] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                continue
+        return stamps
+
+    def poll(self) -> Changes:
+        """Changes since the previous poll (or construction)."""
+        changed_keys = set()
+        data = dict(self._data)
+        for key, path in self.data_files.items():
+            stamp = _stamp(path)
+            if stamp != data[key][0]:
+                digest = _sha256(path)
+                if digest != data[key][1]:
+                    changed_keys.add(key)
+                data[key] = (stamp, digest)
+
+        resources = self._scan_resources()
+        added_or_removed = resources.keys() ^ self._resources.keys()
+        modified = tuple(sorted(p for p, s in resources.items() if p in self._resources and self._resources[p] != s))
+        manifest = _stamp(self.manifest_path)
+
+        self._data, self._resources = data, resources
+        asset_build = manifest != self._manifest
+        self._manifest = manifest
+        return Changes(
+            data=any(key in changed_keys for key in _ROSTER_FILES),
+            resources=bool(added_or_removed) or bool(changed_keys - set(_ROSTER_FILES)),
+            modified_paths=modified,
+            asset_build=asset_build,
+        )
+
+    def apply(self, changes: Changes) -> data_access.ReloadEvent:
+        return data_access.reload(changes.data, changes.resources, changes.modified_paths, changes.asset_build)
+
+
+class SegmentWatcher:
+    """
+    Shared mode: the loader process watches the sources and republishes the
+    segment; workers only watch the segment file and re-attach when it is
+    replaced (data_access works out what actually changed).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._stamp = file_stamp(path)
+
+    def poll(self) -> Changes:
+        stamp = file_stamp(self.path)
+        replaced = stamp is not None and stamp != self._stamp
+        self._stamp = stamp
+        return Changes(data=replaced, resources=replaced, modified_paths=(), asset_build=replaced)
+
+    def apply(self, changes: Changes) -> data_access.ReloadEvent:
+        return data_access.reload_segment()
+
+
+class HotReloader:
+    """Background thread that polls a watcher and applies what it reports through data_access."""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, watcher=None):
+        self.interval = interval
+        if watcher is None:
+            segment = data_access.shared_segment_path()
+            watcher = SegmentWatcher(segment) if segment else FileWatcher(data_access.SOURCE_FILES, resources_path)
+        self.watcher = watcher
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pending: Optional[Changes] = None
+
+    def check(self) -> Optional[data_access.ReloadEvent]:
+        """Poll once and reload if anything changed. A failed reload is retried on the next check."""
+        changes = self.watcher.poll()
+        if self._pending is not None:
+            changes = Changes(
+                data=changes.data or self._pending.data,
+                resources=changes.resources or self._pending.resources,
+                modified_paths=tuple(sorted(set(changes.modified_paths) | set(self._pending.modified_paths))),
+                asset_build=changes.asset_build or self._pending.asset_build,
+            )
+        if not changes:
+            return None
+        try:
+            event = self.watcher.apply(changes)
+        except Exception as e:  # e.g. a CSV caught half-written; keep serving the old data
+            log.warning("Reload failed, keeping the current data: %s", e)
+            self._pending = changes
+            return None
+        self._pending = None
+        return event
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def start(self) -> 'HotReloader':
+        self._thread = threading.Thread(target=self._run, name='hot-reload', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+_reloader: Dict[str, HotReloader] = {}
+_reloader_lock = threading.Lock()
+
+
+def reload_interval() -> float:
+    """
+    $MEET_LEGENDS_RELOAD_INTERVAL in seconds, 0 (off) when invalid. Unset,
+    it is off, except that shared-mode workers (which only stat the segment
+    file) re-attach every DEFAULT_INTERVAL seconds.
+    """
+    value = os.environ.get(RELOAD_INTERVAL_ENV, '').strip()
+    if not value:
+        return DEFAULT_INTERVAL if data_access.shared_segment_path() else 0.0
+    try:
+        interval = float(value)
+    except ValueError:
+        interval = -1.0
+    if not 0 <= interval < float('inf'):
+        log.warning("$%s must be a number of seconds, got %r; hot reload is off", RELOAD_INTERVAL_ENV, value)
+        return 0.0
+    return interval
+
+
+def start_from_env() -> Optional[HotReloader]:
+    """
+    Start one watcher thread per process, polling every
+    $MEET_LEGENDS_RELOAD_INTERVAL seconds. Watching the sources is for
+    development: it is off unless that is set to a positive number (e.g. 2).
+    """
+    interval = reload_interval()
+    if interval <= 0:
+        return None
+    with _reloader_lock:
+        if 'reloader' not in _reloader:
+            _reloader['reloader'] = HotReloader(interval).start()
+    return _reloader['reloader']
@@ -0,0 +1,177 @@
+import csv
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+
+STAT_COLUMNS = ['Strength', 'Dexterity', 'Defense', 'Speed']
+WEAPON_COLUMNS = ['Weapon 1', 'Weapon 2']
+MISSING_STAT = -1
+MAX_TAGS = 32  # bits in a tag_masks entry
+MAX_WEAPONS = 127  # largest count whose ids fit weapon_ids (int8, -1 for blank)
+
+
+class LegendRecord:
+    """One roster row. Stats are ints (MISSING_STAT when blank in the CSV)."""
+    __slots__ = ('index', 'name', 'weapons', 'stats', 'tag_mask')
+
+    def __init__(self, index: int, name: str, weapons: Tuple[str, ...], stats: Tuple[int, ...], tag_mask: int):
+        self.index = index
+        self.name = name
+        self.weapons = weapons
+        self.stats = stats
+        self.tag_mask = tag_mask
+
+    def stat(self, stat_name: str) -> int:
+        return self.stats[STAT_COLUMNS.index(stat_name)]
+
+    def __repr__(self) -> str:
+        return f"LegendRecord({self.name!r}, weapons={self.weapons}, stats={self.stats})"
+
+
+def _parse_int(val: Optional[str], default: int = MISSING_STAT) -> int:
+    val = (val or '').strip()
+    if not val:
+        return default
+    try:
+        return int(float(val))
+    except ValueError:
+        return default
+
+
+class LegendStore:
+    """
+    Compact, read-only view of the roster:
+    - stats: int8 matrix of shape (n_legends, 4) in STAT_COLUMNS order
+    - weapon_ids: int8 matrix of shape (n_legends, 2) indexing weapon_names (-1 if blank)
+    - tag_masks: uint32 array, bit i set when the legend has tag_names[i]
+    - records: LegendRecord per legend, in CSV order
+
+    So a roster holds at most MAX_TAGS tags and MAX_WEAPONS distinct weapons;
+    from_csv raises ValueError beyond that.
+    """
+
+    def __init__(self, names: Sequence[str], stats: np.ndarray, weapon_ids: np.ndarray,
+                 weapon_names: Sequence[str], tag_masks: np.ndarray, tag_names: Sequence[str]):
+        self.names = list(names)
+        self.stats = stats
+        self.weapon_ids = weapon_ids
+        self.weapon_names = list(weapon_names)
+        self.tag_masks = tag_masks
+        self.tag_names = list(tag_names)
+        self._tag_bit = {tag: i for i, tag in enumerate(self.tag_names)}
+        self._weapon_id = {w: i for i, w in enumerate(self.weapon_names)}
+        self.records = [
+            LegendRecord(
+                i,
+                name,
+                tuple(self.weapon_names[w] for w in weapon_ids[i] if w >= 0),
+                tuple(int(v) for v in stats[i]),
+                int(tag_masks[i]),
+            )
+            for i, name in enumerate(self.names)
+        ]
+        self._by_name = {r.name: r for r in self.records}
+
+    @classmethod
+    def from_csv(cls, csv_path: str, tag_names: Sequence[str], weapon_order: Sequence[str] = ()) -> 'LegendStore':
+        """
+        Parse data.csv once, skipping the blank separator rows. Weapon ids
+        follow weapon_order (e.g. the weapons.json keys) for the weapons it
+        lists, then first appearance in the CSV. Raises ValueError for more
+        than MAX_TAGS tags or MAX_WEAPONS weapons.
+        """
+        if len(tag_names) > MAX_TAGS:
+            raise ValueError(f"{len(tag_names)} tags in tags.json; a roster holds at most {MAX_TAGS}")
+        names: List[str] = []
+        stats: List[List[int]] = []
+        weapons: List[List[str]] = []
+        masks: List[int] = []
+        with open(csv_path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                name = (row.get('Legend') or '').strip()
+                if not name:
+                    continue
+                names.append(name)
+                stats.append([_parse_int(row.get(col)) for col in STAT_COLUMNS])
+                weapons.append([(row.get(col) or '').strip() for col in WEAPON_COLUMNS])
+                mask = 0
+                for bit, tag in enumerate(tag_names):
+                    if _parse_int(row.get(tag), 0) == 1:
+                        mask |= 1 << bit
+                masks.append(mask)
+
+        used = {w for pair in weapons for w in pair if w}
+        weapon_names: List[str] = [w for w in weapon_order if w in used]
+        for pair in weapons:
+            for w in pair:
+                if w and w not in weapon_names:
+                    weapon_names.append(w)
+        if len(weapon_names) > MAX_WEAPONS:
+            raise ValueError(f"{len(weapon_names)} weapons in {csv_path}; a roster holds at most {MAX_WEAPONS}")
+        weapon_id = {w: i for i, w in enumerate(weapon_names)}
+        weapon_ids = np.array(
+            [[weapon_id[w] if w else -1 for w in pair] for pair in weapons],
+            dtype=np.int8,
+        ).reshape(len(names), len(WEAPON_COLUMNS))
+
+        return cls(
+            names,
+            np.array(stats, dtype=np.int8).reshape(len(names), len(STAT_COLUMNS)),
+            weapon_ids,
+            weapon_names,
+            np.array(masks, dtype=np.uint32),
+            tag_names,
+        )
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[LegendRecord]:
+        return iter(self.records)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def get(self, name: str) -> Optional[LegendRecord]:
+        return self._by_name.get(name)
+
+    def stat_column(self, stat_name: str) -> np.ndarray:
+        return self.stats[:, STAT_COLUMNS.index(stat_name)]
+
+    def names_for(self, mask: np.ndarray) -> List[str]:
+        """Legend names (in roster order) where the boolean mask is set."""
+        names = self.names
+        return [names[i] for i in np.flatnonzero(mask).tolist()]
+
+    def tag_mask(self, tag: str) -> np.ndarray:
+        bit = self._tag_bit.get(tag)
+        if bit is None:
+            return np.zeros(len(self), dtype=bool)
+        return ((self.tag_masks >> np.uint32(bit)) & np.uint32(1)) == 1
+
+    def weapon_mask(self, weapon: str) -> np.ndarray:
+        wid = self._weapon_id.get(weapon)
+        if wid is None:
+            return np.zeros(len(self), dtype=bool)
+        return (self.weapon_ids == wid).any(axis=1)
+
+    def tags_of(self, name: str) -> List[str]:
+        record = self._by_name.get(name)
+        if record is None:
+            return []
+        return [tag for i, tag in enumerate(self.tag_names) if record.tag_mask >> i & 1]
+
+    def to_dataframe(self):
+        """Build the legacy pandas view (one row per legend, stats and tags as ints). Needs pandas."""
+        try:
+            import pandas as pd
+        except ImportError as e:
+            raise ImportError("BASE_DATA needs pandas; install it or use data_access.STORE instead") from e
+
+        data: Dict[str, list] = {'Legend': self.names}
+        for j, col in enumerate(WEAPON_COLUMNS):
+            data[col] = [self.weapon_names[w] if w >= 0 else None for w in self.weapon_ids[:, j]]
+        for j, col in enumerate(STAT_COLUMNS):
+            data[col] = self.stats[:, j].astype(int)
+        for tag in self.tag_names:
+            data[tag] = self.tag_mask(tag).astype(int)
+        return pd.DataFrame(data)
@@ -0,0 +1,91 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+class LruCache:
+    """
+    Small LRU cache with hit/miss/eviction counters. Bounded by entry count
+    and, optionally, by total weight (e.g. string length) via ``weigh``.
+    Every operation holds a lock: Streamlit renders sessions on separate
+    threads and the hot reloader discards entries from its own.
+    """
+
+    def __init__(self, max_entries: int, max_weight: Optional[int] = None,
+                 weigh: Callable[[Any], int] = lambda v: 1):
+        self.max_entries = max_entries
+        self.max_weight = max_weight
+        self._weigh = weigh
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._weight = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> Any:
+        weight = self._weigh(value)
+        with self._lock:
+            if key in self._data:
+                self._weight -= self._weigh(self._data.pop(key))
+            self._data[key] = value
+            self._weight += weight
+            while len(self._data) > self.max_entries or (
+                self.max_weight is not None and self._weight > self.max_weight and len(self._data) > 1
+            ):
+                _, old = self._data.popitem(last=False)
+                self._weight -= self._weigh(old)
+                self.evictions += 1
+        return value
+
+    def discard(self, key: Hashable) -> bool:
+        """Drop one entry if present (not counted as an eviction)."""
+        with self._lock:
+            value = self._data.pop(key, None)
+            if value is None:
+                return False
+            self._weight -= self._weigh(value)
+            return True
+
+    def keys(self) -> List[Hashable]:
+        with self._lock:
+            return list(self._data)
+
+    def clear(self, reset_stats: bool = True) -> None:
+        with self._lock:
+            self._data.clear()
+            self._weight = 0
+            if reset_stats:
+                self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def info(self) -> Dict[str, int]:
+        with self._lock:
+            out = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._data),
+                "max_size": self.max_entries,
+            }
+            if self.max_weight is not None:
+                out["weight"] = self._weight
+                out["max_weight"] = self.max_weight
+        return out
@@ -0,0 +1,153 @@
+import bisect
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+LOG_LEVEL_ENV = 'MEET_LEGENDS_LOG_LEVEL'
+DEBUG_ENV = 'MEET_LEGENDS_DEBUG'
+
+# histogram bucket upper bounds in milliseconds (last bucket is open-ended)
+BUCKETS_MS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500]
+
+_root_configured = False
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Logger under the 'meet_legends' namespace. The level comes from
+    $MEET_LEGENDS_LOG_LEVEL (default WARNING, also used for an unknown level
+    name), so debug chatter costs only a level check unless it is switched on.
+    """
+    global _root_configured
+    root = logging.getLogger('meet_legends')
+    if not _root_configured:
+        _root_configured = True
+        level = os.environ.get(LOG_LEVEL_ENV, 'WARNING').strip().upper()
+        try:
+            root.setLevel(level)
+        except ValueError:
+            root.setLevel(logging.WARNING)
+        else:
+            level = None
+        if not root.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter('[%(name)s] %(levelname)s %(message)s'))
+            root.addHandler(handler)
+        root.propagate = False
+        if level is not None:
+            root.warning("Unknown $%s %r, using WARNING", LOG_LEVEL_ENV, level)
+    return root.getChild(name)
+
+
+def debug_enabled() -> bool:
+    return os.environ.get(DEBUG_ENV, '').lower() in ('1', 'true', 'yes')
+
+
+class _SpanStats:
+    __slots__ = ('count', 'total_ms', 'min_ms', 'max_ms', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = float('inf')
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, ms: float) -> None:
+        self.count += 1
+        self.total_ms += ms
+        self.min_ms = min(self.min_ms, ms)
+        self.max_ms = max(self.max_ms, ms)
+        self.buckets[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile (max for the open bucket)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return min(BUCKETS_MS[i], self.max_ms) if i < len(BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'total_ms': round(self.total_ms, 3),
+            'mean_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'min_ms': round(self.min_ms, 3) if self.count else 0.0,
+            'max_ms': round(self.max_ms, 3),
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'histogram': dict(zip([f'<={b}' for b in BUCKETS_MS] + [f'>{BUCKETS_MS[-1]}'], self.buckets)),
+        }
+
+
+_spans: Dict[str, _SpanStats] = {}
+_counters: Dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def record(name: str, ms: float) -> None:
+    with _lock:
+        stats = _spans.get(name)
+        if stats is None:
+            stats = _spans[name] = _SpanStats()
+        stats.add(ms)
+
+
+def incr(name: str, n: int = 1) -> None:
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+@contextmanager
+def span(name: str):
+    """Time the enclosed block and aggregate it under `name` for this process."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, (time.perf_counter() - start) * 1000)
+
+
+def timed(name: str):
+    """Decorator form of span()."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, (time.perf_counter() - start) * 1000)
+        return wrapper
+    return decorator
+
+
+def snapshot() -> dict:
+    """Per-process span stats and counters as plain data."""
+    with _lock:
+        return {
+            'pid': os.getpid(),
+            'spans': {name: stats.to_dict() for name, stats in sorted(_spans.items())},
+            'counters': dict(sorted(_counters.items())),
+        }
+
+
+def export_json(indent: int = 2) -> str:
+    return json.dumps(snapshot(), indent=indent)
+
+
+def reset() -> None:
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+
@@ -0,0 +1,114 @@
+"""
+The roster lookups behind the search pages and the JSON API. Kept free of
+Streamlit so serve_api can answer queries without loading the UI.
+"""
+from typing import List
+from utils import data_access
+from utils.metrics import timed
+from utils.query_language import query_legends
+from utils.stat_index import StatCondition, compound_mask, stat_mask
+
+
+def get_legends_by_stat(stat_name, stat_val, state=None) -> List[str]:
+    return get_legends_by_stat_comparison(stat_name, stat_val, '=', state)
+
+
+@timed("query.stats")
+def get_legends_by_stat_comparison(stat_name, stat_val, comparator='=', state=None) -> List[str]:
+    state = state or data_access.current()
+    found = state.answers.stat(stat_name, comparator, stat_val) if state.answers else None
+    if found is not None:
+        return list(found)
+    store = state.store
+    return store.names_for(stat_mask(store.stat_column(stat_name), comparator, stat_val))
+
+
+@timed("query.stats")
+def get_legends_with_stat_between(stat_name, stat_lower, stat_upper, state=None) -> List[str]:
+    state = state or data_access.current()
+    found = state.answers.stat(stat_name, 'between', stat_lower, stat_upper) if state.answers else None
+    if found is not None:
+        return list(found)
+    store = state.store
+    return store.names_for(stat_mask(store.stat_column(stat_name), 'between', stat_lower, stat_upper))
+
+
+@timed("query.stats")
+def get_legends_by_stats(conditions: List[StatCondition], state=None) -> List[str]:
+    """Legends matching every condition, in roster order, e.g.
+    [StatCondition('Strength', '>=', 6), StatCondition('Speed', 'between', 4, 6)]"""
+    if not conditions:
+        return []
+    store = (state or data_access.current()).store
+    return store.names_for(compound_mask(store, conditions))
+
+
+@timed("query.tags")
+def get_legends_by_tag(tag, state=None) -> List[str]:
+    state = state or data_access.current()
+    found = state.answers.tag(tag) if state.answers else None
+    if found is not None:
+        return list(found)
+    index = state.tag_index
+    return index.names_for(index.bits(tag))
+
+
+@timed("query.tags")
+def get_legends_by_tags(include=(), exclude=(), match_all=True, state=None) -> List[str]:
+    if not include and not exclude:
+        return []
+    state = state or data_access.current()
+    if len(include) == 1 and not exclude:
+        return get_legends_by_tag(include[0], state)
+    index = state.tag_index
+    bits = index.all_of(include) if match_all or not include else index.any_of(include)
+    bits &= ~index.any_of(exclude)
+    return index.names_for(bits)
+
+
+@timed("query.tags")
+def get_legends_by_tag_query(query, state=None) -> List[str]:
+    """e.g. 'Magic User AND NOT Semi-Human OR Thera' (NOT > AND > OR, parentheses allowed)"""
+    return (state or data_access.current()).tag_index.query(query)
+
+
+@timed("query.weapons")
+def get_legends_by_weapon(weapon, state=None) -> List[str]:
+    if weapon is None:
+        return []
+    state = state or data_access.current()
+    found = state.answers.weapons(weapon) if state.answers else None
+    if found is not None:
+        return list(found)
+    return state.weapon_index.legends_with(weapon)
+
+
+@timed("query.weapons")
+def get_legends_by_weapons(w1, w2, state=None) -> List[str]:
+    if w1 is None:
+        return get_legends_by_weapon(w2, state)
+    if w2 is None:
+        return get_legends_by_weapon(w1, state)
+    state = state or data_access.current()
+    found = state.answers.weapons(w1, w2) if state.answers else None
+    if found is not None:
+        return list(found)
+    return state.weapon_index.legends_with_pair(w1, w2)
+
+
+@timed("query.weapons")
+def get_legends_by_weapon_set(weapons, match_all=True, state=None) -> List[str]:
+    """Legends that have all (or, with match_all=False, any) of the given weapons."""
+    if len(weapons) == 1:
+        return get_legends_by_weapon(weapons[0], state)
+    if len(weapons) == 2 and match_all:
+        return get_legends_by_weapons(weapons[0], weapons[1], state)
+    index = (state or data_access.current()).weapon_index
+    if match_all:
+        return index.has_all(weapons)
+    return index.has_any(weapons)
+
+
+@timed("query.expression")
+def get_legends_by_query(query, state=None) -> List[str]:
+    return query_legends(query, (state or data_access.current()).store)
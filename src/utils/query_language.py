@@ -0,0 +1,178 @@
+"""
+Small query language over the roster, e.g.
+
+    weapon:Sword & str>=6 & tag:"Magic User" & !tag:Thera
+
+- terms: ``weapon:<name>``, ``tag:<name>``, ``legend:<name>`` and stat
+  comparisons ``<stat><op><value>`` where stat is str/dex/def/spd (or the
+  full stat name), op is one of = != < <= > >= and ``spd=4..6`` means between
+- operators: ``!`` (not), ``&`` (and), ``|`` (or), in that precedence order,
+  with parentheses for grouping
+- names with spaces go in double quotes; names are case-insensitive
+
+A query is parsed once into a plan (cached by query string) and every
+evaluation is a single vectorized boolean mask over the LegendStore.
+"""
+import re
+from functools import lru_cache
+from typing import List, Tuple
+import numpy as np
+from utils.legend_store import STAT_COLUMNS
+from utils.stat_index import stat_mask
+
+STAT_ALIASES = {
+    'str': 'Strength',
+    'dex': 'Dexterity',
+    'def': 'Defense',
+    'spd': 'Speed',
+    **{s.lower(): s for s in STAT_COLUMNS},
+}
+
+_TOKEN_RE = re.compile(r'''
+    \s*(?:
+        (?P<quoted>"[^"]*")
+      | (?P<op><=|>=|!=|==|=|<|>)
+      | (?P<range>\d+\.\.\d+)
+      | (?P<punct>[&|!():])
+      | (?P<word>[^\s&|!():"<>=]+)
+    )''', re.VERBOSE)
+
+# plan nodes: ('and', l, r) ('or', l, r) ('not', x) ('weapon', name)
+# ('tag', name) ('legend', name) ('stat', stat, comparator, value, upper)
+Plan = Tuple
+
+
+def _tokenize(query: str) -> List[Tuple[str, str]]:
+    tokens = []
+    pos = 0
+    query = query.rstrip()
+    while pos < len(query):
+        m = _TOKEN_RE.match(query, pos)
+        if not m or m.end() == pos:
+            raise ValueError(f"Can't parse query at {query[pos:]!r}")
+        kind = m.lastgroup
+        text = m.group(kind)
+        if kind == 'quoted':
+            kind, text = 'word', text[1:-1]
+        elif kind == 'punct':
+            kind = text
+        tokens.append((kind, text))
+        pos = m.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, query: str):
+        self.query = query
+        self.tokens = _tokenize(query)
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos][0] if self.pos < len(self.tokens) else None
+
+    def take(self, kind):
+        if self.peek() != kind:
+            found = self.tokens[self.pos][1] if self.pos < len(self.tokens) else 'end of query'
+            raise ValueError(f"Expected {kind!r} but found {found!r} in query {self.query!r}")
+        self.pos += 1
+        return self.tokens[self.pos - 1][1]
+
+    def parse(self) -> Plan:
+        if not self.tokens:
+            raise ValueError("Empty query")
+        plan = self.parse_or()
+        if self.pos != len(self.tokens):
+            raise ValueError(f"Unexpected {self.tokens[self.pos][1]!r} in query {self.query!r}")
+        return plan
+
+    def parse_or(self) -> Plan:
+        node = self.parse_and()
+        while self.peek() == '|':
+            self.take('|')
+            node = ('or', node, self.parse_and())
+        return node
+
+    def parse_and(self) -> Plan:
+        node = self.parse_not()
+        while self.peek() == '&':
+            self.take('&')
+            node = ('and', node, self.parse_not())
+        return node
+
+    def parse_not(self) -> Plan:
+        if self.peek() == '!':
+            self.take('!')
+            return ('not', self.parse_not())
+        if self.peek() == '(':
+            self.take('(')
+            node = self.parse_or()
+            self.take(')')
+            return node
+        return self.parse_term()
+
+    def parse_term(self) -> Plan:
+        key = self.take('word').lower()
+        if self.peek() == ':':
+            self.take(':')
+            if key not in ('weapon', 'tag', 'legend'):
+                raise ValueError(f"Unknown field {key!r} in query {self.query!r}")
+            return (key, self.take('word'))
+        stat = STAT_ALIASES.get(key)
+        if stat is None:
+            raise ValueError(f"Unknown stat {key!r} in query {self.query!r}")
+        op = self.take('op')
+        if self.peek() == 'range':
+            if op not in ('=', '=='):
+                raise ValueError(f"Ranges need '=' in query {self.query!r}")
+            lower, upper = (int(v) for v in self.take('range').split('..'))
+            return ('stat', stat, 'between', lower, upper)
+        raw = self.take('word')
+        try:
+            value = int(raw)
+        except ValueError:
+            raise ValueError(f"Expected a number after {stat} {op} but found {raw!r}")
+        op = '=' if op == '==' else op
+        if op == '!=':
+            return ('not', ('stat', stat, '=', value, None))
+        return ('stat', stat, op, value, None)
+
+
+@lru_cache(maxsize=1024)
+def compile_query(query: str) -> Plan:
+    """Parse a query into a plan; cached by query string. Raises ValueError."""
+    return _Parser(query).parse()
+
+
+def _lookup(names, value: str, kind: str) -> str:
+    for name in names:
+        if name.lower() == value.lower():
+            return name
+    raise ValueError(f"Unknown {kind}: {value!r}")
+
+
+def evaluate(plan: Plan, store) -> np.ndarray:
+    """Evaluate a compiled plan to one boolean mask over the store."""
+    op = plan[0]
+    if op == 'and':
+        return evaluate(plan[1], store) & evaluate(plan[2], store)
+    if op == 'or':
+        return evaluate(plan[1], store) | evaluate(plan[2], store)
+    if op == 'not':
+        return ~evaluate(plan[1], store)
+    if op == 'weapon':
+        return store.weapon_mask(_lookup(store.weapon_names, plan[1], 'weapon'))
+    if op == 'tag':
+        return store.tag_mask(_lookup(store.tag_names, plan[1], 'tag'))
+    if op == 'legend':
+        return np.array([n.lower() == plan[1].lower() for n in store.names], dtype=bool)
+    _, stat, comparator, value, upper = plan
+    return stat_mask(store.stat_column(stat), comparator, value, upper)
+
+
+def query_mask(query: str, store) -> np.ndarray:
+    return evaluate(compile_query(query), store)
+
+
+def query_legends(query: str, store) -> List[str]:
+    """Legend names matching the query, in roster order."""
+    return store.names_for(query_mask(query, store))
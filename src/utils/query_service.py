@@ -0,0 +1,231 @@
+"""
+Minimal asyncio HTTP/1.1 JSON server for the legend lookups (stdlib only).
+
+    POST /query    one query object, {"queries": [...]} or a JSON array of them
+    GET  /metrics  request rate, latency percentiles and the process spans
+    GET  /health
+    GET  /images/<name>  an image file, when the service is given files=
+
+Connections are kept alive (HTTP/1.1 default, or HTTP/1.0 with
+"Connection: keep-alive") until the client closes them, sends
+"Connection: close" or stays idle for idle_timeout seconds. Lookups are
+in-memory and take micro- to milliseconds, so they run directly on the event
+loop against the same data_access globals the Streamlit pages read.
+"""
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from utils import metrics
+
+log = metrics.get_logger('query_service')
+
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+MAX_BATCH = 1000
+RATE_WINDOW_S = 60.0
+
+_REASONS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    411: 'Length Required', 413: 'Payload Too Large', 431: 'Request Header Fields Too Large',
+}
+
+
+class QueryError(ValueError):
+    """A query the service understood but cannot answer (reported per query)."""
+
+
+class ServiceMetrics:
+    """Request counters plus a window of recent latencies for req/s and percentiles."""
+
+    def __init__(self, window: int = 65536):
+        self.started = time.monotonic()
+        self.requests = 0
+        self.queries = 0
+        self.errors = 0
+        self.by_status: Dict[int, int] = {}
+        self._recent: deque = deque(maxlen=window)
+
+    def observe(self, status: int, ms: float, n_queries: int = 0) -> None:
+        self.requests += 1
+        self.queries += n_queries
+        self.by_status[status] = self.by_status.get(status, 0) + 1
+        if status >= 400:
+            self.errors += 1
+        self._recent.append((time.monotonic(), ms))
+        metrics.record('api.request', ms)
+
+    def to_dict(self) -> dict:
+        now = time.monotonic()
+        uptime = now - self.started
+        window = [ms for ts, ms in self._recent if now - ts <= RATE_WINDOW_S]
+        window.sort()
+
+        def pct(q: float) -> float:
+            if not window:
+                return 0.0
+            return round(window[min(len(window) - 1, int(q * len(window)))], 3)
+
+        return {
+            'uptime_s': round(uptime, 1),
+            'requests': self.requests,
+            'queries': self.queries,
+            'errors': self.errors,
+            'by_status': {str(k): v for k, v in sorted(self.by_status.items())},
+            'requests_per_sec': round(len(window) / max(min(uptime, RATE_WINDOW_S), 1e-3), 1),
+            'window_s': RATE_WINDOW_S,
+            'latency_ms': {'p50': pct(0.5), 'p90': pct(0.9), 'p99': pct(0.99), 'max': round(window[-1], 3) if window else 0.0},
+        }
+
+
+class Blob(NamedTuple):
+    """A non-JSON response body, e.g. an image served from the shared segment."""
+    content_type: str
+    data: bytes  # or any bytes-like object, e.g. a memoryview onto a mapping
+
+
+class QueryService:
+    """
+    Routes HTTP requests to named query operations. Each operation takes the
+    query object (a dict) and returns a list of legend names; raising
+    QueryError, ValueError, KeyError or TypeError turns into a per-query error:
+    a 400 for a single query, an error entry among the results of a batch.
+    files(name), if given, serves GET /images/<name>: it returns the Blob or
+    None (404). Names are content digests, so responses are cached for good.
+    """
+
+    def __init__(self, operations: Dict[str, Callable[[dict], List[str]]], idle_timeout: float = 15.0,
+                 files: Optional[Callable[[str], Optional[Blob]]] = None):
+        self.operations = dict(operations)
+        self.files = files
+        self.idle_timeout = idle_timeout
+        self.metrics = ServiceMetrics()
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    def run_query(self, query) -> dict:
+        if not isinstance(query, dict):
+            return {'error': 'query must be a JSON object'}
+        op = self.operations.get(query.get('type'))
+        if op is None:
+            return {'error': f"unknown query type {query.get('type')!r}; expected one of {sorted(self.operations)}"}
+        try:
+            legends = op(query)
+        except (QueryError, ValueError, KeyError, TypeError) as e:
+            return {'error': str(e) or e.__class__.__name__}
+        return {'count': len(legends), 'legends': legends}
+
+    def handle_query_body(self, body: bytes) -> Tuple[int, dict, int]:
+        try:
+            payload = json.loads(body or b'null')
+        except ValueError as e:
+            return 400, {'error': f'invalid JSON: {e}'}, 0
+        if isinstance(payload, dict) and 'queries' in payload:
+            payload = payload['queries']
+        if isinstance(payload, list):
+            if len(payload) > MAX_BATCH:
+                return 413, {'error': f'at most {MAX_BATCH} queries per request'}, 0
+            return 200, {'results': [self.run_query(q) for q in payload]}, len(payload)
+        result = self.run_query(payload)
+        return (400 if 'error' in result else 200), result, 1
+
+    def route(self, method: str, path: str, body: bytes) -> Tuple[int, Union[dict, Blob], int]:
+        if path == '/query':
+            if method != 'POST':
+                return 405, {'error': 'use POST'}, 0
+            return self.handle_query_body(body)
+        if method != 'GET':
+            return 405, {'error': 'use GET'}, 0
+        if path == '/metrics':
+            return 200, {'service': self.metrics.to_dict(), 'process': metrics.snapshot()}, 0
+        if path == '/health':
+            return 200, {'status': 'ok', 'operations': sorted(self.operations)}, 0
+        if path.startswith('/images/') and self.files is not None:
+            blob = self.files(path[len('/images/'):])
+            if blob is None:
+                return 404, {'error': f'no image {path}'}, 0
+            return 200, blob, 0
+        return 404, {'error': f'no route {path}'}, 0
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), self.idle_timeout)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self._send(writer, 431, {'error': 'headers too large'}, keep_alive=False)
+                    return
+                start = time.perf_counter()
+                try:
+                    request_line, *header_lines = head.decode('latin-1').split('\r\n')
+                    method, target, version = request_line.split(' ', 2)
+                except ValueError:
+                    await self._send(writer, 400, {'error': 'malformed request line'}, keep_alive=False)
+                    return
+                headers = {}
+                for line in header_lines:
+                    if ':' in line:
+                        key, value = line.split(':', 1)
+                        headers[key.strip().lower()] = value.strip()
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+                if 'chunked' in headers.get('transfer-encoding', '').lower():
+                    await self._send(writer, 411, {'error': 'send a Content-Length body'}, keep_alive=False)
+                    return
+                try:
+                    length = int(headers.get('content-length', '0'))
+                except ValueError:
+                    length = -1
+                if length < 0 or length > MAX_BODY_BYTES:
+                    status = 413 if length > MAX_BODY_BYTES else 400
+                    await self._send(writer, status, {'error': 'bad Content-Length'}, keep_alive=False)
+                    return
+                try:
+                    body = await reader.readexactly(length) if length else b''
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+
+                status, payload, n_queries = self.route(method.upper(), urlsplit(target).path, body)
+                await self._send(writer, status, payload, keep_alive)
+                self.metrics.observe(status, (time.perf_counter() - start) * 1000, n_queries)
+                if not keep_alive:
+                    return
+        finally:
+            writer.close()
+
+    async def _send(self, writer: asyncio.StreamWriter, status: int, payload: Union[dict, Blob], keep_alive: bool) -> None:
+        if isinstance(payload, Blob):
+            body, content_type = payload.data, payload.content_type
+            extra = "Cache-Control: public, max-age=31536000, immutable\r\n"
+        else:
+            body, content_type = json.dumps(payload, separators=(',', ':')).encode('utf-8'), 'application/json'
+            extra = ""
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"{extra}"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        ).encode('latin-1')
+        writer.write(head)
+        writer.write(body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8502) -> asyncio.AbstractServer:
+        self.server = await asyncio.start_server(self._handle_connection, host, port, limit=MAX_HEADER_BYTES)
+        addrs = ', '.join(str(s.getsockname()) for s in self.server.sockets)
+        log.info("Query service listening on %s", addrs)
+        return self.server
+
+    async def serve_forever(self, host: str = '127.0.0.1', port: int = 8502) -> None:
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
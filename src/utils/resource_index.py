@@ -0,0 +1,85 @@
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+RESOURCE_KINDS = ('legends', 'weapons', 'stats')
+IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg', '.gif', '.webp')
+
+
+def normalize_name(name: str) -> str:
+    """Canonical lookup key: 'Lin Fei' -> 'lin_fei', 'lin_fei.png' -> 'lin_fei'."""
+    stem = name.strip().lower().replace(' ', '_')
+    if stem.endswith(IMAGE_SUFFIXES):
+        dot = stem.rindex('.')
+        if dot > 0:
+            stem = stem[:dot]
+    return stem
+
+
+class ResourceIndex:
+    """
+    Normalized name -> file path for every image under resources/<kind>,
+    built from a single directory scan per kind so lookups never touch the
+    filesystem.
+    """
+
+    def __init__(self, files: Dict[str, Dict[str, str]]):
+        self._files = files
+
+    def to_dict(self) -> Dict[str, Dict[str, str]]:
+        return {kind: dict(files) for kind, files in self._files.items()}
+
+    def get(self, kind: str, name: str) -> Optional[str]:
+        return self._files.get(kind, {}).get(normalize_name(name))
+
+    def __contains__(self, item) -> bool:
+        kind, name = item
+        return self.get(kind, name) is not None
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._files.values())
+
+    def paths(self, kind: Optional[str] = None) -> List[str]:
+        kinds = [kind] if kind else list(self._files)
+        return [p for k in kinds for p in self._files.get(k, {}).values()]
+
+    def missing(self, kind: str, names: Iterable[str]) -> List[str]:
+        """Return the names (in input order, deduplicated) that have no asset of the given kind."""
+        seen = set()
+        out = []
+        for name in names:
+            if name in seen:
+                continue
+            seen.add(name)
+            if self.get(kind, name) is None:
+                out.append(name)
+        return out
+
+
+def build_resource_index(resources_dir: Path, name_map: Optional[Dict[str, str]] = None) -> ResourceIndex:
+    """
+    Scan resources/<kind> once for each kind and merge in the configured
+    name -> filename mapping. A mapping only wins when its target file
+    exists in that kind's folder; otherwise the file stem is used.
+    """
+    files: Dict[str, Dict[str, str]] = {}
+    for kind in RESOURCE_KINDS:
+        kind_dir = Path(resources_dir) / kind
+        by_stem: Dict[str, str] = {}
+        by_filename: Dict[str, str] = {}
+        if kind_dir.is_dir():
+            # scandir's d_type avoids a stat() per file on large folders
+            with os.scandir(kind_dir) as it:
+                entries = sorted((e.name, e.path) for e in it if e.is_file())
+            for filename, path in entries:
+                by_stem.setdefault(normalize_name(os.path.splitext(filename)[0]), path)
+                by_filename[filename.lower()] = path
+        for name, filename in (name_map or {}).items():
+            candidates = [filename] if Path(filename).suffix else [f"{filename}.png", f"{filename}.jpg"]
+            for cand in candidates:
+                mapped = by_filename.get(cand.lower())
+                if mapped:
+                    by_stem[normalize_name(name)] = mapped
+                    break
+        files[kind] = by_stem
+    return ResourceIndex(files)
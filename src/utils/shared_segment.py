@@ -0,0 +1,228 @@
+"""
+Read-only roster segment shared by several worker processes.
+
+One loader process (src/publish_shared.py) writes a single file holding the
+roster arrays, the resource index, the answer table bitsets, the asset
+build manifest and the bytes of every image (originals, thumbnails and
+sprite atlases). Workers mmap it read-only: arrays and images are
+memoryviews onto the mapping, so the bytes live once in the page cache
+however many workers attach. Put it on /dev/shm to keep it off disk
+entirely.
+
+Images are addressed by content digest (image_name()), so pages can link
+to them as <base>/<name> and serve_api.py streams them straight from the
+mapping ($MEET_LEGENDS_IMAGE_URL) instead of every worker inlining its own
+base64 copy into the HTML it renders and caches.
+
+Layout: MAGIC, uint64 header length, JSON header, then 64-byte aligned blobs
+whose offsets and sizes are listed in the header. A new segment is written
+to a temp file and renamed over the old one; attached workers keep their
+mapping of the old file until they re-attach.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from utils.answer_table import AnswerTable
+from utils.asset_pipeline import AssetBuild, data_uri, image_mime
+from utils.legend_store import LegendStore
+from utils.metrics import get_logger
+from utils.resource_index import IMAGE_SUFFIXES, ResourceIndex
+
+log = get_logger('shared_segment')
+
+SEGMENT_MAGIC = b'MLSEG001'
+SEGMENT_VERSION = 2
+ALIGN = 64
+_LEN = struct.Struct('<Q')
+# base URL the images of the attached segment are served under (e.g.
+# http://localhost:8502/images, see serve_api.py); unset, they are inlined
+IMAGE_URL_ENV = 'MEET_LEGENDS_IMAGE_URL'
+
+
+def _align(n: int) -> int:
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def write_segment(path: str, store: LegendStore, resource_index: ResourceIndex,
+                  answers: Optional[AnswerTable] = None, build: Optional[AssetBuild] = None) -> Dict[str, int]:
+    """
+    Write the segment atomically. build is an optional AssetBuild whose
+    manifest, thumbnails and atlases are stored alongside the originals.
+    Returns byte counts per section.
+    """
+    blobs: List[bytes] = []
+    arrays = {}
+    images: Dict[str, List] = {}
+    sizes = {'arrays': 0, 'images': 0}
+
+    def add(data: bytes) -> int:
+        blobs.append(data)
+        return len(blobs) - 1
+
+    named_arrays = {'stats': store.stats, 'weapon_ids': store.weapon_ids, 'tag_masks': store.tag_masks}
+    if answers is not None:
+        named_arrays['answer_bits'] = answers.bits
+    for name, arr in named_arrays.items():
+        arr = np.ascontiguousarray(arr)
+        arrays[name] = {'blob': add(arr.tobytes()), 'dtype': arr.dtype.str, 'shape': list(arr.shape)}
+        sizes['arrays'] += arr.nbytes
+
+    image_paths = [p for p in resource_index.paths() if Path(p).suffix.lower() in IMAGE_SUFFIXES]
+    if build is not None:
+        image_paths += [t for t in (build.thumbnail(p) for p in resource_index.paths()) if t]
+        image_paths += build.atlas_paths()
+    for p in dict.fromkeys(image_paths):
+        try:
+            data = Path(p).read_bytes()
+        except OSError:
+            continue
+        images[p] = [add(data), hashlib.sha1(data).hexdigest(), image_mime(p)]
+        sizes['images'] += len(data)
+
+    header = {
+        'version': SEGMENT_VERSION,
+        'names': store.names,
+        'weapon_names': store.weapon_names,
+        'tag_names': store.tag_names,
+        'arrays': arrays,
+        'resources': resource_index.to_dict(),
+        'answers': {'keys': answers.keys, 'fingerprint': answers.fingerprint} if answers is not None else None,
+        'images': images,
+        'build': {'out_dir': str(build.out_dir), 'manifest': build.manifest} if build is not None else None,
+    }
+    # blob offsets are relative to the (aligned) end of the header, so the
+    # header can list them before its own length is known
+    rel, pos = [], 0
+    for blob in blobs:
+        rel.append(pos)
+        pos = _align(pos + len(blob))
+    header['blobs'] = [[r, len(b)] for r, b in zip(rel, blobs)]
+    head = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    data_start = _align(len(SEGMENT_MAGIC) + _LEN.size + len(head))
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # a unique temp name, so two publishers never write the same file
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(SEGMENT_MAGIC + _LEN.pack(len(head)) + head)
+            for r, blob in zip(rel, blobs):
+                f.seek(data_start + r)
+                f.write(blob)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    sizes['total'] = os.path.getsize(path)
+    return sizes
+
+
+class SharedSegment:
+    """A read-only mapping of a segment file; all views share the one mmap."""
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        with open(self.path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            self.stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(SEGMENT_MAGIC)] != SEGMENT_MAGIC:
+            raise ValueError(f"{self.path} is not a roster segment")
+        (head_len,) = _LEN.unpack_from(self._mm, len(SEGMENT_MAGIC))
+        head_start = len(SEGMENT_MAGIC) + _LEN.size
+        self.header = json.loads(self._mm[head_start:head_start + head_len])
+        if self.header.get('version') != SEGMENT_VERSION:
+            raise ValueError(f"{self.path} has segment version {self.header.get('version')}")
+        self._data_start = _align(head_start + head_len)
+        self._view = memoryview(self._mm)
+        # image_name() -> path, for serving images by name
+        self._named = {self.image_name(p): p for p in self.header['images']}
+
+    def _blob(self, i: int) -> memoryview:
+        rel, size = self.header['blobs'][i]
+        start = self._data_start + rel
+        return self._view[start:start + size]
+
+    def array(self, name: str) -> np.ndarray:
+        spec = self.header['arrays'][name]
+        return np.frombuffer(self._blob(spec['blob']), dtype=np.dtype(spec['dtype'])).reshape(spec['shape'])
+
+    def store(self) -> LegendStore:
+        h = self.header
+        return LegendStore(h['names'], self.array('stats'), self.array('weapon_ids'),
+                           h['weapon_names'], self.array('tag_masks'), h['tag_names'])
+
+    def resource_index(self) -> ResourceIndex:
+        return ResourceIndex(self.header['resources'])
+
+    def answer_table(self, fingerprint: str) -> Optional[AnswerTable]:
+        answers = self.header['answers']
+        if not answers or answers['fingerprint'] != fingerprint:
+            return None
+        return AnswerTable(self.header['names'], answers['keys'], self.array('answer_bits'), fingerprint)
+
+    def image(self, path: str) -> Optional[memoryview]:
+        """The bytes of an image file as a view onto the mapping (no copy)."""
+        entry = self.header['images'].get(path)
+        return self._blob(entry[0]) if entry is not None else None
+
+    def image_name(self, path: str) -> Optional[str]:
+        """Content-addressed file name of an image, e.g. '3f7a...e1.png'."""
+        entry = self.header['images'].get(path)
+        return entry[1] + Path(path).suffix.lower() if entry is not None else None
+
+    def named_image(self, name: str) -> Optional[Tuple[str, memoryview]]:
+        """(MIME type, bytes) of the image called name (see image_name)."""
+        path = self._named.get(name)
+        if path is None:
+            return None
+        return self.header['images'][path][2], self.image(path)
+
+    def data_uri(self, path: str) -> Optional[str]:
+        entry = self.header['images'].get(path)
+        return data_uri(entry[2], self._blob(entry[0])) if entry is not None else None
+
+    def image_digests(self) -> Dict[str, str]:
+        return {p: entry[1] for p, entry in self.header['images'].items()}
+
+    def asset_build(self) -> Optional[AssetBuild]:
+        """The asset build the segment was published with (its files are read from the segment)."""
+        build = self.header['build']
+        return AssetBuild(Path(build['out_dir']), build['manifest']) if build else None
+
+    def changed_since(self, old: 'SharedSegment') -> Tuple[List[str], bool]:
+        """Image paths whose bytes differ from old, and whether the asset build changed."""
+        before, after = old.image_digests(), self.image_digests()
+        paths = sorted(p for p in before.keys() | after.keys() if before.get(p) != after.get(p))
+        # an atlas change moves every sprite, like a new manifest
+        build = self.asset_build()
+        atlas_changed = build is not None and not set(build.atlas_paths()).isdisjoint(paths)
+        return paths, old.header['build'] != self.header['build'] or atlas_changed
+
+
+def attach(path: str) -> Optional[SharedSegment]:
+    try:
+        return SharedSegment(path)
+    except (OSError, ValueError) as e:
+        log.warning("Cannot attach shared segment %s: %s", path, e)
+        return None
+
+
+def file_stamp(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
@@ -0,0 +1,133 @@
+from typing import List, NamedTuple, Optional, Tuple
+import numpy as np
+from utils.legend_store import LegendStore, MISSING_STAT
+from utils.lru import LruCache
+
+# stats are 0..10, so a root-mean-square difference of 10 means "nothing alike"
+STAT_RANGE = 10.0
+# above this many legends the three n x n float32 component matrices (16 MiB
+# each at 2048) are not kept; rows are computed on demand, with the same
+# vectorized code, and cached
+MATRIX_MAX_LEGENDS = 2048
+_BLOCK_ROWS = 1024
+_ROW_CACHE_SIZE = 256
+
+
+class SimilarityWeights(NamedTuple):
+    stats: float = 0.5
+    weapons: float = 0.3
+    tags: float = 0.2
+
+    def normalized(self) -> 'SimilarityWeights':
+        if any(w < 0 for w in self):
+            raise ValueError("similarity weights must not be negative")
+        total = sum(self)
+        if total <= 0:
+            raise ValueError("at least one similarity weight must be positive")
+        return SimilarityWeights(*(w / total for w in self))
+
+
+def _jaccard(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Jaccard overlap between the 0/1 rows of a and of b (0 when both are empty)."""
+    inter = a @ b.T
+    union = a.sum(axis=1)[:, None] + b.sum(axis=1)[None, :]
+    union -= inter
+    # an empty union means an empty intersection, so dividing by 1 gives the 0
+    np.maximum(union, 1, out=union)
+    return np.divide(inter, union, out=inter)
+
+
+class SimilarityIndex:
+    """
+    Pairwise legend similarity: a weighted mix of how close the four stats
+    are (1 - RMS difference / STAT_RANGE over the stats both legends have)
+    and the Jaccard overlap of their weapons and of their tags. The three
+    components are built once per store from its arrays with matrix
+    products, never per pair in Python; weights are applied per query to
+    the one row asked for, so changing them rebuilds nothing.
+    """
+
+    def __init__(self, store: LegendStore):
+        self.store = store
+        n = len(store)
+
+        present = (store.stats != MISSING_STAT).astype(np.float32)
+        values = np.where(present > 0, store.stats, 0).astype(np.float32)
+        self._present = present
+        self._values = values
+        self._squares = values * values
+        self._missing_stats = bool((present == 0).any())
+
+        weapons = np.zeros((n, len(store.weapon_names)), dtype=np.float32)
+        rows, cols = np.nonzero(store.weapon_ids >= 0)
+        weapons[rows, store.weapon_ids[rows, cols]] = 1
+        self._weapons = weapons
+        bits = np.arange(len(store.tag_names), dtype=np.uint32)
+        self._tags = ((store.tag_masks[:, None] >> bits) & np.uint32(1)).astype(np.float32)
+
+        # (stats, weapons, tags) similarity matrices, or None above MATRIX_MAX_LEGENDS
+        self.matrices: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        self._rows = LruCache(_ROW_CACHE_SIZE)
+        if n <= MATRIX_MAX_LEGENDS:
+            self.matrices = tuple(np.empty((n, n), dtype=np.float32) for _ in range(3))
+            for start in range(0, n, _BLOCK_ROWS):
+                block = slice(start, start + _BLOCK_ROWS)
+                for matrix, part in zip(self.matrices, self._block(block)):
+                    matrix[block] = part
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def _block(self, rows: slice) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Stat, weapon and tag similarity of the legends in rows against the whole roster."""
+        p, v, q = self._present[rows], self._values[rows], self._squares[rows]
+        # sum over shared stats of (a - b)^2, expanded into three products;
+        # the element-wise steps work in place, these blocks are large
+        sim = q @ self._present.T
+        sim += p @ self._squares.T
+        sim -= 2 * (v @ self._values.T)
+        np.maximum(sim, 0, out=sim)
+        shared = p @ self._present.T
+        sim /= np.maximum(shared, 1)
+        np.sqrt(sim, out=sim)
+        sim *= 1 / STAT_RANGE
+        np.minimum(sim, 1, out=sim)
+        np.subtract(1, sim, out=sim)
+        if self._missing_stats:
+            sim[shared == 0] = 0
+        return sim, _jaccard(self._weapons[rows], self._weapons), _jaccard(self._tags[rows], self._tags)
+
+    def components(self, index: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Row index of the stat, weapon and tag similarity matrices."""
+        if self.matrices is not None:
+            return tuple(matrix[index] for matrix in self.matrices)
+        found = self._rows.get(index)
+        if found is None:
+            found = self._rows.put(index, tuple(part[0] for part in self._block(slice(index, index + 1))))
+        return found
+
+    def row(self, index: int, weights: SimilarityWeights = SimilarityWeights()) -> np.ndarray:
+        """Weighted similarity of legend index to every legend (a new array)."""
+        w = weights.normalized()
+        stats, weapons, tags = self.components(index)
+        row = stats * np.float32(w.stats)
+        row += np.float32(w.weapons) * weapons
+        row += np.float32(w.tags) * tags
+        return row
+
+    def most_similar(self, name: str, k: int = 10,
+                     weights: SimilarityWeights = SimilarityWeights()) -> List[Tuple[str, float]]:
+        """
+        The k legends most similar to name (itself excluded) with their
+        scores in 0..1, best first. Unknown names give an empty list.
+        """
+        record = self.store.get(name)
+        k = min(k, len(self) - 1)
+        if record is None or k <= 0:
+            return []
+        scores = self.row(record.index, weights)
+        scores[record.index] = -np.inf
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((top, -scores[top]))]
+        names = self.store.names
+        return [(names[i], float(scores[i])) for i in top.tolist()]
@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import numpy as np
+from utils.legend_store import LegendStore
+from utils.resource_index import RESOURCE_KINDS, ResourceIndex
+
+SNAPSHOT_VERSION = 1
+# what np.load and the reads after it raise for a missing, truncated or
+# otherwise corrupt .npz: callers treat all of them as "rebuild it"
+UNREADABLE_NPZ = (OSError, EOFError, KeyError, ValueError, zipfile.BadZipFile)
+
+
+def source_hashes(data_files: Dict[str, str], resources_dir: str) -> Dict[str, str]:
+    """
+    sha256 of each source data file, plus one hash per resources/<kind>
+    listing (file names only: the index doesn't depend on image contents).
+    """
+    hashes = {}
+    for key, path in data_files.items():
+        try:
+            with open(path, 'rb') as f:
+                hashes[key] = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            hashes[key] = ''
+    for kind in RESOURCE_KINDS:
+        try:
+            listing = '\n'.join(sorted(os.listdir(Path(resources_dir) / kind)))
+        except OSError:
+            listing = ''
+        hashes[f'resources/{kind}'] = hashlib.sha256(listing.encode('utf-8')).hexdigest()
+    return hashes
+
+
+def save_npz_atomic(path: Path, **arrays) -> None:
+    """
+    np.savez to a uniquely named temporary file next to path, then rename it
+    over path, so readers never see a partial file and concurrent writers
+    (several workers rebuilding at once) never share a temporary file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **arrays)
+        # mkstemp creates the file owner-only; keep the usual permissions
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def write_snapshot(path: str, store: LegendStore, resource_index: ResourceIndex,
+                   resources_dir: str, hashes: Dict[str, str]) -> None:
+    """Write the roster and resource index to one .npz (written atomically)."""
+    resources_dir = Path(resources_dir).resolve()
+    res_kind, res_key, res_path = [], [], []
+    for kind, files in resource_index.to_dict().items():
+        for key, file_path in files.items():
+            res_kind.append(kind)
+            res_key.append(key)
+            res_path.append(os.path.relpath(file_path, resources_dir))
+    meta = {'version': SNAPSHOT_VERSION, 'hashes': hashes}
+
+    save_npz_atomic(
+        Path(path),
+        meta=np.array(json.dumps(meta)),
+        names=np.array(store.names, dtype=str),
+        stats=store.stats,
+        weapon_ids=store.weapon_ids,
+        weapon_names=np.array(store.weapon_names, dtype=str),
+        tag_masks=store.tag_masks,
+        tag_names=np.array(store.tag_names, dtype=str),
+        res_kind=np.array(res_kind, dtype=str),
+        res_key=np.array(res_key, dtype=str),
+        res_path=np.array(res_path, dtype=str),
+    )
+
+
+def load_snapshot(path: str, resources_dir: str,
+                  hashes: Dict[str, str]) -> Optional[Tuple[LegendStore, ResourceIndex]]:
+    """Return (store, resource index) if the snapshot exists and matches hashes, else None."""
+    try:
+        with np.load(path, allow_pickle=False) as snap:
+            meta = json.loads(str(snap['meta']))
+            if meta.get('version') != SNAPSHOT_VERSION or meta.get('hashes') != hashes:
+                return None
+            store = LegendStore(
+                snap['names'].tolist(),
+                snap['stats'],
+                snap['weapon_ids'],
+                snap['weapon_names'].tolist(),
+                snap['tag_masks'],
+                snap['tag_names'].tolist(),
+            )
+            resources_dir = Path(resources_dir).resolve()
+            files: Dict[str, Dict[str, str]] = {kind: {} for kind in RESOURCE_KINDS}
+            for kind, key, rel in zip(snap['res_kind'].tolist(), snap['res_key'].tolist(), snap['res_path'].tolist()):
+                files.setdefault(kind, {})[key] = str(resources_dir / rel)
+    except UNREADABLE_NPZ:
+        return None
+    return store, ResourceIndex(files)
@@ -0,0 +1,44 @@
+from typing import Iterable, NamedTuple, Optional
+import numpy as np
+from utils.legend_store import MISSING_STAT
+
+_COMPARE = {
+    '=': np.equal,
+    '<': np.less,
+    '<=': np.less_equal,
+    '>': np.greater,
+    '>=': np.greater_equal,
+}
+
+
+class StatCondition(NamedTuple):
+    """One stat filter, e.g. StatCondition('Speed', 'between', 4, 6)."""
+    stat: str
+    comparator: str
+    value: int
+    upper: Optional[int] = None
+
+
+def stat_mask(column: np.ndarray, comparator: str, value: int, upper: Optional[int] = None) -> np.ndarray:
+    """
+    Boolean mask over one stat column in a single vectorized pass.
+    Legends with a missing stat never match; an unknown comparator or an
+    empty 'between' range matches nothing.
+    """
+    present = column != MISSING_STAT
+    if comparator == 'between':
+        if upper is None or upper < value:
+            return np.zeros(len(column), dtype=bool)
+        return present & (column >= value) & (column <= upper)
+    compare = _COMPARE.get(comparator)
+    if compare is None:
+        return np.zeros(len(column), dtype=bool)
+    return present & compare(column, value)
+
+
+def compound_mask(store, conditions: Iterable[StatCondition]) -> np.ndarray:
+    """AND of every condition; no conditions means every legend matches."""
+    mask = np.ones(len(store), dtype=bool)
+    for cond in conditions:
+        mask &= stat_mask(store.stat_column(cond.stat), cond.comparator, cond.value, cond.upper)
+    return mask
@@ -0,0 +1,163 @@
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+KEYWORDS = ('AND', 'OR', 'NOT')
+_TOKEN_RE = re.compile(r'(\(|\)|"[^"]*"|\bAND\b|\bOR\b|\bNOT\b)')
+
+
+def bit_positions(bits: int) -> np.ndarray:
+    """Positions of the set bits in ascending order (linear in the bit length)."""
+    if not bits:
+        return np.empty(0, dtype=np.intp)
+    raw = np.frombuffer(bits.to_bytes((bits.bit_length() + 7) // 8, 'little'), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(raw, bitorder='little'))
+
+
+def iter_bits(bits: int):
+    """Yield the positions of the set bits in ascending order."""
+    yield from bit_positions(bits).tolist()
+
+
+def bitset_from_mask(mask: np.ndarray) -> int:
+    """Python-int bitset with bit i set where the boolean mask is true."""
+    return int.from_bytes(np.packbits(np.asarray(mask, dtype=bool), bitorder='little').tobytes(), 'little')
+
+
+class TagIndex:
+    """
+    Inverted tag index: one Python int per tag whose bit i is set when
+    legend i (roster order) has that tag. Boolean tag queries are answered
+    with bitwise ops and a popcount instead of scanning the roster.
+    """
+
+    def __init__(self, names: Sequence[str], tag_bitsets: Dict[str, int]):
+        self.names = list(names)
+        self.all_bits = (1 << len(self.names)) - 1
+        self._bitsets = dict(tag_bitsets)
+        self._by_lower = {tag.lower(): tag for tag in self._bitsets}
+
+    @classmethod
+    def from_store(cls, store) -> 'TagIndex':
+        bitsets = {tag: bitset_from_mask(store.tag_mask(tag)) for tag in store.tag_names}
+        return cls(store.names, bitsets)
+
+    @property
+    def tags(self) -> List[str]:
+        return list(self._bitsets)
+
+    def canonical(self, tag: str) -> str:
+        """Return the tag as spelled in tags.json; raise ValueError if unknown."""
+        found = self._by_lower.get(tag.strip().lower())
+        if found is None:
+            raise ValueError(f"Unknown tag: {tag!r}")
+        return found
+
+    def bits(self, tag: str) -> int:
+        return self._bitsets[self.canonical(tag)]
+
+    def names_for(self, bits: int) -> List[str]:
+        names = self.names
+        return [names[i] for i in bit_positions(bits).tolist()]
+
+    def all_of(self, tags: Sequence[str]) -> int:
+        bits = self.all_bits
+        for tag in tags:
+            bits &= self.bits(tag)
+        return bits
+
+    def any_of(self, tags: Sequence[str]) -> int:
+        bits = 0
+        for tag in tags:
+            bits |= self.bits(tag)
+        return bits
+
+    def query_bits(self, expression: str) -> int:
+        return compile_tag_query(expression, tuple(self._bitsets))(self._bitsets, self.all_bits)
+
+    def query(self, expression: str) -> List[str]:
+        """Legend names matching a boolean tag expression, in roster order."""
+        return self.names_for(self.query_bits(expression))
+
+    def count(self, expression: str) -> int:
+        return self.query_bits(expression).bit_count()
+
+
+def _tokenize(expression: str) -> List[Tuple[str, str]]:
+    tokens = []
+    for piece in _TOKEN_RE.split(expression):
+        piece = piece.strip()
+        if not piece:
+            continue
+        if piece in KEYWORDS or piece in ('(', ')'):
+            tokens.append((piece, piece))
+        elif piece.startswith('"'):
+            tokens.append(('TAG', piece[1:-1]))
+        else:
+            tokens.append(('TAG', piece))
+    return tokens
+
+
+@lru_cache(maxsize=1024)
+def compile_tag_query(expression: str, known_tags: Tuple[str, ...]) -> Callable[[Dict[str, int], int], int]:
+    """
+    Compile a tag expression such as ``Magic User AND NOT Semi-Human OR Thera``
+    into a function of (tag_bitsets, all_bits) -> bits. Precedence is
+    NOT > AND > OR; parentheses and double-quoted tag names are supported and
+    tag names are matched case-insensitively. Raises ValueError on bad input.
+    """
+    by_lower = {tag.lower(): tag for tag in known_tags}
+    tokens = _tokenize(expression)
+    pos = 0
+
+    def peek():
+        return tokens[pos][0] if pos < len(tokens) else None
+
+    def take(kind):
+        nonlocal pos
+        if peek() != kind:
+            found = tokens[pos][1] if pos < len(tokens) else 'end of query'
+            raise ValueError(f"Expected {kind} but found {found!r} in tag query {expression!r}")
+        pos += 1
+        return tokens[pos - 1][1]
+
+    def parse_or():
+        node = parse_and()
+        while peek() == 'OR':
+            take('OR')
+            left, right = node, parse_and()
+            node = lambda b, a, l=left, r=right: l(b, a) | r(b, a)
+        return node
+
+    def parse_and():
+        node = parse_not()
+        while peek() == 'AND':
+            take('AND')
+            left, right = node, parse_not()
+            node = lambda b, a, l=left, r=right: l(b, a) & r(b, a)
+        return node
+
+    def parse_not():
+        if peek() == 'NOT':
+            take('NOT')
+            inner = parse_not()
+            return lambda b, a, i=inner: a & ~i(b, a)
+        if peek() == '(':
+            take('(')
+            node = parse_or()
+            take(')')
+            return node
+        name = take('TAG')
+        tag = by_lower.get(name.lower())
+        if tag is None:
+            raise ValueError(f"Unknown tag: {name!r}")
+        return lambda b, a, t=tag: b[t]
+
+    if not tokens:
+        raise ValueError("Empty tag query")
+    root = parse_or()
+    if pos != len(tokens):
+        raise ValueError(f"Unexpected {tokens[pos][1]!r} in tag query {expression!r}")
+    return root
@@ -0,0 +1,425 @@
+"""
+Best 2- or 3-legend teams under constraints.
+
+Every candidate legend is reduced to a few ints: a weapon bitset, its tag
+mask and a bitset of the team requirements it meets (stat conditions, the
+required tags). A team's weapons, tags and met requirements are the ORs of
+its members', so the depth-first search over combinations carries them
+along and prunes a branch when OR-ing in everything still reachable
+(suffix ORs over the candidate order) cannot meet the requirements, or when
+the objective's upper bound cannot beat the teams already kept.
+
+The objective is a weighted sum of scorer plugins (SCORERS). The first
+member's index splits the search into interleaved chunks that run on a
+process pool; search_teams yields the best teams found so far as chunks
+finish and hands the current cut-off to the chunks it submits next.
+"""
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from math import comb
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
+from utils.legend_store import LegendStore, MISSING_STAT, STAT_COLUMNS
+from utils.metrics import get_logger
+from utils.stat_index import StatCondition, stat_mask
+
+log = get_logger('team_search')
+
+TEAM_WORKERS_ENV = 'MEET_LEGENDS_TEAM_WORKERS'
+TEAM_SIZES = (2, 3)
+# below this many candidate teams the pool costs more than it saves; the
+# real roster never gets there (C(66, 3) = 45,760), only much larger ones do
+PARALLEL_MIN_TEAMS = 200_000
+CHUNKS_PER_WORKER = 8
+
+
+class TeamConstraints(NamedTuple):
+    size: int = 2
+    include: Tuple[str, ...] = ()
+    exclude: Tuple[str, ...] = ()
+    # each must be met by at least one member
+    stat_conditions: Tuple[StatCondition, ...] = ()
+    # at least one member must have one of these tags
+    any_tags: Tuple[str, ...] = ()
+    no_shared_weapons: bool = False
+
+
+class TeamState(NamedTuple):
+    """What scorers see of a (partial) team: member count, ORed bitsets and summed stats."""
+    members: int
+    weapons: int
+    tags: int
+    stat_sums: Tuple[int, ...]
+
+
+class Team(NamedTuple):
+    score: float
+    members: Tuple[str, ...]
+
+
+class TeamSearchProgress(NamedTuple):
+    best: List[Team]
+    chunks_done: int
+    chunks: int
+
+    @property
+    def done(self) -> bool:
+        return self.chunks_done == self.chunks
+
+
+class CandidatePool:
+    """The candidate legends in search order plus suffix aggregates for the bounds (plain ints, cheap to pickle)."""
+
+    def __init__(self, indices: Sequence[int], names: Sequence[str], weapons: Sequence[int], tags: Sequence[int],
+                 requirements: Sequence[int], stats: Sequence[Tuple[int, ...]], all_requirements: int,
+                 solo: Sequence[float]):
+        self.indices = list(indices)
+        self.names = list(names)
+        self.weapons = list(weapons)
+        self.tags = list(tags)
+        self.requirements = list(requirements)
+        self.stats = [tuple(s) for s in stats]
+        self.all_requirements = all_requirements
+        # objective score of each candidate on its own, non-increasing
+        self.solo = list(solo)
+        n = len(self.names)
+        # suffix_*[j]: aggregate over candidates j..n-1 (index n = nothing left)
+        self.suffix_weapons = [0] * (n + 1)
+        self.suffix_tags = [0] * (n + 1)
+        self.suffix_requirements = [0] * (n + 1)
+        self.suffix_max_stats = [(0,) * len(STAT_COLUMNS)] * (n + 1)
+        self.suffix_max_weapons = [0] * (n + 1)
+        self.suffix_max_tags = [0] * (n + 1)
+        for j in range(n - 1, -1, -1):
+            self.suffix_weapons[j] = self.suffix_weapons[j + 1] | self.weapons[j]
+            self.suffix_tags[j] = self.suffix_tags[j + 1] | self.tags[j]
+            self.suffix_requirements[j] = self.suffix_requirements[j + 1] | self.requirements[j]
+            self.suffix_max_stats[j] = tuple(map(max, self.suffix_max_stats[j + 1], self.stats[j]))
+            self.suffix_max_weapons[j] = max(self.suffix_max_weapons[j + 1], self.weapons[j].bit_count())
+            self.suffix_max_tags[j] = max(self.suffix_max_tags[j + 1], self.tags[j].bit_count())
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+class TeamScorer:
+    """
+    Scoring plugin: score() rates a complete team; bound() must never be
+    below the score of any team reachable by adding `remaining` candidates
+    from index `start` on to `state`. Scores must be subadditive (adding a
+    legend adds at most its own score), which the search also relies on.
+    """
+    label = ''
+
+    def score(self, state: TeamState) -> float:
+        raise NotImplementedError
+
+    def bound(self, state: TeamState, pool: CandidatePool, start: int, remaining: int) -> float:
+        raise NotImplementedError
+
+
+class WeaponCoverage(TeamScorer):
+    label = 'Distinct weapons'
+
+    def score(self, state: TeamState) -> float:
+        return state.weapons.bit_count()
+
+    def bound(self, state: TeamState, pool: CandidatePool, start: int, remaining: int) -> float:
+        return min((state.weapons | pool.suffix_weapons[start]).bit_count(),
+                   state.weapons.bit_count() + remaining * pool.suffix_max_weapons[start])
+
+
+class TagCoverage(TeamScorer):
+    label = 'Distinct tags'
+
+    def score(self, state: TeamState) -> float:
+        return state.tags.bit_count()
+
+    def bound(self, state: TeamState, pool: CandidatePool, start: int, remaining: int) -> float:
+        return min((state.tags | pool.suffix_tags[start]).bit_count(),
+                   state.tags.bit_count() + remaining * pool.suffix_max_tags[start])
+
+
+class StatTotal(TeamScorer):
+    def __init__(self, stat: str):
+        self.column = STAT_COLUMNS.index(stat)
+        self.label = f'Total {stat}'
+
+    def score(self, state: TeamState) -> float:
+        return state.stat_sums[self.column]
+
+    def bound(self, state: TeamState, pool: CandidatePool, start: int, remaining: int) -> float:
+        return state.stat_sums[self.column] + remaining * pool.suffix_max_stats[start][self.column]
+
+
+# plugin name -> scorer; register new objectives here
+SCORERS: Dict[str, TeamScorer] = {
+    'weapons': WeaponCoverage(),
+    'tags': TagCoverage(),
+    **{stat.lower(): StatTotal(stat) for stat in STAT_COLUMNS},
+}
+
+
+def resolve_objective(objective: Dict[str, float]) -> List[Tuple[TeamScorer, float]]:
+    if not objective:
+        raise ValueError("pick at least one thing to optimize for")
+    weighted = []
+    for name, weight in objective.items():
+        scorer = SCORERS.get(name)
+        if scorer is None:
+            raise ValueError(f"unknown scorer {name!r}; expected one of {list(SCORERS)}")
+        if weight < 0:
+            raise ValueError("scorer weights must not be negative")
+        weighted.append((scorer, weight))
+    return weighted
+
+
+def build_pool(store: LegendStore, constraints: TeamConstraints,
+               objective: Sequence[Tuple[TeamScorer, float]]) -> Tuple[CandidatePool, TeamState, int]:
+    """
+    Candidate pool (roster minus included and excluded legends), the state
+    of the included legends and the requirement bits they already meet.
+    Candidates are ordered by their own score, best first, so strong teams
+    are found early and the suffix bounds tighten quickly.
+    """
+    if constraints.size not in TEAM_SIZES:
+        raise ValueError(f"team size must be one of {TEAM_SIZES}")
+    for name in constraints.include + constraints.exclude:
+        if name not in store:
+            raise ValueError(f"unknown legend {name!r}")
+    if len(set(constraints.include)) != len(constraints.include):
+        raise ValueError("a legend can only be included once")
+    if len(constraints.include) > constraints.size:
+        raise ValueError(f"cannot include {len(constraints.include)} legends in a team of {constraints.size}")
+
+    n = len(store)
+    # Python ints, as in TagIndex: a roster can have more weapons (and a
+    # query more requirements) than an int64 has bits
+    weapons = [sum(1 << w for w in set(row) if w >= 0) for row in store.weapon_ids.tolist()]
+
+    requirement_masks = [stat_mask(store.stat_column(c.stat), c.comparator, c.value, c.upper)
+                         for c in constraints.stat_conditions]
+    if constraints.any_tags:
+        requirement_masks.append(np.logical_or.reduce([store.tag_mask(t) for t in constraints.any_tags]))
+    requirements = [0] * n
+    for bit, mask in enumerate(requirement_masks):
+        for i in np.flatnonzero(mask).tolist():
+            requirements[i] |= 1 << bit
+    all_requirements = (1 << len(requirement_masks)) - 1
+    stats = np.where(store.stats == MISSING_STAT, 0, store.stats).astype(np.int64)
+
+    included = [store.get(name).index for name in constraints.include]
+    skip = set(included) | {store.get(name).index for name in constraints.exclude}
+    tags, stats = store.tag_masks.tolist(), stats.tolist()
+    solo = [sum(w * s.score(TeamState(1, weapons[i], tags[i], tuple(stats[i]))) for s, w in objective)
+            for i in range(n)]
+    order = sorted((i for i in range(n) if i not in skip), key=lambda i: -solo[i])
+
+    pool = CandidatePool(
+        order,
+        [store.names[i] for i in order],
+        [weapons[i] for i in order],
+        [tags[i] for i in order],
+        [requirements[i] for i in order],
+        [stats[i] for i in order],
+        all_requirements,
+        [solo[i] for i in order],
+    )
+    state = TeamState(0, 0, 0, (0,) * len(STAT_COLUMNS))
+    met = 0
+    for i in included:
+        if constraints.no_shared_weapons and state.weapons & weapons[i]:
+            raise ValueError("the included legends share a weapon")
+        state = _add(state, weapons[i], tags[i], stats[i])
+        met |= requirements[i]
+    return pool, state, met
+
+
+def _add(state: TeamState, weapons: int, tags: int, stats: Sequence[int]) -> TeamState:
+    return TeamState(state.members + 1, state.weapons | weapons, state.tags | tags,
+                     tuple(map(int.__add__, state.stat_sums, stats)))
+
+
+Ranked = Tuple[float, Tuple[int, ...]]
+# slack for the float bounds: weighted sums added up in a different order
+_EPS = 1e-9
+
+
+def _rank(item: Ranked) -> Tuple[float, Tuple[int, ...]]:
+    # best first: higher score, then member positions in candidate order
+    return -item[0], item[1]
+
+
+class _Search:
+    """
+    Depth-first branch and bound over one chunk of first members. Teams
+    are ranked by score, ties by member positions, so chunks can share a
+    cut-off (the worst kept team) and still merge to the same answer.
+    """
+
+    def __init__(self, pool: CandidatePool, objective, base: TeamState, met: int,
+                 remaining: int, no_shared_weapons: bool, top: int, threshold: Optional[Ranked]):
+        self.pool = pool
+        self.objective = objective
+        self.base = base
+        self.met = met
+        self.remaining = remaining
+        self.no_shared_weapons = no_shared_weapons
+        self.top = top
+        self.best: List[Ranked] = []
+        self.cutoff = threshold
+
+    def _score(self, state: TeamState) -> float:
+        return sum(w * s.score(state) for s, w in self.objective)
+
+    def _bound(self, state: TeamState, start: int, remaining: int) -> float:
+        pool = self.pool
+        if start >= len(pool):
+            return self._score(state) if remaining == 0 else float('-inf')
+        bound = sum(w * s.bound(state, pool, start, remaining) for s, w in self.objective)
+        # subadditive scores: each added legend adds at most its solo score
+        return min(bound, self._score(state) + remaining * pool.solo[start])
+
+    def _hopeless(self, bound: float, prefix: Tuple[int, ...]) -> bool:
+        """True when no team starting with prefix and scoring at most bound can beat the cut-off."""
+        if self.cutoff is None:
+            return False
+        score, members = self.cutoff
+        if bound < score - _EPS:
+            return True
+        return bound <= score + _EPS and prefix > members[:len(prefix)]
+
+    def _keep(self, score: float, members: Tuple[int, ...]) -> None:
+        item = (score, members)
+        if self.cutoff is not None and _rank(item) >= _rank(self.cutoff):
+            return
+        self.best = sorted(self.best + [item], key=_rank)[:self.top]
+        if len(self.best) == self.top:
+            self.cutoff = self.best[-1]
+
+    def _extend(self, state: TeamState, met: int, members: Tuple[int, ...], start: int, remaining: int) -> None:
+        pool = self.pool
+        if remaining == 0:
+            if met == pool.all_requirements:
+                self._keep(self._score(state), members)
+            return
+        for c in range(start, len(pool) - remaining + 1):
+            # the bound over every team still reachable from c on; once it
+            # cannot beat the cut-off, no later c can either
+            if self._hopeless(self._bound(state, c, remaining), members + (c,)):
+                break
+            self.visit(state, met, members, c, remaining)
+
+    def visit(self, state: TeamState, met: int, members: Tuple[int, ...], c: int, remaining: int) -> None:
+        pool = self.pool
+        if self.no_shared_weapons and state.weapons & pool.weapons[c]:
+            return
+        met = met | pool.requirements[c]
+        if met | pool.suffix_requirements[c + 1] != pool.all_requirements:
+            return
+        state = _add(state, pool.weapons[c], pool.tags[c], pool.stats[c])
+        members = members + (c,)
+        if remaining > 1 and self._hopeless(self._bound(state, c + 1, remaining - 1), members):
+            return
+        self._extend(state, met, members, c + 1, remaining - 1)
+
+    def run(self, firsts: Sequence[int]) -> List[Ranked]:
+        if self.remaining == 0:
+            self._extend(self.base, self.met, (), 0, 0)
+        else:
+            for c in firsts:
+                if self._hopeless(self._bound(self.base, c, self.remaining), (c,)):
+                    break
+                self.visit(self.base, self.met, (), c, self.remaining)
+        return self.best
+
+
+_worker_args: dict = {}
+
+
+def _init_worker(args: dict) -> None:
+    _worker_args.update(args)
+
+
+def _run_chunk(firsts: Sequence[int], threshold: Optional[Ranked]) -> List[Ranked]:
+    return _Search(threshold=threshold, **_worker_args).run(firsts)
+
+
+def _merge(results: List[Ranked], top: int) -> List[Ranked]:
+    return sorted(results, key=_rank)[:top]
+
+
+def default_workers() -> int:
+    """$MEET_LEGENDS_TEAM_WORKERS, or one per CPU when unset or invalid."""
+    value = os.environ.get(TEAM_WORKERS_ENV, '').strip()
+    try:
+        workers = int(value) if value else 0
+    except ValueError:
+        workers = -1
+    if workers < 0:
+        log.warning("$%s must be a number of processes, got %r; using one per CPU", TEAM_WORKERS_ENV, value)
+    return workers if workers > 0 else os.cpu_count() or 1
+
+
+def search_teams(store: LegendStore, constraints: TeamConstraints, objective: Dict[str, float],
+                 top: int = 5, workers: Optional[int] = None) -> Iterator[TeamSearchProgress]:
+    """
+    Yield the best `top` teams found so far each time a chunk of the search
+    finishes; the last progress (done=True) holds the final answer. Teams
+    list included legends first, then the rest in roster order.
+    """
+    weighted = resolve_objective(objective)
+    pool, base, met = build_pool(store, constraints, weighted)
+    remaining = constraints.size - len(constraints.include)
+    args = dict(pool=pool, objective=weighted, base=base, met=met, remaining=remaining,
+                no_shared_weapons=constraints.no_shared_weapons, top=top)
+    workers = workers or default_workers()
+    parallel = remaining > 0 and workers > 1 and comb(len(pool), remaining) >= PARALLEL_MIN_TEAMS
+    firsts = range(max(len(pool) - remaining + 1, 0))
+    if remaining and not firsts:
+        yield TeamSearchProgress([], 0, 0)
+        return
+    if parallel:
+        # the strongest first members (candidates are sorted) run here first,
+        # so every pooled chunk starts with a real cut-off; the rest is
+        # interleaved so chunks get a similar share of the larger subtrees
+        head, rest = firsts[:workers], firsts[workers:]
+        n_chunks = workers * CHUNKS_PER_WORKER
+        chunks = [head] + [rest[k::n_chunks] for k in range(min(n_chunks, len(rest)))]
+    else:
+        chunks = [firsts]
+
+    def teams(results) -> List[Team]:
+        return [Team(score, constraints.include + tuple(pool.names[i] for i in sorted(members, key=pool.indices.__getitem__)))
+                for score, members in results]
+
+    def threshold() -> Optional[Ranked]:
+        return best[-1] if len(best) == top else None
+
+    best = _Search(threshold=None, **args).run(chunks[0])
+    best = _merge(best, top)
+    yield TeamSearchProgress(teams(best), 1, len(chunks))
+    if not parallel:
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(args,)) as executor:
+        queued = iter(chunks[1:])
+        running = set()
+        done = 1
+        try:
+            while True:
+                # a couple of chunks per worker in flight, each submitted with the latest cut-off
+                for chunk in queued:
+                    running.add(executor.submit(_run_chunk, chunk, threshold()))
+                    if len(running) >= workers * 2:
+                        break
+                if not running:
+                    return
+                finished, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    best = _merge(best + future.result(), top)
+                    done += 1
+                yield TeamSearchProgress(teams(best), done, len(chunks))
+        finally:
+            for future in running:
+                future.cancel()
@@ -0,0 +1,74 @@
+from itertools import combinations
+from typing import Dict, FrozenSet, List, Sequence, Tuple
+import numpy as np
+from utils.tag_index import bit_positions, bitset_from_mask
+
+
+class WeaponIndex:
+    """
+    Weapon lookups derived from the roster (data.csv), so they cannot drift
+    from it:
+    - legend -> frozenset of its weapons
+    - weapon -> bitset of legends (bit i = legend i in roster order)
+    - unordered weapon pair -> tuple of legends wielding both
+    """
+
+    def __init__(self, names: Sequence[str], legend_weapons: Sequence[Tuple[str, ...]], weapon_names: Sequence[str]):
+        self.names = list(names)
+        self.weapon_names = list(weapon_names)
+        self.all_bits = (1 << len(self.names)) - 1
+        self.legend_weapons: Dict[str, FrozenSet[str]] = {
+            name: frozenset(weapons) for name, weapons in zip(self.names, legend_weapons)
+        }
+        masks = {w: np.zeros(len(self.names), dtype=bool) for w in self.weapon_names}
+        pair_lists: Dict[FrozenSet[str], List[str]] = {}
+        for i, (name, weapons) in enumerate(zip(self.names, legend_weapons)):
+            for w in weapons:
+                if w not in masks:
+                    masks[w] = np.zeros(len(self.names), dtype=bool)
+                masks[w][i] = True
+            for w1, w2 in combinations(sorted(set(weapons)), 2):
+                pair_lists.setdefault(frozenset((w1, w2)), []).append(name)
+        self._bitsets: Dict[str, int] = {w: bitset_from_mask(m) for w, m in masks.items()}
+        self._pairs = {pair: tuple(legends) for pair, legends in pair_lists.items()}
+
+    @classmethod
+    def from_store(cls, store) -> 'WeaponIndex':
+        return cls(store.names, [r.weapons for r in store.records], store.weapon_names)
+
+    def bits(self, weapon: str) -> int:
+        return self._bitsets.get(weapon, 0)
+
+    def names_for(self, bits: int) -> List[str]:
+        names = self.names
+        return [names[i] for i in bit_positions(bits).tolist()]
+
+    def legends_with(self, weapon: str) -> List[str]:
+        return self.names_for(self.bits(weapon))
+
+    def legends_with_pair(self, w1: str, w2: str) -> List[str]:
+        """O(1) lookup of the legends wielding both weapons (any order)."""
+        if w1 == w2:
+            return self.legends_with(w1)
+        return list(self._pairs.get(frozenset((w1, w2)), ()))
+
+    def has_all(self, weapons: Sequence[str]) -> List[str]:
+        if not weapons:
+            return []
+        bits = self.all_bits
+        for w in weapons:
+            bits &= self.bits(w)
+        return self.names_for(bits)
+
+    def has_any(self, weapons: Sequence[str]) -> List[str]:
+        bits = 0
+        for w in weapons:
+            bits |= self.bits(w)
+        return self.names_for(bits)
+
+    def pairs(self) -> Dict[FrozenSet[str], Tuple[str, ...]]:
+        return dict(self._pairs)
+
+    def as_dict(self) -> Dict[str, List[str]]:
+        """weapons.json-shaped mapping: weapon -> legends (roster order)."""
+        return {w: self.legends_with(w) for w in self.weapon_names}
@@ -0,0 +1,123 @@
+import os
+import sys
+import threading
+from pathlib import Path
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+# modules import each other as top-level packages (utils, scripts, config)
+# and config.data_paths is relative to the repository root, as with
+# `streamlit run src/app.py`
+sys.path.insert(0, str(ROOT / 'src'))
+os.chdir(ROOT)
+os.environ['MEET_LEGENDS_RELOAD_INTERVAL'] = '0'
+
+
+@pytest.fixture(scope='session')
+def roster():
+    """(store, resource index) parsed from the real data/ and resources/."""
+    from utils.data_access import build_from_sources
+    return build_from_sources()
+
+
+@pytest.fixture(scope='session')
+def store(roster):
+    return roster[0]
+
+
+@pytest.fixture(scope='session')
+def gappy_store(store):
+    """The roster with a few blank stats, including a legend with none."""
+    from utils.legend_store import LegendStore, MISSING_STAT
+    stats = store.stats.copy()
+    stats[0, 1] = stats[1, :2] = MISSING_STAT
+    stats[2, :] = MISSING_STAT
+    return LegendStore(store.names, stats, store.weapon_ids, store.weapon_names, store.tag_masks, store.tag_names)
+
+
+@pytest.fixture
+def concurrent_writes():
+    """
+    run(write, path, threads=8, times=5) calls write() `times` times on each
+    of `threads` threads, then checks none failed and that no temp file was
+    left next to path.
+    """
+    def run(write, path, threads=8, times=5):
+        errors = []
+
+        def loop():
+            try:
+                for _ in range(times):
+                    write()
+            except Exception as e:
+                errors.append(e)
+
+        workers = [threading.Thread(target=loop) for _ in range(threads)]
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        assert not errors, errors[:3]
+        assert [p.name for p in Path(path).parent.iterdir()] == [Path(path).name]
+    return run
+
+
+@pytest.fixture(scope='session')
+def subset(store):
+    """subset(n): the first n legends of the roster as their own store."""
+    from utils.legend_store import LegendStore
+
+    def first(n):
+        return LegendStore(store.names[:n], store.stats[:n], store.weapon_ids[:n], store.weapon_names,
+                           store.tag_masks[:n], store.tag_names)
+    return first
+
+
+@pytest.fixture
+def swap_stores(roster):
+    """
+    swap(other, times) alternately installs other and the real roster in
+    data_access; the real roster is reinstalled when the test ends.
+    """
+    from utils import data_access
+    store, resource_index = roster
+
+    def swap(other, times):
+        for i in range(times):
+            data_access.install(other if i % 2 else store, resource_index)
+    yield swap
+    data_access.install(store, resource_index)
+
+
+@pytest.fixture
+def race():
+    """
+    run(read, swap, readers=4) calls read(i) in a loop on each reader thread i
+    while swap() runs on this one, switching threads as often as possible so
+    unguarded check-then-act races show up. Checks no reader failed.
+    """
+    def run(read, swap, readers=4):
+        errors = []
+        done = threading.Event()
+
+        def loop(i):
+            try:
+                while not done.is_set():
+                    read(i)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=loop, args=(i,)) for i in range(readers)]
+        old_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for t in threads:
+                t.start()
+            swap()
+        finally:
+            done.set()
+            for t in threads:
+                t.join()
+            sys.setswitchinterval(old_interval)
+        assert not errors, errors[:3]
+    return run
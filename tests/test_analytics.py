@@ -0,0 +1,70 @@
+import math
+import pytest
+from utils import data_access
+from utils.analytics import GROUPINGS, HIST_BINS, summarize
+from utils.legend_store import MISSING_STAT, STAT_COLUMNS
+from utils.lru import LruCache
+from scripts import analytics_view
+
+
+def _groups(store, by):
+    """label -> legend records, straight from the records."""
+    groups = {}
+    for r in store.records:
+        if by == 'weapon':
+            labels = set(r.weapons)
+        elif by == 'weapon_pair':
+            pair = sorted(r.weapons, key=store.weapon_names.index)
+            labels = {' + '.join(pair)} if len(set(pair)) == 2 else set()
+        else:
+            labels = set(store.tags_of(r.name))
+        for label in labels:
+            groups.setdefault(label, []).append(r)
+    return groups
+
+
+@pytest.mark.parametrize('by', GROUPINGS)
+def test_matches_brute_force(gappy_store, by):
+    summary = summarize(gappy_store, by)
+    groups = _groups(gappy_store, by)
+    assert sorted(label for label, c in zip(summary.labels, summary.counts) if c) == sorted(groups)
+    for label, records in groups.items():
+        i = summary.labels.index(label)
+        assert summary.counts[i] == len(records)
+        for stat in STAT_COLUMNS:
+            values = [r.stat(stat) for r in records if r.stat(stat) != MISSING_STAT]
+            expected = {'sum': sum(values)}
+            if values:
+                expected.update(mean=sum(values) / len(values), min=min(values), max=max(values))
+            for aggregate, value in expected.items():
+                assert summary.get(label, stat, aggregate) == pytest.approx(value)
+            if not values:
+                assert math.isnan(summary.get(label, stat, 'mean'))
+            assert summary.histogram(label)[stat] == [values.count(v) for v in range(HIST_BINS)]
+
+
+def test_ranked_and_unknown_groups(store):
+    summary = summarize(store, 'weapon')
+    ranked = summary.ranked('Dexterity', 'max')
+    assert [v for _, v in ranked] == sorted((v for _, v in ranked), reverse=True)
+    assert summary.get('Nothing', 'Speed') is None and summary.histogram('Nothing') is None
+    with pytest.raises(ValueError):
+        summary.aggregate('median')
+    with pytest.raises(ValueError):
+        summarize(store, 'colour')
+
+
+def test_stat_summary_is_consistent_across_concurrent_swaps(monkeypatch, subset, swap_stores, race):
+    # fewer slots than (version, grouping) keys, so sessions also race on evictions
+    monkeypatch.setattr(analytics_view, '_SUMMARIES', LruCache(max_entries=2))
+
+    def request(i):
+        by = GROUPINGS[i % len(GROUPINGS)]
+        state = data_access.current()
+        summary = analytics_view.stat_summary(by, state)
+        assert int(summary.counts.sum()) == int(summarize(state.store, by).counts.sum())
+
+    race(request, lambda: swap_stores(subset(10), 30), readers=len(GROUPINGS) * 2)
+    info = analytics_view._SUMMARIES.info()
+    assert info['size'] <= info['max_size']
+    assert {key[1] for key in analytics_view._SUMMARIES.keys()} <= set(GROUPINGS)
@@ -0,0 +1,58 @@
+import pytest
+from utils.answer_table import (
+    build_answer_table,
+    load_answer_table,
+    store_fingerprint,
+    verify_answer_table,
+    write_answer_table,
+)
+from utils.tag_index import TagIndex
+from utils.weapon_index import WeaponIndex
+
+
+@pytest.fixture(scope='module')
+def table(store):
+    return build_answer_table(store)
+
+
+def test_answers_match_the_live_indexes(table, store):
+    assert verify_answer_table(table, store, TagIndex.from_store(store), WeaponIndex.from_store(store)) == []
+
+
+def test_answers_match_brute_force(table, store):
+    assert table.stat('Strength', '>=', 7) == tuple(r.name for r in store.records if r.stat('Strength') >= 7)
+    assert table.stat('Speed', 'between', 4, 6) == tuple(r.name for r in store.records if 4 <= r.stat('Speed') <= 6)
+    assert table.stat('Speed', 'between', 6, 4) == ()
+    assert table.weapons('Katars', 'Bow') == tuple(r.name for r in store.records if {'Katars', 'Bow'} <= set(r.weapons))
+    assert table.tag('Magic User') == tuple(r.name for r in store.records if 'Magic User' in store.tags_of(r.name))
+    assert table.stat('Strength', '>=', 11) is None
+
+
+def test_round_trip_and_fingerprint(tmp_path, table, store):
+    path = tmp_path / 'answers.npz'
+    write_answer_table(str(path), table)
+    loaded = load_answer_table(str(path), store_fingerprint(store))
+    assert loaded.keys == table.keys and loaded.checksum() == table.checksum()
+    assert load_answer_table(str(path), 'another roster') is None
+
+
+def test_truncated_or_corrupt_table_is_rejected(tmp_path, table, store):
+    path = tmp_path / 'answers.npz'
+    write_answer_table(str(path), table)
+    good = path.read_bytes()
+    fingerprint = store_fingerprint(store)
+    for cut in range(0, len(good), max(1, len(good) // 50)):
+        path.write_bytes(good[:cut])
+        assert load_answer_table(str(path), fingerprint) is None
+    for offset in range(0, len(good), max(1, len(good) // 50)):
+        corrupt = bytearray(good)
+        corrupt[offset] ^= 0xFF
+        path.write_bytes(bytes(corrupt))
+        loaded = load_answer_table(str(path), fingerprint)
+        assert loaded is None or loaded.checksum() == table.checksum()
+
+
+def test_concurrent_writers(tmp_path, table, store, concurrent_writes):
+    path = tmp_path / 'answers.npz'
+    concurrent_writes(lambda: write_answer_table(str(path), table), path)
+    assert load_answer_table(str(path), store_fingerprint(store)).checksum() == table.checksum()
@@ -0,0 +1,24 @@
+from utils import data_access
+
+
+def test_state_is_consistent_across_concurrent_reloads(subset, swap_stores, race):
+    def request(_):
+        state = data_access.current()
+        names = state.store.names
+        assert state.tag_index.names_for((1 << len(names)) - 1) == names
+        assert set().union(*state.weapons_dict.values()) <= set(names)
+
+    race(request, lambda: swap_stores(subset(20), 60))
+
+
+def test_module_attributes_follow_the_current_state(roster, subset):
+    store, resource_index = roster
+    small = subset(5)
+    try:
+        data_access.install(small, resource_index)
+        assert data_access.STORE is small
+        assert data_access.current().store is small
+        assert list(data_access.BASE_DATA['Legend']) == small.names[:5]
+    finally:
+        data_access.install(store, resource_index)
+    assert data_access.STORE is store and len(data_access.BASE_DATA) == len(store)
@@ -0,0 +1,83 @@
+import json
+import pytest
+from config.data_paths import name_map_path
+from utils.fuzzy_index import (MIN_SCORE, PREFIX_BONUS, FuzzyIndex, build_fuzzy_index, filename_alias,
+                               normalize_text, trigrams)
+
+
+@pytest.fixture(scope='module')
+def index(store):
+    with open(name_map_path, encoding='utf-8') as f:
+        return build_fuzzy_index(store, json.load(f))
+
+
+def _brute_force(index, query, kinds=None, limit=10):
+    """Score every entry without the postings or the cut-off."""
+    norm = normalize_text(query)
+    grams = set(trigrams(norm, prefix=True))
+    best = {}
+    for text, kind, name in zip(index.texts, index.kinds, index.names):
+        if kinds and kind not in kinds:
+            continue
+        entry = set(trigrams(text))
+        shared = len(grams & entry)
+        if not shared:
+            continue
+        score = shared / (len(grams) + len(entry) - shared)
+        if text.startswith(norm):
+            score = min(1.0, score + PREFIX_BONUS)
+        elif (' ' + norm) in (' ' + text):
+            score = min(1.0, score + PREFIX_BONUS / 2)
+        if score >= MIN_SCORE and score > best.get((kind, name), (0.0,))[0]:
+            best[(kind, name)] = (score, text)
+    ranked = sorted(best.items(), key=lambda kv: (-kv[1][0], len(kv[1][1]), kv[0][1]))
+    return [(name, kind, pytest.approx(score)) for (kind, name), (score, _) in ranked[:limit]]
+
+
+def test_normalize_and_trigrams():
+    assert normalize_text(' Bödvar ') == 'bodvar' and normalize_text('Lin-Fei') == 'lin fei'
+    assert trigrams('fei') == ['  f', ' fe', 'fei', 'ei ']
+    assert trigrams('lin f', prefix=True) == ['  l', ' li', 'lin', 'in ', '  f']
+    assert 'ei ' not in trigrams('fe', prefix=True)
+
+
+@pytest.mark.parametrize('filename, alias', [
+    ('a_Roster_Pose_WuxiaM.png', 'wuxia'),
+    ('Guantlets_Icon_1.png', 'guantlets'),
+    ('boots-1-e16738.png', 'boots'),
+    ('a_Roster_Pose_InuitM-1.png', 'inuit'),
+])
+def test_filename_alias(filename, alias):
+    assert filename_alias(filename) == alias
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('lin fie', 'Lin Fei'),
+    ('lin f', 'Lin Fei'),
+    ('katar', 'Katars'),
+    ('wuxia', 'Lin Fei'),
+    ('BÖDVAR', 'Bodvar'),
+])
+def test_typos_and_prefixes_find_the_name(index, query, expected):
+    assert index.search(query)[0].name == expected
+
+
+@pytest.mark.parametrize('query', ['lin fie', 'sword', 'ka', 'the', 'magic usr', 'grapple hammer', 'x'])
+@pytest.mark.parametrize('kinds', [None, ('legend',), ('weapon', 'tag')])
+def test_matches_brute_force(index, query, kinds):
+    found = [(m.name, m.kind, m.score) for m in index.search(query, kinds, limit=5)]
+    assert found == _brute_force(index, query, kinds, limit=5)
+
+
+def test_one_match_per_name_and_cached_results_are_copies(index):
+    found = index.search('lin', limit=50)
+    assert len({(m.kind, m.name) for m in found}) == len(found)
+    found.clear()
+    assert index.search('lin', limit=50)
+    assert index.search('') == [] and index.search('???') == []
+
+
+def test_duplicate_and_empty_entries_are_skipped():
+    index = FuzzyIndex([('Ada', 'legend', 'Ada'), ('ada', 'legend', 'Ada'), ('', 'tag', 'x'), ('Ada', 'tag', 'Ada')])
+    assert len(index) == 2
+    assert {m.kind for m in index.search('ada')} == {'legend', 'tag'}
@@ -0,0 +1,36 @@
+import logging
+import pytest
+from utils import data_access, hot_reload
+
+
+@pytest.fixture
+def reload_log(monkeypatch, caplog):
+    # the meet_legends loggers don't propagate, so capture through a plain one
+    monkeypatch.setattr(hot_reload, 'log', logging.getLogger('test_hot_reload'))
+    caplog.set_level(logging.WARNING, 'test_hot_reload')
+    return caplog
+
+
+def test_off_unless_asked_for(monkeypatch, reload_log):
+    monkeypatch.delenv(hot_reload.RELOAD_INTERVAL_ENV, raising=False)
+    monkeypatch.delenv(data_access.SHARED_SEGMENT_ENV, raising=False)
+    assert hot_reload.reload_interval() == 0
+    assert hot_reload.start_from_env() is None
+    monkeypatch.setenv(hot_reload.RELOAD_INTERVAL_ENV, '0.5')
+    assert hot_reload.reload_interval() == 0.5
+    assert not reload_log.records
+
+
+def test_shared_workers_watch_the_segment_by_default(monkeypatch):
+    monkeypatch.delenv(hot_reload.RELOAD_INTERVAL_ENV, raising=False)
+    monkeypatch.setenv(data_access.SHARED_SEGMENT_ENV, '/dev/shm/roster.seg')
+    assert hot_reload.reload_interval() == hot_reload.DEFAULT_INTERVAL
+    monkeypatch.setenv(hot_reload.RELOAD_INTERVAL_ENV, '0')
+    assert hot_reload.reload_interval() == 0
+
+
+@pytest.mark.parametrize('value', ['fast', '-1', 'nan', 'inf'])
+def test_invalid_interval_is_logged_and_leaves_it_off(monkeypatch, reload_log, value):
+    monkeypatch.setenv(hot_reload.RELOAD_INTERVAL_ENV, value)
+    assert hot_reload.start_from_env() is None
+    assert hot_reload.RELOAD_INTERVAL_ENV in reload_log.text and repr(value) in reload_log.text
@@ -0,0 +1,31 @@
+import csv
+import pytest
+from utils.legend_store import MAX_TAGS, MAX_WEAPONS, STAT_COLUMNS, WEAPON_COLUMNS, LegendStore
+
+
+def _write_csv(path, n_weapons, tags=()):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Legend'] + WEAPON_COLUMNS + STAT_COLUMNS + list(tags))
+        for i in range(0, n_weapons, 2):
+            second = f'W{i + 1}' if i + 1 < n_weapons else ''
+            writer.writerow([f'Legend {i}', f'W{i}', second] + ['5'] * len(STAT_COLUMNS) + ['1'] * len(tags))
+    return str(path)
+
+
+def test_the_limits_fit(tmp_path):
+    tags = [f'Tag {i}' for i in range(MAX_TAGS)]
+    store = LegendStore.from_csv(_write_csv(tmp_path / 'data.csv', MAX_WEAPONS, tags), tags)
+    assert len(store.weapon_names) == MAX_WEAPONS and store.records[-1].weapons == (f'W{MAX_WEAPONS - 1}',)
+    assert store.tags_of('Legend 0') == tags and store.weapon_mask(f'W{MAX_WEAPONS - 1}')[-1]
+
+
+def test_too_many_weapons(tmp_path):
+    with pytest.raises(ValueError, match=str(MAX_WEAPONS)):
+        LegendStore.from_csv(_write_csv(tmp_path / 'data.csv', MAX_WEAPONS + 1), [])
+
+
+def test_too_many_tags(tmp_path):
+    tags = [f'Tag {i}' for i in range(MAX_TAGS + 1)]
+    with pytest.raises(ValueError, match=str(MAX_TAGS)):
+        LegendStore.from_csv(_write_csv(tmp_path / 'data.csv', 2, tags), tags)
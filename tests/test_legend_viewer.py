@@ -0,0 +1,49 @@
+from streamlit.testing.v1 import AppTest
+
+
+def _two_result_lists():
+    from scripts.legend_viewer import display_legends
+    display_legends(["Ada", "Arcadia", "Orion"], key="first")
+    display_legends(["Orion", "Ada"], ranked=True, key="second")
+
+
+def test_display_legends_twice_on_one_page():
+    at = AppTest.from_function(_two_result_lists, default_timeout=60)
+    at.run()
+    assert not at.exception
+    assert len(at.number_input) == 2
+
+    at.selectbox(key="first_page_size").select(25).run()
+    assert not at.exception
+    assert at.selectbox(key="first_page_size").value == 25
+    assert at.selectbox(key="second_page_size").value == 10
+    assert at.selectbox(key="second_sort_ranked").value == "Rank"
+
+
+def test_image_overwritten_in_place_invalidates_its_rows(tmp_path, roster):
+    import os
+    import shutil
+    from scripts import legend_viewer
+    from utils import data_access
+    from utils.resource_index import ResourceIndex
+
+    store, resource_index = roster
+    files = resource_index.to_dict()
+    portrait = tmp_path / 'ada.png'
+    shutil.copyfile(files['legends']['ada'], portrait)
+    files['legends']['ada'] = str(portrait)
+    data_access.install(store, ResourceIndex(files))
+    legend_viewer.clear_render_caches()
+    try:
+        before = legend_viewer.build_table_html(['Ada', 'Arcadia'])
+        assert legend_viewer.build_table_html(['Ada', 'Arcadia']) is before
+
+        shutil.copyfile(files['legends']['arcadia'], portrait)
+        stat = os.stat(portrait)
+        os.utime(portrait, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        after = legend_viewer.build_table_html(['Ada', 'Arcadia'])
+        new_uri = legend_viewer._cached_data_uri(str(portrait))
+        assert new_uri not in before and new_uri in after
+    finally:
+        data_access.install(*roster)
+        legend_viewer.clear_render_caches()
@@ -0,0 +1,50 @@
+import random
+import time
+from utils.lru import LruCache
+
+
+def test_least_recently_used_is_evicted_first():
+    cache = LruCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.keys() == ['a', 'c']
+    assert cache.get('b') is None
+    assert cache.info() == {'hits': 1, 'misses': 1, 'evictions': 1, 'size': 2, 'max_size': 2}
+
+
+def test_weight_bound_and_discard():
+    cache = LruCache(10, max_weight=10, weigh=len)
+    cache.put('a', 'xxxx')
+    cache.put('b', 'yyyy')
+    cache.put('c', 'zzzz')
+    assert cache.keys() == ['b', 'c'] and cache.info()['weight'] == 8
+    assert cache.discard('b') and not cache.discard('b')
+    assert cache.info()['weight'] == 4 and cache.info()['evictions'] == 1
+    # a single entry heavier than the bound is still kept
+    cache.put('d', 'w' * 20)
+    assert cache.keys() == ['d']
+
+
+def test_concurrent_readers_writers_and_invalidation(race):
+    cache = LruCache(64, max_weight=2000, weigh=len)
+    rngs = [random.Random(seed) for seed in range(6)]
+
+    def render_or_reload(i):
+        if i == len(rngs):
+            for key in cache.keys():
+                if key % 3 == 0:
+                    cache.discard(key)
+            len(cache)
+            cache.info()
+            return
+        key = rngs[i].randrange(200)
+        if cache.get(key) is None:
+            cache.put(key, 'x' * rngs[i].randrange(1, 50))
+
+    # the reload runs as one more reader; this thread only waits, so it never
+    # queues on the cache lock behind the readers
+    race(render_or_reload, lambda: time.sleep(0.2), readers=len(rngs) + 1)
+    assert cache.info()['weight'] == sum(len(cache._data[k]) for k in cache.keys())
+    assert len(cache) <= 64 and cache.info()['weight'] <= 2000
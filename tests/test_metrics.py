@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+from utils import metrics
+
+_LOG_SCRIPT = "from utils.metrics import get_logger; log = get_logger('t'); log.info('info line'); log.warning('warning line')"
+
+
+def _run_logging(level):
+    env = dict(os.environ, PYTHONPATH='src', **{metrics.LOG_LEVEL_ENV: level})
+    return subprocess.run([sys.executable, '-c', _LOG_SCRIPT], env=env, capture_output=True, text=True, check=True).stderr
+
+
+def test_log_level_from_env():
+    out = _run_logging('info')
+    assert 'info line' in out and 'warning line' in out
+
+
+def test_unknown_log_level_falls_back_to_warning():
+    out = _run_logging('verbose')
+    assert "Unknown $MEET_LEGENDS_LOG_LEVEL 'VERBOSE'" in out
+    assert 'info line' not in out and 'warning line' in out
+
+
+def test_spans_and_counters():
+    metrics.reset()
+    for _ in range(3):
+        with metrics.span('test.block'):
+            pass
+    metrics.incr('test.count', 2)
+    snap = metrics.snapshot()
+    assert snap['spans']['test.block']['count'] == 3
+    assert sum(snap['spans']['test.block']['histogram'].values()) == 3
+    assert snap['counters']['test.count'] == 2
+    metrics.reset()
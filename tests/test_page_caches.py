@@ -0,0 +1,27 @@
+from utils import data_access
+from utils.answer_table import store_fingerprint
+from scripts import analytics_view, name_search, similar_legends
+
+
+def _check(state):
+    store = state.store
+    assert analytics_view.data_version(state) == store_fingerprint(store)
+    assert similar_legends.similarity_index(state).store is store
+    legends = {m.name for m in name_search.fuzzy_index(state).search(store.names[-1], ['legend'])}
+    assert store.names[-1] in legends
+
+
+def test_caches_follow_the_state_they_are_given(roster, subset):
+    store, resource_index = roster
+    try:
+        data_access.install(subset(10), resource_index)
+        _check(data_access.current())
+        data_access.reload()  # listeners run on the swapped-in state
+        _check(data_access.current())
+    finally:
+        data_access.install(store, resource_index)
+    _check(data_access.current())
+
+
+def test_caches_stay_consistent_across_concurrent_swaps(subset, swap_stores, race):
+    race(lambda _: _check(data_access.current()), lambda: swap_stores(subset(10), 20))
@@ -0,0 +1,55 @@
+import pytest
+from utils.legend_store import MISSING_STAT
+from utils.query_language import compile_query, query_legends
+from utils.queries import get_legends_by_query
+
+
+def _stat(r, stat, test):
+    """A stat comparison as the query language means it: blank stats never match."""
+    value = r.stat(stat)
+    return value != MISSING_STAT and test(value)
+
+
+CASES = [
+    ('weapon:Sword', lambda s, r: 'Sword' in r.weapons),
+    ('WEAPON:"rocket lance" | weapon:Orb', lambda s, r: 'Rocket Lance' in r.weapons or 'Orb' in r.weapons),
+    ('weapon:Sword & str>=6 & tag:"Magic User" & !tag:Thera',
+     lambda s, r: 'Sword' in r.weapons and _stat(r, 'Strength', lambda v: v >= 6)
+     and 'Magic User' in s.tags_of(r.name) and 'Thera' not in s.tags_of(r.name)),
+    ('legend:ada | legend:"Lin Fei"', lambda s, r: r.name in ('Ada', 'Lin Fei')),
+    ('spd=4..6', lambda s, r: _stat(r, 'Speed', lambda v: 4 <= v <= 6)),
+    ('dexterity != 5', lambda s, r: not _stat(r, 'Dexterity', lambda v: v == 5)),
+    ('def<4 | def>6 & spd==5', lambda s, r: _stat(r, 'Defense', lambda v: v < 4)
+     or _stat(r, 'Defense', lambda v: v > 6) and _stat(r, 'Speed', lambda v: v == 5)),
+    ('!(weapon:Bow | weapon:Axe) & str<=5', lambda s, r: not {'Bow', 'Axe'} & set(r.weapons)
+     and _stat(r, 'Strength', lambda v: v <= 5)),
+]
+
+
+@pytest.mark.parametrize('query, expected', CASES)
+def test_matches_brute_force(store, query, expected):
+    names = [r.name for r in store.records if expected(store, r)]
+    assert query_legends(query, store) == names
+    assert get_legends_by_query(query) == names
+
+
+def test_plans_are_cached_and_precedence_is_not_and_or():
+    assert compile_query('str>=6') is compile_query('str>=6')
+    assert compile_query('!tag:a & tag:b | tag:c') == ('or', ('and', ('not', ('tag', 'a')), ('tag', 'b')), ('tag', 'c'))
+    assert compile_query('spd != 3') == ('not', ('stat', 'Speed', '=', 3, None))
+
+
+@pytest.mark.parametrize('query', [
+    '', '   ', 'weapon:', 'colour:red', 'height>3', 'str>=tall', 'str<4..6', 'str>=6 &', '(weapon:Sword',
+    'weapon:Sword)', 'str 6', '"unclosed',
+])
+def test_bad_syntax_raises(query):
+    with pytest.raises(ValueError):
+        compile_query(query)
+
+
+@pytest.mark.parametrize('query', ['weapon:Lute', 'tag:Nothing'])
+def test_unknown_names_raise(store, query):
+    with pytest.raises(ValueError):
+        query_legends(query, store)
+    assert query_legends('legend:Nobody', store) == []
@@ -0,0 +1,108 @@
+import asyncio
+import json
+import logging
+import socket
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+import serve_api
+from serve_api import OPERATIONS
+from utils.query_service import QueryService
+
+
+@pytest.fixture
+def service():
+    return QueryService(OPERATIONS)
+
+
+@pytest.fixture
+def api_log(monkeypatch, caplog):
+    # the meet_legends loggers don't propagate, so capture through a plain one
+    monkeypatch.setattr(serve_api, 'log', logging.getLogger('test_serve_api'))
+    caplog.set_level(logging.ERROR, 'test_serve_api')
+    return caplog
+
+
+def _query(service, query):
+    status, payload, _ = service.handle_query_body(json.dumps(query).encode())
+    return status, payload
+
+
+def test_import_leaves_the_ui_unloaded():
+    # a fresh interpreter: this one has already imported the pages
+    src = Path(serve_api.__file__).parent
+    code = "import sys, serve_api; print(sorted(m for m in ('streamlit', 'scripts', 'pandas') if m in sys.modules))"
+    out = subprocess.run([sys.executable, '-c', code], cwd=src, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == '[]'
+
+
+def test_lookups_match_the_store(service, store):
+    status, payload = _query(service, {'type': 'stat', 'stat': 'Speed', 'comparator': '>=', 'value': 6})
+    assert status == 200
+    expected = [r.name for r in store.records if r.stat('Speed') >= 6]
+    assert sorted(payload['legends']) == sorted(expected)
+
+    status, payload = _query(service, {'type': 'weapons', 'weapons': ['Katars', 'Bow'], 'match_all': False})
+    assert status == 200
+    assert sorted(payload['legends']) == sorted(r.name for r in store.records if {'Katars', 'Bow'} & set(r.weapons))
+
+
+def test_match_all_must_be_a_bool(service):
+    for query_type, field in (('tags', {'include': ['Magic User']}), ('weapons', {'weapons': ['Katars']})):
+        for value in ('false', 0, 'no'):
+            status, payload = _query(service, {'type': query_type, 'match_all': value, **field})
+            assert status == 400
+            assert 'match_all' in payload['error']
+        assert _query(service, {'type': query_type, 'match_all': False, **field})[0] == 200
+
+
+def test_batch_reports_errors_per_query(service):
+    status, payload = _query(service, {'queries': [
+        {'type': 'tag', 'tag': 'Magic User'},
+        {'type': 'stat', 'stat': 'Luck', 'value': 3},
+        {'type': 'nope'},
+    ]})
+    assert status == 200
+    results = payload['results']
+    assert results[0]['count'] == len(results[0]['legends']) > 0
+    assert 'unknown stat' in results[1]['error'] and 'unknown query type' in results[2]['error']
+
+
+def test_http_keep_alive_round_trip(service):
+    async def exchange():
+        server = await service.start('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        responses = []
+        for body in (b'{"type": "weapon", "weapon": "Bow"}', b'{"type": "tag"}'):
+            writer.write(b'POST /query HTTP/1.1\r\nHost: x\r\nContent-Length: %d\r\n\r\n%s' % (len(body), body))
+            await writer.drain()
+            head = await reader.readuntil(b'\r\n\r\n')
+            length = int(head.split(b'Content-Length: ')[1].split(b'\r\n')[0])
+            responses.append((head.split(b' ')[1], json.loads(await reader.readexactly(length))))
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return responses
+
+    (ok, found), (bad, error) = asyncio.run(exchange())
+    assert ok == b'200' and found['count'] > 0
+    assert bad == b'400' and "missing 'tag'" in error['error']
+
+
+@pytest.mark.parametrize('value', ['not-a-port', '0', '70000'])
+def test_invalid_port_env_is_logged_once(monkeypatch, api_log, value):
+    monkeypatch.setattr(serve_api, '_background', {})
+    monkeypatch.setenv(serve_api.API_PORT_ENV, value)
+    for _ in range(3):  # the app calls it on every rerun
+        assert serve_api.start_from_env() is None
+    assert api_log.text.count('must be a port number') == 1
+
+
+def test_port_in_use_is_logged(service, api_log):
+    with socket.socket() as busy:
+        busy.bind(('127.0.0.1', 0))
+        busy.listen()
+        serve_api._serve(service, '127.0.0.1', busy.getsockname()[1])
+    assert 'could not listen' in api_log.text
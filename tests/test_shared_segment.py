@@ -0,0 +1,114 @@
+import asyncio
+import re
+import shutil
+from pathlib import Path
+import numpy as np
+import pytest
+import serve_api
+from utils import data_access
+from utils.answer_table import store_fingerprint
+from utils.asset_pipeline import encode_data_uri
+from utils.query_service import Blob, QueryService
+from utils.resource_index import ResourceIndex
+from utils.shared_segment import IMAGE_URL_ENV, SharedSegment, write_segment
+from utils.tag_index import TagIndex
+from utils.weapon_index import WeaponIndex
+
+
+@pytest.fixture(scope='module')
+def answers(store):
+    return data_access.load_answers(store, TagIndex.from_store(store), WeaponIndex.from_store(store), path=None)
+
+
+@pytest.fixture
+def segment_path(tmp_path, roster, answers):
+    path = tmp_path / 'roster.seg'
+    write_segment(str(path), *roster, answers)
+    return path
+
+
+def test_round_trip(segment_path, roster, answers):
+    store, resource_index = roster
+    segment = SharedSegment(segment_path)
+    mapped = segment.store()
+    assert mapped.names == store.names and mapped.tag_names == store.tag_names
+    for name in ('stats', 'weapon_ids', 'tag_masks'):
+        assert np.array_equal(getattr(mapped, name), getattr(store, name))
+    assert not mapped.stats.flags.writeable  # a view onto the read-only mapping
+    assert segment.resource_index().to_dict() == resource_index.to_dict()
+    table = segment.answer_table(store_fingerprint(store))
+    assert table.keys == answers.keys and np.array_equal(table.bits, answers.bits)
+    assert segment.answer_table('another roster') is None
+
+
+def test_images_are_views_addressed_by_content(segment_path, roster):
+    segment = SharedSegment(segment_path)
+    portrait = roster[1].get('legends', 'Ada')
+    data = Path(portrait).read_bytes()
+    view = segment.image(portrait)
+    assert isinstance(view, memoryview) and view == data
+    name = segment.image_name(portrait)
+    assert re.fullmatch(r'[0-9a-f]{40}\.(png|jpg|jpeg|webp)', name)
+    mime, served = segment.named_image(name)
+    assert mime.startswith('image/') and served == data
+    assert segment.data_uri(portrait) == encode_data_uri(Path(portrait))
+    assert segment.image('missing.png') is None and segment.named_image('0' * 40 + '.png') is None
+
+
+def test_changed_since_lists_changed_images(tmp_path, roster):
+    store, resource_index = roster
+    files = resource_index.to_dict()
+    portrait = tmp_path / 'ada.png'
+    shutil.copyfile(files['legends']['ada'], portrait)
+    files['legends']['ada'] = str(portrait)
+    write_segment(str(tmp_path / 'a.seg'), store, ResourceIndex(files))
+    before = SharedSegment(tmp_path / 'a.seg')
+
+    shutil.copyfile(files['legends']['arcadia'], portrait)
+    write_segment(str(tmp_path / 'a.seg'), store, ResourceIndex(files))
+    after = SharedSegment(tmp_path / 'a.seg')
+    assert after.changed_since(before) == ([str(portrait)], False)
+    assert after.changed_since(after) == ([], False)
+    # the attached mapping still reads the segment it was opened on
+    assert before.image(str(portrait)) != after.image(str(portrait))
+
+
+def test_concurrent_publishers_never_share_a_temp_file(tmp_path, roster, concurrent_writes):
+    path = tmp_path / 'roster.seg'
+    concurrent_writes(lambda: write_segment(str(path), *roster), path, threads=4, times=10)
+    assert SharedSegment(path).store().names == roster[0].names
+
+
+def test_pages_link_images_served_from_the_segment(monkeypatch, segment_path, roster):
+    from scripts import legend_viewer
+    monkeypatch.setenv(data_access.SHARED_SEGMENT_ENV, str(segment_path))
+    monkeypatch.setenv(IMAGE_URL_ENV, 'http://127.0.0.1:8502/images/')
+    monkeypatch.setattr(data_access, '_STATE', None)
+    legend_viewer.clear_render_caches()
+    try:
+        html = legend_viewer.build_table_html(['Ada', 'Orion'])
+    finally:
+        legend_viewer.clear_render_caches()
+    assert 'data:image' not in html
+    names = re.findall(r"http://127\.0\.0\.1:8502/images/([0-9a-f]{40}\.\w+)", html)
+    portrait = roster[1].get('legends', 'Ada')
+    assert data_access.current().segment.image_name(portrait) in names
+
+    service = QueryService(serve_api.OPERATIONS, files=serve_api._segment_image)
+
+    async def fetch(name):
+        server = await service.start('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(f'GET /images/{name} HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n'.encode())
+        response = await reader.read()
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return response
+
+    head, _, body = asyncio.run(fetch(names[0])).partition(b'\r\n\r\n')
+    assert head.startswith(b'HTTP/1.1 200') and b'Content-Type: image/' in head and b'immutable' in head
+    assert body == bytes(data_access.current().segment.named_image(names[0])[1])
+    status, payload, _ = service.route('GET', '/images/' + '0' * 40 + '.png', b'')
+    assert status == 404 and not isinstance(payload, Blob)
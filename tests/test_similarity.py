@@ -0,0 +1,63 @@
+import math
+import numpy as np
+import pytest
+from utils import similarity
+from utils.legend_store import MISSING_STAT
+from utils.similarity import SimilarityIndex, SimilarityWeights
+
+WEIGHTS = [SimilarityWeights(), SimilarityWeights(1, 0, 0), SimilarityWeights(0, 2, 1), SimilarityWeights(0.1, 0.1, 0.8)]
+
+
+def _jaccard(a, b):
+    return len(a & b) / len(a | b) if a | b else 0.0
+
+
+def _brute_force(store, a, b, weights):
+    w = weights.normalized()
+    ra, rb = store.records[a], store.records[b]
+    shared = [(x, y) for x, y in zip(ra.stats, rb.stats) if x != MISSING_STAT and y != MISSING_STAT]
+    if shared:
+        rms = math.sqrt(sum((x - y) ** 2 for x, y in shared) / len(shared))
+        stats = 1 - min(1.0, rms / similarity.STAT_RANGE)
+    else:
+        stats = 0.0
+    tags = _jaccard({i for i in range(32) if ra.tag_mask >> i & 1}, {i for i in range(32) if rb.tag_mask >> i & 1})
+    return w.stats * stats + w.weapons * _jaccard(set(ra.weapons), set(rb.weapons)) + w.tags * tags
+
+
+def _check_against_brute_force(index, store):
+    for weights in WEIGHTS:
+        for a in (0, 1, 2, 17, len(store) - 1):
+            expected = [_brute_force(store, a, b, weights) for b in range(len(store))]
+            assert np.allclose(index.row(a, weights), expected, atol=1e-5)
+            found = index.most_similar(store.names[a], 5, weights)
+            others = sorted((b for b in range(len(store)) if b != a), key=lambda b: (-expected[b], b))
+            assert [score for _, score in found] == pytest.approx([expected[b] for b in others[:5]], abs=1e-5)
+
+
+def test_matches_brute_force_for_any_weights(gappy_store):
+    index = SimilarityIndex(gappy_store)
+    assert index.matrices is not None
+    _check_against_brute_force(index, gappy_store)
+
+
+def test_rows_on_demand_above_the_matrix_limit(monkeypatch, gappy_store):
+    monkeypatch.setattr(similarity, 'MATRIX_MAX_LEGENDS', 10)
+    index = SimilarityIndex(gappy_store)
+    assert index.matrices is None
+    _check_against_brute_force(index, gappy_store)
+
+
+def test_queries_leave_the_components_untouched(store):
+    index = SimilarityIndex(store)
+    before = [m.copy() for m in index.matrices]
+    for weights in WEIGHTS:
+        index.most_similar(store.names[3], 10, weights)
+    assert all(np.array_equal(m, b) for m, b in zip(index.matrices, before))
+    assert index.most_similar('Nobody', 10) == [] and index.most_similar(store.names[0], 0) == []
+
+
+@pytest.mark.parametrize('weights', [SimilarityWeights(0, 0, 0), SimilarityWeights(-1, 1, 1)])
+def test_invalid_weights(store, weights):
+    with pytest.raises(ValueError):
+        SimilarityIndex(store).most_similar(store.names[0], 5, weights)
@@ -0,0 +1,59 @@
+import numpy as np
+from utils import data_access
+from utils.snapshot import load_snapshot, source_hashes, write_snapshot
+
+HASHES = {'data.csv': 'abc', 'resources/legends': 'def'}
+
+
+def _write(path, roster):
+    store, resource_index = roster
+    write_snapshot(str(path), store, resource_index, 'resources', HASHES)
+
+
+def test_round_trip(tmp_path, roster):
+    path = tmp_path / 'snap.npz'
+    _write(path, roster)
+    store, resource_index = load_snapshot(str(path), 'resources', HASHES)
+    assert store.names == roster[0].names
+    assert np.array_equal(store.stats, roster[0].stats)
+    assert np.array_equal(store.tag_masks, roster[0].tag_masks)
+    assert resource_index.to_dict() == roster[1].to_dict()
+
+
+def test_changed_hashes_are_rejected(tmp_path, roster):
+    path = tmp_path / 'snap.npz'
+    _write(path, roster)
+    assert load_snapshot(str(path), 'resources', dict(HASHES, **{'data.csv': 'changed'})) is None
+    assert load_snapshot(str(tmp_path / 'missing.npz'), 'resources', HASHES) is None
+
+
+def test_truncated_or_corrupt_snapshot_is_rejected(tmp_path, roster):
+    path = tmp_path / 'snap.npz'
+    _write(path, roster)
+    good = path.read_bytes()
+    bad = tmp_path / 'bad.npz'
+    for cut in range(0, len(good), max(1, len(good) // 50)):
+        bad.write_bytes(good[:cut])
+        assert load_snapshot(str(bad), 'resources', HASHES) is None
+    for offset in range(0, len(good), max(1, len(good) // 50)):
+        corrupt = bytearray(good)
+        corrupt[offset] ^= 0xFF
+        bad.write_bytes(bytes(corrupt))
+        loaded = load_snapshot(str(bad), 'resources', HASHES)
+        assert loaded is None or loaded[0].names == roster[0].names
+
+
+def test_load_rebuilds_a_corrupt_snapshot(tmp_path, monkeypatch):
+    path = tmp_path / 'snap.npz'
+    path.write_bytes(b'PK\x03\x04 not really a zip')
+    monkeypatch.setattr(data_access, 'snapshot_path', str(path))
+    store, _ = data_access.load()
+    assert len(store) > 0
+    hashes = source_hashes(data_access.SOURCE_FILES, data_access.resources_path)
+    assert load_snapshot(str(path), data_access.resources_path, hashes)[0].names == store.names
+
+
+def test_concurrent_writers_do_not_clobber_each_other(tmp_path, roster, concurrent_writes):
+    path = tmp_path / 'snap.npz'
+    concurrent_writes(lambda: _write(path, roster), path)
+    assert load_snapshot(str(path), 'resources', HASHES)[0].names == roster[0].names
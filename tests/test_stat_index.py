@@ -0,0 +1,50 @@
+import pytest
+from utils.legend_store import MISSING_STAT, STAT_COLUMNS
+from utils.stat_index import StatCondition, compound_mask, stat_mask
+
+CHECKS = {
+    '=': lambda x, v, u: x == v,
+    '<': lambda x, v, u: x < v,
+    '<=': lambda x, v, u: x <= v,
+    '>': lambda x, v, u: x > v,
+    '>=': lambda x, v, u: x >= v,
+    'between': lambda x, v, u: v <= x <= u,
+}
+
+
+def _brute_force(store, conditions):
+    """Legend names passing every condition, straight from the records."""
+    return [r.name for r in store.records
+            if all(r.stat(c.stat) != MISSING_STAT and CHECKS[c.comparator](r.stat(c.stat), c.value, c.upper)
+                   for c in conditions)]
+
+
+@pytest.mark.parametrize('comparator', CHECKS)
+@pytest.mark.parametrize('stat', STAT_COLUMNS)
+def test_stat_mask_matches_brute_force(gappy_store, stat, comparator):
+    for value in (-1, 0, 3, 6, 10):
+        upper = value + 2 if comparator == 'between' else None
+        mask = stat_mask(gappy_store.stat_column(stat), comparator, value, upper)
+        assert gappy_store.names_for(mask) == _brute_force(gappy_store, [StatCondition(stat, comparator, value, upper)])
+
+
+def test_missing_stats_never_match(gappy_store):
+    column = gappy_store.stat_column('Strength')
+    assert not stat_mask(column, '<', 100)[2] and not stat_mask(column, '>', -100)[2]
+
+
+@pytest.mark.parametrize('comparator, value, upper', [('~', 3, None), ('between', 6, 4), ('between', 3, None)])
+def test_unknown_comparator_and_empty_range_match_nothing(store, comparator, value, upper):
+    assert not stat_mask(store.stat_column('Speed'), comparator, value, upper).any()
+
+
+def test_compound_mask_matches_brute_force(gappy_store):
+    cases = [
+        [],
+        [StatCondition('Speed', '>=', 6)],
+        [StatCondition('Strength', '>', 5), StatCondition('Defense', '<=', 5)],
+        [StatCondition('Dexterity', 'between', 4, 7), StatCondition('Speed', '=', 5), StatCondition('Strength', '<', 8)],
+    ]
+    for conditions in cases:
+        assert gappy_store.names_for(compound_mask(gappy_store, conditions)) == _brute_force(gappy_store, conditions)
+    assert compound_mask(gappy_store, []).all()
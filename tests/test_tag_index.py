@@ -0,0 +1,73 @@
+import random
+import numpy as np
+import pytest
+from utils.resource_index import normalize_name
+from utils.tag_index import TagIndex, bit_positions, bitset_from_mask, iter_bits
+
+
+def test_bit_positions_match_a_bit_loop():
+    rng = random.Random(0)
+    for n_bits in (0, 1, 7, 8, 9, 64, 1000):
+        bits = rng.getrandbits(n_bits) if n_bits else 0
+        expected = [i for i in range(n_bits) if bits >> i & 1]
+        assert bit_positions(bits).tolist() == expected
+        assert list(iter_bits(bits)) == expected
+
+
+def test_bitset_from_mask_round_trip():
+    rng = np.random.default_rng(0)
+    for n in (0, 1, 8, 13, 1000):
+        mask = rng.random(n) < 0.3
+        bits = bitset_from_mask(mask)
+        assert bits == sum(1 << i for i in np.flatnonzero(mask).tolist())
+        assert bit_positions(bits).tolist() == np.flatnonzero(mask).tolist()
+
+
+def test_normalize_name():
+    assert normalize_name('Lin Fei') == 'lin_fei'
+    assert normalize_name('lin_fei.PNG') == 'lin_fei'
+    assert normalize_name(' Orion.jpg ') == 'orion'
+    assert normalize_name('.png') == '.png'
+    assert normalize_name('Mr. Gray') == 'mr._gray'
+
+
+@pytest.fixture(scope='module')
+def tag_index(store):
+    return TagIndex.from_store(store)
+
+
+def _with(store, tag):
+    return {r.name for r in store.records if tag in store.tags_of(r.name)}
+
+
+@pytest.mark.parametrize('expression, expected', [
+    ('Magic User', lambda has: has('Magic User')),
+    ('magic user AND NOT Semi-Human', lambda has: has('Magic User') and not has('Semi-Human')),
+    ('Magic User AND NOT Semi-Human OR Thera', lambda has: has('Magic User') and not has('Semi-Human') or has('Thera')),
+    ('Magic User AND (NOT Semi-Human OR Thera)', lambda has: has('Magic User') and (not has('Semi-Human') or has('Thera'))),
+    ('NOT NOT "Pet Owner"', lambda has: has('Pet Owner')),
+    ('NOT (Asgardian OR "Outer Space")', lambda has: not (has('Asgardian') or has('Outer Space'))),
+])
+def test_query_matches_brute_force(store, tag_index, expression, expected):
+    names = [r.name for r in store.records if expected(lambda tag, r=r: tag in store.tags_of(r.name))]
+    assert tag_index.query(expression) == names
+    assert tag_index.count(expression) == len(names)
+
+
+def test_all_of_and_any_of(store, tag_index):
+    tags = ['Magic User', 'pet owner']
+    assert set(tag_index.names_for(tag_index.all_of(tags))) == _with(store, 'Magic User') & _with(store, 'Pet Owner')
+    assert set(tag_index.names_for(tag_index.any_of(tags))) == _with(store, 'Magic User') | _with(store, 'Pet Owner')
+    assert tag_index.names_for(tag_index.all_of([])) == store.names and tag_index.any_of([]) == 0
+
+
+def test_canonical_spelling(tag_index):
+    assert tag_index.canonical(' magic USER ') == 'Magic User'
+    with pytest.raises(ValueError):
+        tag_index.canonical('Nothing')
+
+
+@pytest.mark.parametrize('expression', ['', 'Nothing', 'Magic User AND', '(Thera', 'Thera)', 'NOT', 'Thera Thera'])
+def test_bad_queries_raise(tag_index, expression):
+    with pytest.raises(ValueError):
+        tag_index.query(expression)
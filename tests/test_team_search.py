@@ -0,0 +1,136 @@
+import logging
+from itertools import combinations
+import numpy as np
+import pytest
+from utils import team_search
+from utils.legend_store import LegendStore, STAT_COLUMNS
+from utils.stat_index import StatCondition
+from utils.team_search import Team, TeamConstraints, search_teams
+
+CASES = [
+    (TeamConstraints(size=2), {'weapons': 1.0}),
+    (TeamConstraints(size=3, no_shared_weapons=True), {'tags': 1.0, 'weapons': 0.1}),
+    (TeamConstraints(size=3, include=('Ada',), exclude=('Orion',),
+                     stat_conditions=(StatCondition('Speed', '>=', 7), StatCondition('Strength', '>=', 7))),
+     {'strength': 1.0, 'dexterity': 0.5}),
+    (TeamConstraints(size=3, any_tags=('Magic User', 'Pet Owner')), {'defense': 1.0}),
+]
+
+
+def _brute_force(store, constraints, objective, top):
+    """The top scores over every valid team, best first."""
+    include = [store.get(name) for name in constraints.include]
+    rest = [r for r in store.records if r.name not in constraints.include + constraints.exclude]
+    found = []
+    for combo in combinations(rest, constraints.size - len(include)):
+        team = include + list(combo)
+        weapons = [w for r in team for w in r.weapons]
+        if constraints.no_shared_weapons and len(weapons) != len(set(weapons)):
+            continue
+        if not all(any(r.stat(c.stat) >= c.value for r in team) for c in constraints.stat_conditions):
+            continue
+        if constraints.any_tags and not any(set(store.tags_of(r.name)) & set(constraints.any_tags) for r in team):
+            continue
+        parts = {
+            'weapons': len(set(weapons)),
+            'tags': len({t for r in team for t in store.tags_of(r.name)}),
+            **{stat.lower(): sum(max(r.stat(stat), 0) for r in team) for stat in STAT_COLUMNS},
+        }
+        found.append(sum(w * parts[name] for name, w in objective.items()))
+    return sorted(found, reverse=True)[:top]
+
+
+def _final(progress):
+    *_, last = progress
+    assert last.done
+    return last.best
+
+
+@pytest.mark.parametrize('constraints, objective', CASES)
+def test_serial_search_matches_brute_force(store, constraints, objective):
+    best = _final(search_teams(store, constraints, objective, top=5, workers=1))
+    assert [t.score for t in best] == pytest.approx(_brute_force(store, constraints, objective, 5))
+    for team in best:
+        assert team.members[:len(constraints.include)] == constraints.include
+        assert not set(team.members) & set(constraints.exclude)
+
+
+@pytest.mark.parametrize('constraints, objective', CASES)
+def test_parallel_search_matches_serial(monkeypatch, store, constraints, objective):
+    # the real roster is far below PARALLEL_MIN_TEAMS, so force the process pool
+    monkeypatch.setattr(team_search, 'PARALLEL_MIN_TEAMS', 0)
+    progress = list(search_teams(store, constraints, objective, top=5, workers=2))
+    assert progress[-1].chunks > 1
+    done = [p.chunks_done for p in progress]
+    assert done == sorted(set(done)) and done[-1] == progress[-1].chunks
+    assert progress[-1].best == _final(search_teams(store, constraints, objective, top=5, workers=1))
+
+
+@pytest.fixture(scope='module')
+def many_weapons():
+    """40 legends over 100 weapons, so weapon ids reach past 63."""
+    rng = np.random.default_rng(0)
+    n, n_weapons = 40, 100
+    weapon_ids = np.stack([rng.choice(n_weapons, 2, replace=False) for _ in range(n)]).astype(np.int8)
+    weapon_ids[:4] = [[63, 64], [64, 99], [63, 1], [99, 2]]
+    return LegendStore([f'Legend {i}' for i in range(n)], rng.integers(0, 11, (n, len(STAT_COLUMNS)), dtype=np.int8),
+                       weapon_ids, [f'W{i}' for i in range(n_weapons)], np.zeros(n, dtype=np.uint32), [])
+
+
+@pytest.mark.parametrize('constraints', [TeamConstraints(size=3), TeamConstraints(size=3, no_shared_weapons=True),
+                                         TeamConstraints(size=2, include=('Legend 0',), no_shared_weapons=True)])
+def test_weapon_ids_past_63(many_weapons, constraints):
+    objective = {'weapons': 1.0, 'speed': 0.01}
+    best = _final(search_teams(many_weapons, constraints, objective, top=5, workers=1))
+    assert [t.score for t in best] == pytest.approx(_brute_force(many_weapons, constraints, objective, 5))
+
+
+def test_invalid_constraints(store):
+    with pytest.raises(ValueError):
+        _final(search_teams(store, TeamConstraints(size=4), {'weapons': 1.0}))
+    with pytest.raises(ValueError):
+        _final(search_teams(store, TeamConstraints(include=('Nobody',)), {'weapons': 1.0}))
+    with pytest.raises(ValueError):
+        _final(search_teams(store, TeamConstraints(), {}))
+
+
+@pytest.mark.parametrize('value, expected', [('3', 3), ('', None), ('0', None), ('many', None), ('-2', None)])
+def test_worker_count_from_env(monkeypatch, caplog, value, expected):
+    monkeypatch.setattr(team_search, 'log', logging.getLogger('test_team_search'))
+    caplog.set_level(logging.WARNING, 'test_team_search')
+    monkeypatch.setenv(team_search.TEAM_WORKERS_ENV, value)
+    workers = team_search.default_workers()
+    assert workers == (expected or workers) and workers >= 1
+    assert (team_search.TEAM_WORKERS_ENV in caplog.text) == (value in ('many', '-2'))
+
+
+def test_team_rows_skip_legends_missing_from_the_roster(store):
+    from scripts.team_builder import _team_rows
+    rows = _team_rows([Team(3.0, ('Ada', 'Nobody'))], store)
+    assert rows[0]['Team'] == 'Ada + Nobody'
+    assert rows[0]['Weapons'].startswith(f"{len(store.get('Ada').weapons)}:")
+
+
+def _team_page():
+    from scripts.team_builder import handle_team_builder
+    handle_team_builder()
+
+
+def test_kept_result_is_dropped_when_the_data_changes(roster, subset):
+    from streamlit.testing.v1 import AppTest
+    from utils import data_access
+
+    store, resource_index = roster
+    at = AppTest.from_function(_team_page, default_timeout=60)
+    at.run()
+    at.button[0].click().run()
+    assert not at.exception and len(at.dataframe) == 1
+    at.run()  # same request, same data: the kept result is shown again
+    assert len(at.dataframe) == 1
+
+    try:
+        data_access.install(subset(10), resource_index)
+        at.run()
+        assert not at.exception and len(at.dataframe) == 0
+    finally:
+        data_access.install(store, resource_index)
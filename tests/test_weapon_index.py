@@ -0,0 +1,45 @@
+from itertools import combinations
+import pytest
+from utils.weapon_index import WeaponIndex
+
+
+@pytest.fixture(scope='module')
+def weapon_index(store):
+    return WeaponIndex.from_store(store)
+
+
+def _wielding(store, *weapons):
+    """Legend names with every weapon, in roster order."""
+    return [r.name for r in store.records if set(weapons) <= set(r.weapons)]
+
+
+def test_legends_with_matches_the_records(store, weapon_index):
+    for weapon in store.weapon_names:
+        assert weapon_index.legends_with(weapon) == _wielding(store, weapon)
+        assert weapon_index.bits(weapon).bit_count() == len(_wielding(store, weapon))
+    assert weapon_index.as_dict() == {w: _wielding(store, w) for w in store.weapon_names}
+    assert weapon_index.bits('Nothing') == 0 and weapon_index.legends_with('Nothing') == []
+
+
+def test_pairs_match_the_records(store, weapon_index):
+    for w1, w2 in combinations(store.weapon_names, 2):
+        expected = _wielding(store, w1, w2)
+        assert weapon_index.legends_with_pair(w1, w2) == expected
+        assert weapon_index.legends_with_pair(w2, w1) == expected
+        assert weapon_index.pairs().get(frozenset((w1, w2)), ()) == tuple(expected)
+    assert weapon_index.legends_with_pair('Sword', 'Sword') == _wielding(store, 'Sword')
+
+
+def test_has_all_and_has_any(store, weapon_index):
+    weapons = ['Sword', 'Bow']
+    assert weapon_index.has_all(weapons) == _wielding(store, *weapons)
+    assert weapon_index.has_any(weapons) == [r.name for r in store.records if set(weapons) & set(r.weapons)]
+    assert weapon_index.has_all([]) == [] and weapon_index.has_any([]) == []
+    assert weapon_index.has_all(['Sword', 'Nothing']) == []
+
+
+def test_legend_weapons_and_unlisted_weapons():
+    index = WeaponIndex(['Ada', 'Bo'], [('Sword', 'Bow'), ('Bow', 'Lute')], ['Sword', 'Bow'])
+    assert index.legend_weapons == {'Ada': frozenset({'Sword', 'Bow'}), 'Bo': frozenset({'Bow', 'Lute'})}
+    assert index.legends_with('Lute') == ['Bo'] and index.legends_with('Bow') == ['Ada', 'Bo']
+    assert list(index.as_dict()) == ['Sword', 'Bow']